@@ -0,0 +1,116 @@
+"""
+Measure ZerePy cold start: the time, modules and memory it takes to import
+the connection manager and build an agent's connections, each run in a
+fresh interpreter. Compares against importing every connection module up
+front, which is what startup cost before connections were loaded lazily.
+
+Usage (from Zerepy/):
+    python benchmarks/import_time.py [--agent example] [--repeat 5]
+    python benchmarks/import_time.py --connections ollama,twitter --check
+
+With --check the script exits non-zero if building the connections imported
+a connection module the config doesn't name, so it can gate CI even where
+the connection SDKs aren't installed.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+CHILD = r"""
+import importlib, json, logging, resource, sys, time
+logging.disable(logging.CRITICAL)
+mode, config = sys.argv[1], json.loads(sys.argv[2])
+before = len(sys.modules)
+start = time.perf_counter()
+import src.connection_manager as cm
+from src.connections.registry import BUILTIN_CONNECTIONS
+imported = time.perf_counter()
+failed = []
+if mode == "eager":
+    for spec in BUILTIN_CONNECTIONS:
+        try:
+            importlib.import_module(spec.target.split(":")[0])
+        except Exception:
+            failed.append(spec.name)
+manager = cm.ConnectionManager(config)
+# Connections are created on first use; use them all, as a starting agent does
+registered = [name for name, _ in manager.connections.items()]
+done = time.perf_counter()
+print(json.dumps({
+    "import_seconds": imported - start,
+    "total_seconds": done - start,
+    "modules": len(sys.modules) - before,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "connection_modules": sorted(m for m in sys.modules if m.startswith("src.connections.")),
+    "registered": sorted(registered),
+    "failed": failed,
+}))
+"""
+
+
+def agent_config(args):
+    with open(os.path.join(ROOT, "agents", f"{args.agent}.json")) as f:
+        config = json.load(f)["config"]
+    if not args.connections:
+        return config
+    by_name = {c["name"]: c for c in config}
+    return [by_name.get(name, {"name": name}) for name in args.connections.split(",")]
+
+
+def run(mode: str, config):
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD, mode, json.dumps(config)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(mode: str, runs):
+    median = lambda key: statistics.median(r[key] for r in runs)
+    print(f"{mode:>5}: total {median('total_seconds') * 1000:8.1f}ms  "
+          f"import {median('import_seconds') * 1000:8.1f}ms  "
+          f"modules {median('modules'):6.0f}  max rss {median('max_rss_mb'):6.1f}MB  "
+          f"connection modules {len(runs[0]['connection_modules'])}")
+    return median("total_seconds")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agent", default="example", help="Agent in agents/ whose config to load")
+    parser.add_argument("--connections", help="Comma separated connection names, configured as in the agent")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--check", action="store_true", help="Fail if unrelated connection modules were imported")
+    args = parser.parse_args()
+
+    config = agent_config(args)
+    names = {c["name"] for c in config}
+    print(f"Connections in config: {', '.join(sorted(names))}")
+
+    lazy = [run("lazy", config) for _ in range(args.repeat)]
+    eager = [run("eager", config) for _ in range(args.repeat)]
+    lazy_seconds = summarize("lazy", lazy)
+    eager_seconds = summarize("eager", eager)
+    print(f"speedup: {eager_seconds / lazy_seconds:.1f}x")
+    if eager[0]["failed"]:
+        print(f"(not importable here, so missing from the eager numbers: {', '.join(eager[0]['failed'])})")
+
+    if args.check:
+        sys.path.insert(0, ROOT)
+        from src.connections.registry import connection_registry
+
+        allowed = {"src.connections.base_connection", "src.connections.registry"}
+        allowed.update(connection_registry.get(n).target.split(":")[0] for n in names if connection_registry.get(n))
+        unexpected = sorted(set(lazy[0]["connection_modules"]) - allowed)
+        if unexpected:
+            print(f"FAIL: imported connection modules not in the config: {', '.join(unexpected)}")
+            sys.exit(1)
+        print("OK: only the configured connections were imported")
+
+
+if __name__ == "__main__":
+    main()
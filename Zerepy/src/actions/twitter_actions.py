@@ -36,10 +36,17 @@ def post_tweet(agent, **kwargs):
         return False
 
 
+def _next_timeline_tweet(agent):
+    """Take the oldest timeline tweet, or None; tasks running in parallel never get the same one"""
+    with agent.state_lock:
+        tweets = agent.state.get("timeline_tweets")
+        return tweets.pop(0) if tweets else None
+
+
 @register_action("reply-to-tweet")
 def reply_to_tweet(agent, **kwargs):
-    if "timeline_tweets" in agent.state and agent.state["timeline_tweets"] is not None and len(agent.state["timeline_tweets"]) > 0:
-        tweet = agent.state["timeline_tweets"].pop(0)
+    tweet = _next_timeline_tweet(agent)
+    if tweet is not None:
         tweet_id = tweet.get('id')
         if not tweet_id:
             return
@@ -65,8 +72,8 @@ def reply_to_tweet(agent, **kwargs):
 
 @register_action("like-tweet")
 def like_tweet(agent, **kwargs):
-    if "timeline_tweets" in agent.state and agent.state["timeline_tweets"] is not None and len(agent.state["timeline_tweets"]) > 0:
-        tweet = agent.state["timeline_tweets"].pop(0)
+    tweet = _next_timeline_tweet(agent)
+    if tweet is not None:
         tweet_id = tweet.get('id')
         if not tweet_id:
             return False
@@ -1,5 +1,7 @@
+import asyncio
 import json
 import random
+import threading
 import time
 import logging
 import os
@@ -8,6 +10,7 @@ from dotenv import load_dotenv
 from src.connection_manager import ConnectionManager
 from src.helpers import print_h_bar
 from src.action_handler import execute_action
+from src.runtime import AgentRuntime, DEFAULT_MAX_WORKERS
 import src.actions.twitter_actions  
 import src.actions.echochamber_actions
 import src.actions.solana_actions
@@ -62,10 +65,14 @@ class ZerePyAgent:
             # Extract loop tasks
             self.tasks = agent_dict.get("tasks", [])
             self.task_weights = [task.get("weight", 0) for task in self.tasks]
+            # Threads shared by all tasks for their blocking calls
+            self.max_concurrency = agent_dict.get("max_concurrency", DEFAULT_MAX_WORKERS)
             self.logger = logging.getLogger("agent")
 
             # Set up empty agent state
             self.state = {}
+            # Tasks run concurrently, see AgentRuntime; guards taking items from the state
+            self.state_lock = threading.Lock()
 
         except Exception as e:
             logger.error("Could not load ZerePy agent")
@@ -157,6 +164,49 @@ class ZerePyAgent:
         
         return random.choices(self.tasks, weights=task_weights, k=1)[0]
 
+    def task_intervals(self) -> list:
+        """
+        Seconds between runs of each task. A task's own "interval" wins;
+        otherwise loop_delay is spread over the tasks by weight, which is
+        the average cadence the weighted random pick used to give them.
+        Tasks with no weight and no interval never run.
+        """
+        weights = self.task_weights
+        if self.use_time_based_weights:
+            weights = self._adjust_weights_for_time(datetime.now().hour, weights)
+        total = sum(weights)
+
+        intervals = []
+        for task, weight in zip(self.tasks, weights):
+            if "interval" in task:
+                intervals.append(float(task["interval"]))
+            elif weight > 0:
+                intervals.append(self.loop_delay * total / weight)
+            else:
+                intervals.append(float("inf"))
+        return intervals
+
+    def replenish_inputs(self) -> None:
+        """Refill the state the tasks consume (timeline tweets, room info) once it runs out"""
+        # TODO: Add more inputs to complexify agent behavior
+        if "timeline_tweets" not in self.state or self.state["timeline_tweets"] is None or len(self.state["timeline_tweets"]) == 0:
+            if any("tweet" in task["name"] for task in self.tasks):
+                logger.info("\n👀 READING TIMELINE")
+                self.state["timeline_tweets"] = self.connection_manager.perform_action(
+                    connection_name="twitter",
+                    action_name="read-timeline",
+                    params=[]
+                )
+
+        if "room_info" not in self.state or self.state["room_info"] is None:
+            if any("echochambers" in task["name"] for task in self.tasks):
+                logger.info("\n👀 READING ECHOCHAMBERS ROOM INFO")
+                self.state["room_info"] = self.connection_manager.perform_action(
+                    connection_name="echochambers",
+                    action_name="get-room-info",
+                    params={}
+                )
+
     def loop(self):
         """Main agent loop for autonomous behavior"""
         if not self.is_llm_set:
@@ -172,48 +222,9 @@ class ZerePyAgent:
             logger.info(f"{i}...")
             time.sleep(1)
 
+        # Every task runs on its own schedule, see AgentRuntime
         try:
-            while True:
-                success = False
-                try:
-                    # REPLENISH INPUTS
-                    # TODO: Add more inputs to complexify agent behavior
-                    if "timeline_tweets" not in self.state or self.state["timeline_tweets"] is None or len(self.state["timeline_tweets"]) == 0:
-                        if any("tweet" in task["name"] for task in self.tasks):
-                            logger.info("\n👀 READING TIMELINE")
-                            self.state["timeline_tweets"] = self.connection_manager.perform_action(
-                                connection_name="twitter",
-                                action_name="read-timeline",
-                                params=[]
-                            )
-
-                    if "room_info" not in self.state or self.state["room_info"] is None:
-                        if any("echochambers" in task["name"] for task in self.tasks):
-                            logger.info("\n👀 READING ECHOCHAMBERS ROOM INFO")
-                            self.state["room_info"] = self.connection_manager.perform_action(
-                                connection_name="echochambers",
-                                action_name="get-room-info",
-                                params={}
-                            )
-
-                    # CHOOSE AN ACTION
-                    # TODO: Add agentic action selection
-                    
-                    action = self.select_action(use_time_based_weights=self.use_time_based_weights)
-                    action_name = action["name"]
-
-                    # PERFORM ACTION
-                    success = execute_action(self, action_name)
-
-                    logger.info(f"\n⏳ Waiting {self.loop_delay} seconds before next loop...")
-                    print_h_bar()
-                    time.sleep(self.loop_delay if success else 60)
-
-                except Exception as e:
-                    logger.error(f"\n❌ Error in agent loop iteration: {e}")
-                    logger.info(f"⏳ Waiting {self.loop_delay} seconds before retrying...")
-                    time.sleep(self.loop_delay)
-
+            asyncio.run(AgentRuntime(self).run())
         except KeyboardInterrupt:
             logger.info("\n🛑 Agent loop stopped by user.")
-            return
\ No newline at end of file
+            return
@@ -0,0 +1,50 @@
+import hashlib
+import logging
+import threading
+from typing import Any, Callable, Dict, Tuple
+
+logger = logging.getLogger("client_pool")
+
+
+class ClientPool:
+    """
+    Process wide cache of API clients, scoped by provider and credentials.
+
+    Connections of every agent loaded in the process ask the pool for their
+    SDK client, so agents using the same API key share one client and its
+    HTTP connection pool while agents with different keys stay isolated.
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+        self.metrics = {"created": 0, "reused": 0}
+
+    @staticmethod
+    def _scope(kind: str, credentials: Tuple) -> Tuple[str, str]:
+        # Only a digest of the credentials is kept as the key
+        digest = hashlib.sha256(repr(credentials).encode()).hexdigest()
+        return kind, digest
+
+    def get(self, kind: str, credentials: Tuple, factory: Callable[[], Any]) -> Any:
+        """Return the client of `kind` for these credentials, creating it with factory on first use"""
+        scope = self._scope(kind, credentials)
+        with self._lock:
+            client = self._clients.get(scope)
+            if client is not None:
+                self.metrics["reused"] += 1
+                return client
+            client = self._clients[scope] = factory()
+            self.metrics["created"] += 1
+            logger.debug(f"Created shared {kind} client")
+            return client
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            clients: Dict[str, int] = {}
+            for kind, _ in self._clients:
+                clients[kind] = clients.get(kind, 0) + 1
+        return {"clients": clients, **self.metrics}
+
+
+client_pool = ClientPool()
@@ -1,94 +1,92 @@
 import logging
-from typing import Any, List, Optional, Type, Dict
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from src.connections.base_connection import BaseConnection
-from src.connections.anthropic_connection import AnthropicConnection
-from src.connections.eternalai_connection import EternalAIConnection
-from src.connections.goat_connection import GoatConnection
-from src.connections.groq_connection import GroqConnection
-from src.connections.openai_connection import OpenAIConnection
-from src.connections.twitter_connection import TwitterConnection
-from src.connections.farcaster_connection import FarcasterConnection
-from src.connections.ollama_connection import OllamaConnection
-from src.connections.echochambers_connection import EchochambersConnection
-from src.connections.solana_connection import SolanaConnection
-from src.connections.hyperbolic_connection import HyperbolicConnection
-from src.connections.galadriel_connection import GaladrielConnection
-from src.connections.sonic_connection import SonicConnection
-from src.connections.discord_connection import DiscordConnection
-from src.connections.allora_connection import AlloraConnection
-from src.connections.xai_connection import XAIConnection
-from src.connections.ethereum_connection import EthereumConnection
-from src.connections.together_connection import TogetherAIConnection
-from src.connections.evm_connection import EVMConnection
-from src.connections.perplexity_connection import PerplexityConnection
+from src.connections.registry import ConnectionRegistry, ConnectionSpec, connection_registry
 
 logger = logging.getLogger("connection_manager")
 
 
+class LazyConnections(Mapping):
+    """An agent's connections by name, each constructed the first time it is used"""
+
+    def __init__(self):
+        self._pending: Dict[str, Tuple[ConnectionSpec, Dict[str, Any]]] = {}
+        self._specs: Dict[str, ConnectionSpec] = {}
+        self._connections: Dict[str, BaseConnection] = {}
+        self._lock = threading.Lock()
+
+    def add(self, spec: ConnectionSpec, config: Dict[str, Any]) -> None:
+        self._specs[spec.name] = spec
+        self._pending[spec.name] = (spec, config)
+        self._connections.pop(spec.name, None)
+
+    def spec(self, name: str) -> ConnectionSpec:
+        return self._specs[name]
+
+    def __getitem__(self, name: str) -> BaseConnection:
+        connection = self._connections.get(name)
+        if connection is not None:
+            return connection
+        with self._lock:
+            if name in self._connections:
+                return self._connections[name]
+            if name not in self._pending:
+                raise KeyError(name)
+            spec, config = self._pending.pop(name)
+            try:
+                connection = self._connections[name] = spec.create(config)
+            except Exception as e:
+                # Dropped like a connection with an invalid config used to be
+                del self._specs[name]
+                logging.error(f"Failed to initialize connection {name}: {e}")
+                raise KeyError(name) from e
+            return connection
+
+    def __contains__(self, name) -> bool:
+        return name in self._specs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._specs))
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    def items(self):
+        """(name, connection) pairs, constructing any connection not used yet"""
+        for name in self:
+            try:
+                yield name, self[name]
+            except KeyError:
+                continue
+
+    def values(self):
+        return (connection for _, connection in self.items())
+
+
 class ConnectionManager:
-    def __init__(self, agent_config):
-        self.connections: Dict[str, BaseConnection] = {}
+    def __init__(self, agent_config, registry: ConnectionRegistry = connection_registry):
+        self.registry = registry
+        self.connections = LazyConnections()
         for config in agent_config:
             self._register_connection(config)
 
-    @staticmethod
-    def _class_name_to_type(class_name: str) -> Type[BaseConnection]:
-        if class_name == "twitter":
-            return TwitterConnection
-        elif class_name == "anthropic":
-            return AnthropicConnection
-        elif class_name == "openai":
-            return OpenAIConnection
-        elif class_name == "farcaster":
-            return FarcasterConnection
-        elif class_name == "groq":
-            return GroqConnection
-        elif class_name == "eternalai":
-            return EternalAIConnection
-        elif class_name == "ollama":
-            return OllamaConnection
-        elif class_name == "echochambers":
-            return EchochambersConnection
-        elif class_name == "goat":
-            return GoatConnection
-        elif class_name == "solana":
-            return SolanaConnection
-        elif class_name == "hyperbolic":
-            return HyperbolicConnection
-        elif class_name == "galadriel":
-            return GaladrielConnection
-        elif class_name == "sonic":
-            return SonicConnection
-        elif class_name == "discord":
-            return DiscordConnection
-        elif class_name == "allora":
-            return AlloraConnection
-        elif class_name == "xai":
-            return XAIConnection
-        elif class_name == "ethereum":
-            return EthereumConnection
-        elif class_name == "together":
-            return TogetherAIConnection
-        elif class_name == "evm":
-            return EVMConnection
-        elif class_name == "perplexity":
-            return PerplexityConnection
-        return None
-
     def _register_connection(self, config_dic: Dict[str, Any]) -> None:
         """
-        Create and register a new connection with configuration
+        Register a connection from its config. The connection's module is
+        imported and the connection created on first use.
 
         Args:
-            name: Identifier for the connection
-            connection_class: The connection class to instantiate
-            config: Configuration dictionary for the connection
+            config_dic: Configuration dictionary for the connection, with its name
         """
         try:
             name = config_dic["name"]
-            connection_class = self._class_name_to_type(name)
-            connection = connection_class(config_dic)
-            self.connections[name] = connection
+            spec = self.registry.get(name)
+            if spec is None:
+                raise ValueError(f"Unknown connection type, expected one of: {', '.join(self.registry.names())}")
+            spec.check_config(config_dic)
+            self.connections.add(spec, config_dic)
         except Exception as e:
             logging.error(f"Failed to initialize connection {name}: {e}")
 
@@ -220,8 +218,12 @@ class ConnectionManager:
 
     def get_model_providers(self) -> List[str]:
         """Get a list of all LLM provider connections"""
-        return [
-            name
-            for name, conn in self.connections.items()
-            if conn.is_configured() and getattr(conn, "is_llm_provider", lambda: False)
-        ]
+        providers = []
+        for name in self.connections:
+            # Connections known not to be LLMs aren't created just to ask
+            if self.connections.spec(name).is_llm_provider is False:
+                continue
+            conn = self.connections.get(name)
+            if conn is not None and conn.is_configured() and getattr(conn, "is_llm_provider", False):
+                providers.append(name)
+        return providers
@@ -3,6 +3,7 @@ from typing import List, Dict, Any
 from dotenv import set_key
 from allora_sdk.v2.api_client import AlloraAPIClient, ChainSlug
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.client_pool import client_pool
 import os
 import asyncio
 
@@ -36,9 +37,9 @@ class AlloraConnection(BaseConnection):
             api_key = os.getenv("ALLORA_API_KEY")
             if not api_key:
                 raise AlloraConfigurationError("Allora API key not found in environment")
-            self._client = AlloraAPIClient(
-                chain_slug=self.chain_slug,
-                api_key=api_key
+            self._client = client_pool.get(
+                "allora", (api_key, str(self.chain_slug)),
+                lambda: AlloraAPIClient(chain_slug=self.chain_slug, api_key=api_key)
             )
         return self._client
 
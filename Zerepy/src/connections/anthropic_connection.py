@@ -4,6 +4,7 @@ from typing import Dict, Any
 from dotenv import load_dotenv, set_key
 from anthropic import Anthropic, NotFoundError
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.client_pool import client_pool
 
 logger = logging.getLogger("connections.anthropic_connection")
 
@@ -73,7 +74,7 @@ class AnthropicConnection(BaseConnection):
             api_key = os.getenv("ANTHROPIC_API_KEY")
             if not api_key:
                 raise AnthropicConfigurationError("Anthropic API key not found in environment")
-            self._client = Anthropic(api_key=api_key)
+            self._client = client_pool.get("anthropic", (api_key,), lambda: Anthropic(api_key=api_key))
         return self._client
 
     def configure(self) -> bool:
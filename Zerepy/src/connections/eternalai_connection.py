@@ -5,6 +5,7 @@ from typing import Dict, Any
 from dotenv import load_dotenv, set_key
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.client_pool import client_pool
 from web3 import Web3
 import requests
 
@@ -84,7 +85,9 @@ class EternalAIConnection(BaseConnection):
             api_url = os.getenv("EternalAI_API_URL")
             if not api_key or not api_url:
                 raise EternalAIConfigurationError("EternalAI credentials not found in environment")
-            self._client = OpenAI(api_key=api_key, base_url=api_url)
+            self._client = client_pool.get(
+                "openai", (api_key, api_url), lambda: OpenAI(api_key=api_key, base_url=api_url)
+            )
         return self._client
 
     def configure(self) -> bool:
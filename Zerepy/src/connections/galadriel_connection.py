@@ -6,6 +6,7 @@ import requests
 from dotenv import load_dotenv, set_key
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.client_pool import client_pool
 
 logger = logging.getLogger("connections.galadriel_connection")
 
@@ -70,7 +71,10 @@ class GaladrielConnection(BaseConnection):
             headers = {}
             if fine_tune_api_key := os.getenv("GALADRIEL_FINE_TUNE_API_KEY"):
                 headers["Fine-Tune-Authorization"] = f"Bearer {fine_tune_api_key}"
-            self._client = OpenAI(api_key=api_key, base_url=API_BASE_URL, default_headers=headers)
+            self._client = client_pool.get(
+                "openai", (api_key, API_BASE_URL, fine_tune_api_key),
+                lambda: OpenAI(api_key=api_key, base_url=API_BASE_URL, default_headers=headers)
+            )
         return self._client
 
     def configure(self) -> bool:
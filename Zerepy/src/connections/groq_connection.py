@@ -4,6 +4,7 @@ from typing import Dict, Any
 from dotenv import load_dotenv, set_key
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.client_pool import client_pool
 
 logger = logging.getLogger("connections.groq_connection")
 
@@ -74,9 +75,9 @@ class GroqConnection(BaseConnection):
             api_key = os.getenv("GROQ_API_KEY")
             if not api_key:
                 raise GroqConfigurationError("Groq API key not found in environment")
-            self._client = OpenAI(
-                api_key=api_key,
-                base_url="https://api.groq.com/openai/v1"
+            base_url = "https://api.groq.com/openai/v1"
+            self._client = client_pool.get(
+                "openai", (api_key, base_url), lambda: OpenAI(api_key=api_key, base_url=base_url)
             )
         return self._client
 
@@ -4,6 +4,7 @@ from typing import Dict, Any
 from dotenv import load_dotenv, set_key
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.client_pool import client_pool
 
 logger = logging.getLogger("connections.hyperbolic_connection")
 
@@ -75,9 +76,9 @@ class HyperbolicConnection(BaseConnection):
             api_key = os.getenv("HYPERBOLIC_API_KEY")
             if not api_key:
                 raise HyperbolicConfigurationError("Hyperbolic API key not found in environment")
-            self._client = OpenAI(
-                api_key=api_key,
-                base_url="https://api.hyperbolic.xyz/v1"
+            base_url = "https://api.hyperbolic.xyz/v1"
+            self._client = client_pool.get(
+                "openai", (api_key, base_url), lambda: OpenAI(api_key=api_key, base_url=base_url)
             )
         return self._client
 
@@ -4,6 +4,7 @@ from typing import Dict, Any
 from dotenv import load_dotenv, set_key
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.client_pool import client_pool
 
 logger = logging.getLogger("connections.openai_connection")
 
@@ -74,7 +75,7 @@ class OpenAIConnection(BaseConnection):
             api_key = os.getenv("OPENAI_API_KEY")
             if not api_key:
                 raise OpenAIConfigurationError("OpenAI API key not found in environment")
-            self._client = OpenAI(api_key=api_key)
+            self._client = client_pool.get("openai", (api_key, None), lambda: OpenAI(api_key=api_key))
         return self._client
 
     def configure(self) -> bool:
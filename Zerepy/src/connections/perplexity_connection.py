@@ -4,6 +4,7 @@ from typing import Dict, Any
 from dotenv import load_dotenv, set_key
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.client_pool import client_pool
 
 logger = logging.getLogger("connections.perplexity_connection")
 
@@ -52,9 +53,8 @@ class PerplexityConnection(BaseConnection):
             api_key = os.getenv("PERPLEXITY_API_KEY")
             if not api_key:
                 raise PerplexityConfigurationError("Perplexity API key not found in environment")
-            self._client = OpenAI(
-                api_key=api_key,
-                base_url=self.base_url
+            self._client = client_pool.get(
+                "openai", (api_key, self.base_url), lambda: OpenAI(api_key=api_key, base_url=self.base_url)
             )
         return self._client
 
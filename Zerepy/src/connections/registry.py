@@ -0,0 +1,123 @@
+import importlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger("connections.registry")
+
+# Installed packages can add connections under this entry point group, e.g. in pyproject.toml:
+#   [project.entry-points."zerepy.connections"]
+#   mastodon = "zerepy_mastodon.connection:MastodonConnection"
+ENTRY_POINT_GROUP = "zerepy.connections"
+
+
+@dataclass
+class ConnectionSpec:
+    """How to build a connection: its name, the fields its config needs and a lazily imported factory"""
+    name: str
+    # "module:attr" of the connection class, or of any callable taking the config dict
+    target: str
+    # Required config fields and their types, checked without importing the connection
+    config_schema: Dict[str, Any] = field(default_factory=dict)
+    # None when only the connection instance can tell
+    is_llm_provider: Optional[bool] = None
+    _factory: Optional[Callable] = field(default=None, init=False, repr=False)
+
+    def check_config(self, config: Dict[str, Any]) -> None:
+        """Raise ValueError if config lacks a required field or has one of the wrong type"""
+        missing_fields = [name for name in self.config_schema if name not in config]
+        if missing_fields:
+            raise ValueError(f"Missing required configuration fields: {', '.join(missing_fields)}")
+        for name, expected in self.config_schema.items():
+            if not isinstance(config[name], expected):
+                raise ValueError(f"{name} must be of type {getattr(expected, '__name__', expected)}")
+
+    @property
+    def factory(self) -> Callable:
+        """The connection class (or factory), imported on first use"""
+        if self._factory is None:
+            module_name, attr = self.target.split(":")
+            self._factory = getattr(importlib.import_module(module_name), attr)
+        return self._factory
+
+    def create(self, config: Dict[str, Any]):
+        return self.factory(config)
+
+
+def _builtin(name: str, module: str, class_name: str, schema: Dict[str, Any] = None, llm: bool = False):
+    return ConnectionSpec(name, f"src.connections.{module}:{class_name}", schema or {}, llm)
+
+
+BUILTIN_CONNECTIONS: List[ConnectionSpec] = [
+    _builtin("twitter", "twitter_connection", "TwitterConnection", {"timeline_read_count": int, "tweet_interval": int}),
+    _builtin("anthropic", "anthropic_connection", "AnthropicConnection", {"model": str}, llm=True),
+    _builtin("openai", "openai_connection", "OpenAIConnection", {"model": str}, llm=True),
+    _builtin("farcaster", "farcaster_connection", "FarcasterConnection", {"timeline_read_count": int, "cast_interval": int}),
+    _builtin("groq", "groq_connection", "GroqConnection", {"model": str}, llm=True),
+    _builtin("eternalai", "eternalai_connection", "EternalAIConnection", {"model": str}, llm=True),
+    _builtin("ollama", "ollama_connection", "OllamaConnection", {"base_url": str, "model": str}, llm=True),
+    _builtin("echochambers", "echochambers_connection", "EchochambersConnection", {
+        "api_url": str, "api_key": str, "room": str, "history_read_count": int,
+        "sender_username": str, "sender_model": str,
+    }),
+    _builtin("goat", "goat_connection", "GoatConnection", {"plugins": list}),
+    _builtin("solana", "solana_connection", "SolanaConnection", {"rpc": str}),
+    _builtin("hyperbolic", "hyperbolic_connection", "HyperbolicConnection", {"model": str}, llm=True),
+    _builtin("galadriel", "galadriel_connection", "GaladrielConnection", {"model": str}, llm=True),
+    _builtin("sonic", "sonic_connection", "SonicConnection", {"network": str}),
+    _builtin("discord", "discord_connection", "DiscordConnection", {
+        "server_id": str, "message_read_count": int, "message_emoji_name": str,
+    }),
+    _builtin("allora", "allora_connection", "AlloraConnection"),
+    _builtin("xai", "xai_connection", "XAIConnection", {"model": str}, llm=True),
+    _builtin("ethereum", "ethereum_connection", "EthereumConnection"),
+    _builtin("together", "together_connection", "TogetherAIConnection", {"model": str}, llm=True),
+    _builtin("evm", "evm_connection", "EVMConnection"),
+    _builtin("perplexity", "perplexity_connection", "PerplexityConnection", {"model": str}),
+]
+
+
+class ConnectionRegistry:
+    """
+    Connection specs by name. The built-in connections are known up front;
+    entry points are only scanned the first time a name isn't one of them,
+    and nothing is imported until a connection is actually created.
+    """
+
+    def __init__(self, specs: List[ConnectionSpec], group: str = ENTRY_POINT_GROUP):
+        self._specs: Dict[str, ConnectionSpec] = {spec.name: spec for spec in specs}
+        self._group = group
+        self._discovered = False
+        self._lock = threading.Lock()
+
+    def register(self, spec: ConnectionSpec) -> None:
+        self._specs[spec.name] = spec
+
+    def _discover(self) -> None:
+        # importlib.metadata is slow to import, and unneeded for built-in connections
+        from importlib.metadata import entry_points
+
+        with self._lock:
+            if self._discovered:
+                return
+            for entry_point in entry_points(group=self._group):
+                if entry_point.name in self._specs:
+                    logger.warning(f"Ignoring plugin connection {entry_point.name}, the name is already taken")
+                    continue
+                self._specs[entry_point.name] = ConnectionSpec(entry_point.name, entry_point.value)
+            self._discovered = True
+
+    def get(self, name: str) -> Optional[ConnectionSpec]:
+        spec = self._specs.get(name)
+        if spec is None and not self._discovered:
+            self._discover()
+            spec = self._specs.get(name)
+        return spec
+
+    def names(self) -> List[str]:
+        self._discover()
+        return list(self._specs)
+
+
+connection_registry = ConnectionRegistry(BUILTIN_CONNECTIONS)
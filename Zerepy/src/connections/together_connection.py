@@ -6,6 +6,7 @@ from together import Together
 from together.types.models import ModelObject, ModelType
 
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.client_pool import client_pool
 
 logger = logging.getLogger("connections.together_ai_connection")
 
@@ -75,7 +76,7 @@ class TogetherAIConnection(BaseConnection):
             api_key = os.getenv("TOGETHER_API_KEY")
             if not api_key:
                 raise TogetherAIConfigurationError("Together API key not found in environment")
-            self._client = Together(api_key=api_key)
+            self._client = client_pool.get("together", (api_key,), lambda: Together(api_key=api_key))
         return self._client
 
     def configure(self) -> bool:
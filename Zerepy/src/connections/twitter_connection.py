@@ -4,6 +4,7 @@ from typing import Dict, Any, List, Tuple, Iterator
 from requests_oauthlib import OAuth1Session
 from dotenv import set_key, load_dotenv
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.client_pool import client_pool
 from src.helpers import print_h_bar
 import json,requests
 
@@ -53,7 +54,8 @@ class TwitterConnection(BaseConnection):
                 name="get-latest-tweets",
                 parameters=[
                     ActionParameter("username", True, str, "Twitter username to get tweets from"),
-                    ActionParameter("count", False, int, "Number of tweets to retrieve")
+                    ActionParameter("count", False, int, "Number of tweets to retrieve"),
+                    ActionParameter("since_id", False, str, "Only return tweets newer than this tweet ID")
                 ],
                 description="Get the latest tweets from a user"
             ),
@@ -188,12 +190,19 @@ class TwitterConnection(BaseConnection):
             logger.debug("Creating new OAuth session")
             try:
                 credentials = self._get_credentials()
-                self._oauth_session = OAuth1Session(
-                    credentials['TWITTER_CONSUMER_KEY'],
-                    client_secret=credentials['TWITTER_CONSUMER_SECRET'],
-                    resource_owner_key=credentials['TWITTER_ACCESS_TOKEN'],
-                    resource_owner_secret=credentials[
-                        'TWITTER_ACCESS_TOKEN_SECRET'],
+                # Agents posting as the same account share one session
+                self._oauth_session = client_pool.get(
+                    "twitter_oauth",
+                    tuple(credentials[key] for key in (
+                        'TWITTER_CONSUMER_KEY', 'TWITTER_CONSUMER_SECRET',
+                        'TWITTER_ACCESS_TOKEN', 'TWITTER_ACCESS_TOKEN_SECRET')),
+                    lambda: OAuth1Session(
+                        credentials['TWITTER_CONSUMER_KEY'],
+                        client_secret=credentials['TWITTER_CONSUMER_SECRET'],
+                        resource_owner_key=credentials['TWITTER_ACCESS_TOKEN'],
+                        resource_owner_secret=credentials[
+                            'TWITTER_ACCESS_TOKEN_SECRET'],
+                    ),
                 )
                 logger.debug("OAuth session created successfully")
             except Exception as e:
@@ -442,9 +451,10 @@ class TwitterConnection(BaseConnection):
     def get_latest_tweets(self,
                           username: str,
                           count: int = 10,
+                          since_id: str = None,
                           **kwargs) -> list:
-        """Get latest tweets for a user"""
-        logger.debug(f"Getting latest tweets for {username}, count: {count}")
+        """Get latest tweets for a user, optionally only those newer than since_id"""
+        logger.debug(f"Getting latest tweets for {username}, count: {count}, since_id: {since_id}")
 
         credentials = self._get_credentials()
         params = {
@@ -452,6 +462,8 @@ class TwitterConnection(BaseConnection):
             "max_results": min(count, 100),
             "query": f"from:{username} -is:retweet -is:reply"
         }
+        if since_id:
+            params["since_id"] = since_id
 
         response = self._make_request('get',
                                       f"tweets/search/recent",
@@ -4,6 +4,7 @@ from typing import Dict, Any
 from openai import OpenAI
 from dotenv import set_key, load_dotenv
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.client_pool import client_pool
 
 logger = logging.getLogger("connections.XAI_connection")
 
@@ -73,9 +74,9 @@ class XAIConnection(BaseConnection):
             api_key = os.getenv("XAI_API_KEY")
             if not api_key:
                 raise XAIConfigurationError("XAI API key not found in environment")
-            self._client = OpenAI(
-                api_key=api_key,
-                base_url="https://api.x.ai/v1",
+            base_url = "https://api.x.ai/v1"
+            self._client = client_pool.get(
+                "openai", (api_key, base_url), lambda: OpenAI(api_key=api_key, base_url=base_url)
             )
         return self._client
 
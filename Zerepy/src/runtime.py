@@ -0,0 +1,224 @@
+import asyncio
+import logging
+import math
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from src.action_handler import execute_action
+
+logger = logging.getLogger("runtime")
+
+# Defaults for the optional per-task settings in the agent's "tasks" list
+DEFAULT_MAX_CONCURRENCY = 1
+DEFAULT_RETRY_DELAY = 60
+DEFAULT_MAX_BACKOFF = 3600
+# Wait after a run that found nothing to do, as the sequential loop did
+DEFAULT_IDLE_DELAY = 60
+# Threads available to an agent's blocking actions across all its tasks
+DEFAULT_MAX_WORKERS = 8
+# Spread first runs over a few seconds instead of firing every task at once
+STARTUP_STAGGER = 5
+JITTER = 0.1
+
+
+class TaskSchedule:
+    """Cadence, concurrency cap and backoff state of one agent task"""
+
+    def __init__(self, task: Dict[str, Any], interval: float):
+        self.name = task["name"]
+        self.interval = interval
+        self.max_concurrency = int(task.get("max_concurrency", DEFAULT_MAX_CONCURRENCY))
+        self.retry_delay = float(task.get("retry_delay", DEFAULT_RETRY_DELAY))
+        self.max_backoff = float(task.get("max_backoff", DEFAULT_MAX_BACKOFF))
+        self.idle_delay = float(task.get("idle_delay", DEFAULT_IDLE_DELAY))
+        self.last_idle = False
+        self.slots = None
+        self.in_flight = 0
+        self.consecutive_failures = 0
+        self.next_run_at = None
+        self.last_run_at = None
+        self.last_duration = None
+        self.last_error = None
+        self.metrics = {"runs": 0, "succeeded": 0, "idle": 0, "failed": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return math.isfinite(self.interval)
+
+    def next_delay(self) -> float:
+        """Seconds until the next run: the cadence, idle_delay after an idle run, or exponential backoff after failures"""
+        if self.consecutive_failures:
+            delay = min(self.retry_delay * 2 ** (self.consecutive_failures - 1), self.max_backoff)
+        elif self.last_idle:
+            delay = self.idle_delay
+        else:
+            delay = self.interval
+        return delay * random.uniform(1 - JITTER, 1 + JITTER)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "interval": self.interval if self.enabled else None,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "consecutive_failures": self.consecutive_failures,
+            "next_run_in": max(0.0, self.next_run_at - now) if self.next_run_at else None,
+            "last_run_at": self.last_run_at,
+            "last_duration": self.last_duration,
+            "last_error": self.last_error,
+            **self.metrics,
+        }
+
+
+class AgentRuntime:
+    """
+    Runs an agent's tasks as independently scheduled coroutines.
+
+    Each task has its own cadence, concurrency cap and backoff, so a slow
+    LLM or Twitter call only holds up its own task. The blocking actions
+    run on a shared thread pool against the agent's ConnectionManager.
+    """
+
+    def __init__(self, agent, max_workers: Optional[int] = None):
+        self.agent = agent
+        intervals = agent.task_intervals()
+        self.schedules: List[TaskSchedule] = [
+            TaskSchedule(task, interval) for task, interval in zip(agent.tasks, intervals)
+        ]
+        self.max_workers = max_workers or agent.max_concurrency
+        self.status = "idle"
+        self.started_at = None
+        self.drained = True
+        self._executor = None
+        self._stopping = None
+        self._finished = None
+        self._drain_timeout = None
+        self._schedulers = []
+        self._runs = set()
+        self._inputs_lock = None
+
+    def refresh_intervals(self) -> None:
+        """Re-derive weight based cadences, e.g. when time based weights change with the hour"""
+        for schedule, interval in zip(self.schedules, self.agent.task_intervals()):
+            schedule.interval = interval
+
+    async def _call(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _wait(self, delay: float) -> bool:
+        """Sleep for delay seconds; True if the runtime was stopped meanwhile"""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _run_task(self, schedule: TaskSchedule) -> None:
+        schedule.in_flight += 1
+        schedule.metrics["runs"] += 1
+        start = time.perf_counter()
+        try:
+            # Only one task refreshes shared inputs (timeline, room info) at a time
+            async with self._inputs_lock:
+                await self._call(self.agent.replenish_inputs)
+            success = await self._call(execute_action, self.agent, schedule.name)
+            schedule.metrics["succeeded" if success else "idle"] += 1
+            schedule.last_idle = not success
+            schedule.consecutive_failures = 0
+            schedule.last_error = None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            schedule.metrics["failed"] += 1
+            schedule.consecutive_failures += 1
+            schedule.last_error = str(e)
+            logger.error(f"\n❌ Error in task {schedule.name}: {e}")
+        finally:
+            schedule.last_duration = time.perf_counter() - start
+            schedule.in_flight -= 1
+            schedule.slots.release()
+
+    async def _schedule(self, schedule: TaskSchedule) -> None:
+        delay = random.uniform(0, min(schedule.interval, STARTUP_STAGGER))
+        while True:
+            # With a cap of one this waits for the previous run, so the
+            # cadence and backoff count from when it finished
+            await schedule.slots.acquire()
+            if schedule.last_run_at is not None:
+                if self.agent.use_time_based_weights:
+                    self.refresh_intervals()
+                delay = schedule.next_delay()
+            schedule.next_run_at = time.time() + delay
+            if await self._wait(delay):
+                schedule.slots.release()
+                return
+            schedule.last_run_at = time.time()
+            run = asyncio.create_task(self._run_task(schedule))
+            self._runs.add(run)
+            run.add_done_callback(self._runs.discard)
+
+    async def run(self) -> None:
+        """Schedule every enabled task until `stop` is called or the runtime is cancelled"""
+        if self.status in ("running", "draining"):
+            raise RuntimeError("Runtime already running")
+        self.status = "running"
+        self.started_at = time.time()
+        self._stopping = asyncio.Event()
+        self._finished = asyncio.Event()
+        self._inputs_lock = asyncio.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"agent-{self.agent.name}")
+        for schedule in self.schedules:
+            schedule.slots = asyncio.Semaphore(schedule.max_concurrency)
+        self._schedulers = [
+            asyncio.create_task(self._schedule(schedule)) for schedule in self.schedules if schedule.enabled
+        ]
+        logger.info(f"\n🚀 Scheduled {len(self._schedulers)} tasks for {self.agent.name}")
+        try:
+            await self._stopping.wait()
+            await self._cancel(self._schedulers)
+            if self._runs:
+                _, pending = await asyncio.wait(set(self._runs), timeout=self._drain_timeout)
+                if pending:
+                    self.drained = False
+                    logger.warning(f"Abandoning {len(pending)} in-flight task runs of {self.agent.name}")
+        finally:
+            # Also reached when the runtime itself is cancelled, e.g. on Ctrl+C
+            await self._cancel(self._schedulers)
+            await self._cancel(self._runs)
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self.status = "stopped"
+            self._finished.set()
+
+    @staticmethod
+    async def _cancel(tasks) -> None:
+        tasks = list(tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def stop(self, timeout: Optional[float] = None) -> bool:
+        """
+        Stop scheduling new runs and wait up to timeout seconds for the
+        in-flight ones to finish; runs still going after that are abandoned.
+
+        Returns:
+            bool: True if every in-flight run finished in time
+        """
+        if self.status != "running":
+            return True
+        self.status = "draining"
+        self.drained = True
+        self._drain_timeout = timeout
+        self._stopping.set()
+        await self._finished.wait()
+        return self.drained
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "uptime": time.time() - self.started_at if self.started_at and self.status != "stopped" else None,
+            "in_flight": len(self._runs),
+            "tasks": {schedule.name: schedule.stats() for schedule in self.schedules},
+        }
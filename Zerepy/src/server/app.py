@@ -5,13 +5,18 @@ from typing import Optional, List, Dict, Any
 import logging
 import asyncio
 import signal
-import threading
+from contextlib import asynccontextmanager
 from pathlib import Path
-from src.cli import ZerePyCLI
+from src.agent import ZerePyAgent
+from src.client_pool import client_pool
+from src.runtime import AgentRuntime
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("server/app")
 
+# Seconds /agent/stop waits for in-flight task runs before abandoning them
+DRAIN_TIMEOUT = 30
+
 class ActionRequest(BaseModel):
     """Request model for agent actions"""
     connection: str
@@ -24,74 +29,232 @@ class ConfigureRequest(BaseModel):
     params: Optional[Dict[str, Any]] = {}
 
 class ServerState:
-    """Simple state management for the server"""
+    """Agents hosted by the server, keyed by the name of their agents/<name>.json file"""
     def __init__(self):
-        self.cli = ZerePyCLI()
-        self.agent_running = False
-        self.agent_task = None
-        self._stop_event = threading.Event()
+        self.agents: Dict[str, ZerePyAgent] = {}
+        # The agent behind the single agent routes (/agent/*, /connections)
+        self.default_agent: Optional[str] = None
+        # Task schedulers of the agents whose loop was started, see AgentRuntime
+        self.runtimes: Dict[str, AgentRuntime] = {}
+        self._loops: Dict[str, asyncio.Task] = {}
+        self._load_lock = asyncio.Lock()
+
+    @property
+    def agent(self) -> Optional[ZerePyAgent]:
+        return self.agents.get(self.default_agent)
+
+    @property
+    def agent_running(self) -> bool:
+        return self.is_running(self.default_agent)
+
+    def is_running(self, name: Optional[str]) -> bool:
+        return name in self._loops
+
+    def get_agent(self, name: str) -> ZerePyAgent:
+        agent = self.agents.get(name)
+        if agent is None:
+            raise HTTPException(status_code=404, detail=f"Agent {name} not loaded")
+        return agent
 
-    def _run_agent_loop(self):
-        """Run agent loop in a separate thread"""
+    async def load_agent(self, name: str) -> ZerePyAgent:
+        """Load (or reload) an agent and make it the default one"""
+        async with self._load_lock:
+            if self.is_running(name):
+                raise ValueError(f"Agent {name} is running, stop it before reloading")
+            # Connections of every agent draw their API clients from the shared
+            # client pool, so another agent on the same credentials costs no new client
+            agent = await asyncio.to_thread(ZerePyAgent, name)
+            self.agents[name] = agent
+            self.runtimes.pop(name, None)
+            self.default_agent = name
+            logger.info(f"Loaded agent {agent.name} as {name} ({len(self.agents)} hosted)")
+            return agent
+
+    async def unload_agent(self, name: str) -> None:
+        async with self._load_lock:
+            self.get_agent(name)
+            if self.is_running(name):
+                raise ValueError(f"Agent {name} is running, stop it before unloading")
+            if name == self.default_agent:
+                self.default_agent = None
+            del self.agents[name]
+            self.runtimes.pop(name, None)
+
+    async def _run_agent_loop(self, name: str, runtime: AgentRuntime):
+        """Drive the agent's task scheduler until it is stopped"""
         try:
-            log_once = False
-            while not self._stop_event.is_set():
-                if self.cli.agent:
-                    try:
-                        if not log_once:
-                            logger.info("Loop logic not implemented")
-                            log_once = True
-
-                    except Exception as e:
-                        logger.error(f"Error in agent action: {e}")
-                        if self._stop_event.wait(timeout=30):
-                            break
+            await runtime.run()
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            logger.error(f"Error in agent loop thread: {e}")
+            logger.error(f"Error in agent loop of {name}: {e}")
         finally:
-            self.agent_running = False
-            logger.info("Agent loop stopped")
+            self._loops.pop(name, None)
+            logger.info(f"Agent loop of {name} stopped")
 
-    async def start_agent_loop(self):
-        """Start the agent loop in background thread"""
-        if not self.cli.agent:
-            raise ValueError("No agent loaded")
-        
-        if self.agent_running:
-            raise ValueError("Agent already running")
-
-        self.agent_running = True
-        self._stop_event.clear()
-        self.agent_task = threading.Thread(target=self._run_agent_loop)
-        self.agent_task.start()
-
-    async def stop_agent_loop(self):
-        """Stop the agent loop"""
-        if self.agent_running:
-            self._stop_event.set()
-            if self.agent_task:
-                self.agent_task.join(timeout=5)
-            self.agent_running = False
+    async def start_agent_loop(self, name: Optional[str] = None):
+        """Start scheduling the agent's tasks on the server's event loop"""
+        # Held across the provider setup so concurrent starts (or an unload)
+        # can't slip in between the running check and registering the loop
+        async with self._load_lock:
+            name = name or self.default_agent
+            agent = self.agents.get(name)
+            if not agent:
+                raise ValueError("No agent loaded")
+            
+            if self.is_running(name):
+                raise ValueError("Agent already running")
+
+            if not agent.is_llm_set:
+                await asyncio.to_thread(agent._setup_llm_provider)
+            runtime = self.runtimes[name] = AgentRuntime(agent)
+            self._loops[name] = asyncio.create_task(self._run_agent_loop(name, runtime))
+
+    async def stop_agent_loop(self, name: Optional[str] = None, timeout: float = DRAIN_TIMEOUT) -> bool:
+        """
+        Stop scheduling new task runs and wait up to timeout seconds for the
+        in-flight ones to finish.
+
+        Returns:
+            bool: True if every in-flight run finished in time
+        """
+        name = name or self.default_agent
+        loop = self._loops.get(name)
+        if loop is None:
+            return True
+        runtime = self.runtimes[name]
+        if runtime.status == "idle":
+            # Stopped before its first scheduling step, nothing to drain
+            loop.cancel()
+            await asyncio.gather(loop, return_exceptions=True)
+            return True
+        drained = await runtime.stop(timeout)
+        await loop
+        return drained
+
+    async def stop_all(self, timeout: float = DRAIN_TIMEOUT) -> None:
+        await asyncio.gather(*(self.stop_agent_loop(name, timeout) for name in list(self._loops)))
+
+    def agent_status(self, name: Optional[str] = None) -> Dict[str, Any]:
+        name = name or self.default_agent
+        agent = self.get_agent(name)
+        runtime = self.runtimes.get(name)
+        return {
+            "agent": agent.name,
+            "running": self.is_running(name),
+            **(runtime.stats() if runtime else {"status": "idle"})
+        }
 
 class ZerePyServer:
     def __init__(self):
-        self.app = FastAPI(title="ZerePy Server")
         self.state = ServerState()
+        self.app = FastAPI(title="ZerePy Server", lifespan=self.lifespan)
         self.setup_routes()
 
+    @asynccontextmanager
+    async def lifespan(self, app: FastAPI):
+        yield
+        # Let running agents finish their in-flight task runs on shutdown
+        await self.state.stop_all()
+
+    def _default_agent(self) -> ZerePyAgent:
+        if not self.state.agent:
+            raise HTTPException(status_code=400, detail="No agent loaded")
+        return self.state.agent
+
+    @staticmethod
+    def _list_connections(agent: ZerePyAgent) -> Dict[str, Any]:
+        try:
+            connections = {}
+            for name, conn in agent.connection_manager.connections.items():
+                connections[name] = {
+                    "configured": conn.is_configured(),
+                    "is_llm_provider": conn.is_llm_provider
+                }
+            return {"connections": connections}
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @staticmethod
+    async def _perform_action(agent: ZerePyAgent, action_request: ActionRequest) -> Dict[str, Any]:
+        try:
+            result = await asyncio.to_thread(
+                agent.perform_action,
+                connection=action_request.connection,
+                action=action_request.action,
+                params=action_request.params
+            )
+            return {"status": "success", "result": result}
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    @staticmethod
+    def _configure_connection(agent: ZerePyAgent, name: str, config: ConfigureRequest) -> Dict[str, Any]:
+        try:
+            connection = agent.connection_manager.connections.get(name)
+            if not connection:
+                raise HTTPException(status_code=404, detail=f"Connection {name} not found")
+            
+            success = connection.configure(**config.params)
+            if success:
+                return {"status": "success", "message": f"Connection {name} configured successfully"}
+            else:
+                raise HTTPException(status_code=400, detail=f"Failed to configure {name}")
+                
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @staticmethod
+    def _connection_status(agent: ZerePyAgent, name: str) -> Dict[str, Any]:
+        try:
+            connection = agent.connection_manager.connections.get(name)
+            if not connection:
+                raise HTTPException(status_code=404, detail=f"Connection {name} not found")
+                
+            return {
+                "name": name,
+                "configured": connection.is_configured(verbose=True),
+                "is_llm_provider": connection.is_llm_provider
+            }
+            
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    async def _start_loop(self, name: str) -> Dict[str, Any]:
+        try:
+            await self.state.start_agent_loop(name)
+            return {"status": "success", "message": "Agent loop started"}
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    async def _stop_loop(self, name: str, timeout: float) -> Dict[str, Any]:
+        try:
+            drained = await self.state.stop_agent_loop(name, timeout)
+            message = "Agent loop stopped" if drained else "Agent loop stopped, abandoned unfinished task runs"
+            return {"status": "success", "message": message, "drained": drained}
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
     def setup_routes(self):
         @self.app.get("/")
         async def root():
             """Server status endpoint"""
             return {
                 "status": "running",
-                "agent": self.state.cli.agent.name if self.state.cli.agent else None,
-                "agent_running": self.state.agent_running
+                "agent": self.state.agent.name if self.state.agent else None,
+                "agent_running": self.state.agent_running,
+                "agents": list(self.state.agents),
+                "running": [name for name in self.state.agents if self.state.is_running(name)],
+                "clients": client_pool.stats()
             }
 
         @self.app.get("/agents")
         async def list_agents():
-            """List available agents"""
+            """List available agents and the ones loaded in the server"""
             try:
                 agents = []
                 agents_dir = Path("agents")
@@ -99,116 +262,107 @@ class ZerePyServer:
                     for agent_file in agents_dir.glob("*.json"):
                         if agent_file.stem != "general":
                             agents.append(agent_file.stem)
-                return {"agents": agents}
+                return {"agents": agents, "loaded": list(self.state.agents), "default": self.state.default_agent}
             except Exception as e:
                 raise HTTPException(status_code=500, detail=str(e))
 
         @self.app.post("/agents/{name}/load")
         async def load_agent(name: str):
-            """Load a specific agent"""
+            """Load an agent next to the already loaded ones and make it the default"""
             try:
-                self.state.cli._load_agent_from_file(name)
+                agent = await self.state.load_agent(name)
                 return {
                     "status": "success",
-                    "agent": name
+                    "agent": name,
+                    "name": agent.name
                 }
+            except FileNotFoundError:
+                raise HTTPException(status_code=404, detail=f"Agent file not found: {name}")
             except Exception as e:
                 raise HTTPException(status_code=400, detail=str(e))
 
+        @self.app.delete("/agents/{name}")
+        async def unload_agent(name: str):
+            """Unload an agent and release its connections"""
+            try:
+                await self.state.unload_agent(name)
+                return {"status": "success", "agent": name}
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+        @self.app.post("/agents/{name}/start")
+        async def start_named_agent(name: str):
+            """Start the loop of a loaded agent"""
+            self.state.get_agent(name)
+            return await self._start_loop(name)
+
+        @self.app.post("/agents/{name}/stop")
+        async def stop_named_agent(name: str, timeout: float = DRAIN_TIMEOUT):
+            """Stop the loop of a loaded agent, letting in-flight task runs finish for up to timeout seconds"""
+            self.state.get_agent(name)
+            return await self._stop_loop(name, timeout)
+
+        @self.app.get("/agents/{name}/status")
+        async def named_agent_status(name: str):
+            """Loop status and per task metrics of a loaded agent"""
+            return self.state.agent_status(name)
+
+        @self.app.get("/agents/{name}/connections")
+        async def list_agent_connections(name: str):
+            """List the connections of a loaded agent"""
+            return self._list_connections(self.state.get_agent(name))
+
+        @self.app.post("/agents/{name}/action")
+        async def named_agent_action(name: str, action_request: ActionRequest):
+            """Execute a single action as a loaded agent"""
+            return await self._perform_action(self.state.get_agent(name), action_request)
+
+        @self.app.post("/agents/{name}/connections/{connection}/configure")
+        async def configure_agent_connection(name: str, connection: str, config: ConfigureRequest):
+            """Configure a connection of a loaded agent"""
+            return self._configure_connection(self.state.get_agent(name), connection, config)
+
+        @self.app.get("/agents/{name}/connections/{connection}/status")
+        async def agent_connection_status(name: str, connection: str):
+            """Get configuration status of a connection of a loaded agent"""
+            return self._connection_status(self.state.get_agent(name), connection)
+
         @self.app.get("/connections")
         async def list_connections():
             """List all available connections"""
-            if not self.state.cli.agent:
-                raise HTTPException(status_code=400, detail="No agent loaded")
-            
-            try:
-                connections = {}
-                for name, conn in self.state.cli.agent.connection_manager.connections.items():
-                    connections[name] = {
-                        "configured": conn.is_configured(),
-                        "is_llm_provider": conn.is_llm_provider
-                    }
-                return {"connections": connections}
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=str(e))
+            return self._list_connections(self._default_agent())
 
         @self.app.post("/agent/action")
         async def agent_action(action_request: ActionRequest):
             """Execute a single agent action"""
-            if not self.state.cli.agent:
-                raise HTTPException(status_code=400, detail="No agent loaded")
-            
-            try:
-                result = await asyncio.to_thread(
-                    self.state.cli.agent.perform_action,
-                    connection=action_request.connection,
-                    action=action_request.action,
-                    params=action_request.params
-                )
-                return {"status": "success", "result": result}
-            except Exception as e:
-                raise HTTPException(status_code=400, detail=str(e))
+            return await self._perform_action(self._default_agent(), action_request)
 
         @self.app.post("/agent/start")
         async def start_agent():
             """Start the agent loop"""
-            if not self.state.cli.agent:
-                raise HTTPException(status_code=400, detail="No agent loaded")
-            
-            try:
-                await self.state.start_agent_loop()
-                return {"status": "success", "message": "Agent loop started"}
-            except Exception as e:
-                raise HTTPException(status_code=400, detail=str(e))
+            self._default_agent()
+            return await self._start_loop(self.state.default_agent)
 
         @self.app.post("/agent/stop")
-        async def stop_agent():
-            """Stop the agent loop"""
-            try:
-                await self.state.stop_agent_loop()
-                return {"status": "success", "message": "Agent loop stopped"}
-            except Exception as e:
-                raise HTTPException(status_code=400, detail=str(e))
+        async def stop_agent(timeout: float = DRAIN_TIMEOUT):
+            """Stop the agent loop, letting in-flight task runs finish for up to timeout seconds"""
+            return await self._stop_loop(self.state.default_agent, timeout)
+
+        @self.app.get("/agent/status")
+        async def agent_status():
+            """Loop status and per task metrics of the agent"""
+            self._default_agent()
+            return self.state.agent_status()
         
         @self.app.post("/connections/{name}/configure")
         async def configure_connection(name: str, config: ConfigureRequest):
             """Configure a specific connection"""
-            if not self.state.cli.agent:
-                raise HTTPException(status_code=400, detail="No agent loaded")
-            
-            try:
-                connection = self.state.cli.agent.connection_manager.connections.get(name)
-                if not connection:
-                    raise HTTPException(status_code=404, detail=f"Connection {name} not found")
-                
-                success = connection.configure(**config.params)
-                if success:
-                    return {"status": "success", "message": f"Connection {name} configured successfully"}
-                else:
-                    raise HTTPException(status_code=400, detail=f"Failed to configure {name}")
-                    
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=str(e))
+            return self._configure_connection(self._default_agent(), name, config)
 
         @self.app.get("/connections/{name}/status")
         async def connection_status(name: str):
             """Get configuration status of a connection"""
-            if not self.state.cli.agent:
-                raise HTTPException(status_code=400, detail="No agent loaded")
-                
-            try:
-                connection = self.state.cli.agent.connection_manager.connections.get(name)
-                if not connection:
-                    raise HTTPException(status_code=404, detail=f"Connection {name} not found")
-                    
-                return {
-                    "name": name,
-                    "configured": connection.is_configured(verbose=True),
-                    "is_llm_provider": connection.is_llm_provider
-                }
-                
-            except Exception as e:
-                raise HTTPException(status_code=500, detail=str(e))
+            return self._connection_status(self._default_agent(), name)
 
 def create_app():
     server = ZerePyServer()
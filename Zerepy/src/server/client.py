@@ -32,14 +32,20 @@ class ZerePyClient:
         """List available connections"""
         return self._make_request("GET", "/connections")
 
-    def perform_action(self, connection: str, action: str, params: Optional[List[str]] = None) -> Dict[str, Any]:
-        """Execute an agent action"""
+    def unload_agent(self, agent_name: str) -> Dict[str, Any]:
+        """Unload a loaded agent"""
+        return self._make_request("DELETE", f"/agents/{agent_name}")
+
+    def perform_action(self, connection: str, action: str, params: Optional[List[str]] = None,
+                       agent_name: Optional[str] = None) -> Dict[str, Any]:
+        """Execute an action as the given loaded agent, or the default one"""
         data = {
             "connection": connection,
             "action": action,
             "params": params or []
         }
-        return self._make_request("POST", "/agent/action", json=data)
+        endpoint = f"/agents/{agent_name}/action" if agent_name else "/agent/action"
+        return self._make_request("POST", endpoint, json=data)
 
     def start_agent(self) -> Dict[str, Any]:
         """Start the agent loop"""
@@ -47,4 +53,8 @@ class ZerePyClient:
 
     def stop_agent(self) -> Dict[str, Any]:
         """Stop the agent loop"""
-        return self._make_request("POST", "/agent/stop")
\ No newline at end of file
+        return self._make_request("POST", "/agent/stop")
+
+    def agent_status(self) -> Dict[str, Any]:
+        """Get the loop status and task metrics of the agent"""
+        return self._make_request("GET", "/agent/status")
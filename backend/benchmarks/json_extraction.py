@@ -0,0 +1,103 @@
+"""
+Benchmark the streaming JSON extractor in utils.py against the previous
+regex-based parser on typical, large and adversarial LLM responses.
+
+Usage (from backend/):
+    python benchmarks/json_extraction.py [--size 20000] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from utils import JSONObjectExtractor, LAUNCHPAD_SCHEMA, parse_ai_agent_launchpad_response  # noqa: E402
+
+TOKEN = {"name": "Agentonic", "symbol": "AGT", "initialSupply": 1000000000, "owner": "0x" + "ab" * 20}
+
+
+def legacy_parse(response):
+    """The regex parser utils.py used before the streaming extractor."""
+    matches = re.findall(r'```json\s*([\s\S]*?)\s*```', response)
+    if matches:
+        try:
+            return json.loads(matches[0])
+        except json.JSONDecodeError:
+            pass
+    for match in re.findall(r'```\s*([\s\S]*?)\s*```', response):
+        try:
+            if match.strip().startswith('{') or match.strip().startswith('['):
+                return json.loads(match)
+        except json.JSONDecodeError:
+            continue
+    for match in re.findall(r'(\{[\s\S]*?\})', response):
+        try:
+            if match.count('{') == match.count('}') and '"' in match:
+                result = json.loads(match)
+                if result and isinstance(result, dict) and len(result) > 0:
+                    return result
+        except json.JSONDecodeError:
+            continue
+    raise ValueError("No valid JSON data could be extracted from the response")
+
+
+def responses(size: int):
+    body = json.dumps(TOKEN)
+    return {
+        "fenced": f"Here is your token:\n```json\n{body}\n```\nLet me know if you need anything else.",
+        "large prose": "The market looks calm today. " * (size // 8) + body,
+        "unclosed braces": "{ " * size + body,
+        "brace noise": "{x} " * size + body,
+        "nested noise": "{" * size + body + "}" * size,
+        "trailing braces": body + " {" * size,
+        "unclosed strings": body + ' {"a": "' * size,
+    }
+
+
+def timed(fn, text: str, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            result = fn(text)
+        except ValueError:
+            result = None
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def streamed(text: str, chunk_size: int = 4):
+    extractor = JSONObjectExtractor(LAUNCHPAD_SCHEMA)
+    for i in range(0, len(text), chunk_size):
+        found = extractor.feed(text[i:i + chunk_size])
+        if found:
+            return found[0]
+    found = extractor.finish()
+    return found[0] if found else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=20000, help="Size of the generated noise")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case, the best is reported")
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the new extractor")
+    args = parser.parse_args()
+
+    print(f"{'case':<16} {'chars':>9} {'legacy ms':>10} {'new ms':>9} {'stream ms':>10}  ok")
+    for name, text in responses(args.size).items():
+        legacy_ms = "-"
+        if not args.skip_legacy:
+            seconds, _ = timed(legacy_parse, text, args.repeat)
+            legacy_ms = f"{seconds * 1000:.1f}"
+        seconds, result = timed(parse_ai_agent_launchpad_response, text, args.repeat)
+        stream_seconds, stream_result = timed(streamed, text, args.repeat)
+        ok = result == TOKEN and stream_result == TOKEN
+        print(f"{name:<16} {len(text):>9} {legacy_ms:>10} {seconds * 1000:>9.1f} {stream_seconds * 1000:>10.1f}  {ok}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+"""
+Load test the backend against local stubs of its upstream services.
+
+Starts the stubs from stubs.py, starts the real app with uvicorn pointed at
+them, then drives each endpoint with a fixed number of concurrent clients
+and reports RPS and p50/p95/p99 latency per endpoint.
+
+Usage (from backend/):
+    python benchmarks/load_test.py --concurrency 32 --duration 20
+    python benchmarks/load_test.py --endpoints chat --latency secret=1.5 --error-rate cohere=0.05
+    python benchmarks/load_test.py --json results.json --max-p95 chat=2.5 --max-error-rate 0.01
+
+Exits with status 1 when a --max-p95 or --max-error-rate budget is exceeded.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from stubs import STUBS
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Hardhat's first well-known development key; only ever signs for the RPC stub
+TEST_PRIVATE_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+
+CHAT_PROMPTS = [
+    "Analyze the best DeFi yield strategies for ETH right now",
+    "Which lending protocols have the safest stablecoin yields?",
+    "Explain impermanent loss in simple terms",
+    "What are the risks of liquid staking derivatives?",
+    "Compare Aave and Compound for USDC lending",
+]
+LAUNCHPAD_PROMPTS = [
+    "Launch a token called Agentonic with symbol AGT",
+    "Create a meme token with 5000000 initial supply",
+    "Deploy a token named Sentinel owned by 0x70997970C51812dc3A010C7d01b50e0d17dc79C8",
+]
+
+ENDPOINTS = {
+    "chat": ("/chat", lambda: {"prompt": random.choice(CHAT_PROMPTS)}),
+    "launchpadChat": ("/launchpadChat", lambda: {"prompt": random.choice(LAUNCHPAD_PROMPTS)}),
+    "sentimentAnalysis": ("/sentimentAnalysis", lambda: {"prompt": "What is the market sentiment right now?"}),
+}
+
+
+def free_port(count: int = 1):
+    """First of `count` consecutive free local ports."""
+    while True:
+        base = random.randint(20000, 60000)
+        try:
+            sockets = []
+            for port in range(base, base + count):
+                sock = socket.socket()
+                sock.bind(("127.0.0.1", port))
+                sockets.append(sock)
+            return base
+        except OSError:
+            continue
+        finally:
+            for sock in sockets:
+                sock.close()
+
+
+def percentile(values: list, pct: float):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, int(round(pct / 100 * len(values))) - 1))]
+
+
+def app_env(stub_port: int, workdir: str):
+    urls = {name: f"http://127.0.0.1:{stub_port + offset}" for offset, name in enumerate(STUBS)}
+    return {
+        **os.environ,
+        "CO_API_URL": urls["cohere"],
+        "COHERE_API_KEY": "stub",
+        "SECRET_AI_URL": urls["secret"],
+        "SECRET_AI_MODEL": "stub",
+        "SECRET_AI_API_KEY": "stub",
+        "ZEREPY_BASE_URL": urls["zerepy"],
+        "SEPOLIA_RPC_URL": urls["rpc"],
+        "AUTO_EVM_RPC_URL": urls["rpc"],
+        "PRIVATE_KEY": TEST_PRIVATE_KEY,
+        "BRIDGE_JOBS_DB": os.path.join(workdir, "bridge_jobs.sqlite3"),
+        "RESPONSE_CACHE_DIR": workdir,
+    }
+
+
+async def wait_ready(url: str, process: subprocess.Popen, timeout: float = 60):
+    deadline = time.time() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.time() < deadline:
+            if process.poll() is not None:
+                raise SystemExit(f"{url} exited with status {process.returncode}")
+            try:
+                await client.get(url, timeout=1)
+                return
+            except httpx.HTTPError:
+                await asyncio.sleep(0.2)
+    raise SystemExit(f"{url} did not come up within {timeout}s")
+
+
+async def drive(client: httpx.AsyncClient, path: str, payload, concurrency: int, duration: float, unique: bool):
+    latencies = []
+    statuses = {}
+    counter = {"n": 0}
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            body = payload()
+            counter["n"] += 1
+            if unique:
+                # Defeats the response cache so every request reaches the stubs
+                body["prompt"] += f" (request {counter['n']})"
+            start = time.perf_counter()
+            try:
+                response = await client.post(path, json=body)
+                status = str(response.status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    errors = sum(count for status, count in statuses.items() if status != "200")
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "error_rate": errors / len(latencies) if latencies else 0.0,
+        "statuses": statuses,
+        **{f"p{pct}": percentile(latencies, pct) for pct in (50, 95, 99)},
+        "max": max(latencies, default=None),
+    }
+
+
+def report(results: dict):
+    print(f"\n{'endpoint':<20} {'requests':>9} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>8}")
+    for name, result in results.items():
+        ms = {pct: result[pct] * 1000 if result[pct] is not None else float("nan") for pct in ("p50", "p95", "p99")}
+        print(f"{name:<20} {result['requests']:>9} {result['rps']:>8.1f} {ms['p50']:>9.1f} {ms['p95']:>9.1f} "
+              f"{ms['p99']:>9.1f} {result['error_rate']:>7.1%}")
+
+
+def budget_failures(results: dict, max_p95: dict, max_error_rate: float):
+    failures = []
+    for name, limit in max_p95.items():
+        if name in results and results[name]["p95"] is not None and results[name]["p95"] > limit:
+            failures.append(f"{name} p95 {results[name]['p95']:.3f}s > {limit}s")
+    if max_error_rate is not None:
+        for name, result in results.items():
+            if result["error_rate"] > max_error_rate:
+                failures.append(f"{name} error rate {result['error_rate']:.1%} > {max_error_rate:.1%}")
+    return failures
+
+
+async def run(args):
+    stub_port = free_port(len(STUBS))
+    app_port = free_port()
+    here = os.path.dirname(os.path.abspath(__file__))
+    stub_cmd = [sys.executable, os.path.join(here, "stubs.py"), "--port", str(stub_port), "--jitter", str(args.jitter)]
+    for value in args.latency or []:
+        stub_cmd += ["--latency", value]
+    for value in args.error_rate or []:
+        stub_cmd += ["--error-rate", value]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        stubs = subprocess.Popen(stub_cmd)
+        app = None
+        try:
+            await wait_ready(f"http://127.0.0.1:{stub_port + STUBS.index('secret')}/", stubs)
+            app = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "main:app", "--port", str(app_port), "--log-level", "warning"],
+                cwd=os.path.join(BACKEND, "src"),
+                env=app_env(stub_port, workdir),
+                stdout=None if args.app_output else subprocess.DEVNULL,
+            )
+            await wait_ready(f"http://127.0.0.1:{app_port}/", app)
+
+            limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{app_port}", limits=limits,
+                                         timeout=args.timeout) as client:
+                results = {}
+                for name in args.endpoints.split(","):
+                    path, payload = ENDPOINTS[name]
+                    print(f"Driving {path} with {args.concurrency} clients for {args.duration}s", flush=True)
+                    if args.warmup:
+                        await drive(client, path, payload, args.concurrency, args.warmup, args.unique_prompts)
+                    results[name] = await drive(client, path, payload, args.concurrency, args.duration,
+                                                args.unique_prompts)
+                stats = (await client.get("/stats")).json()
+        finally:
+            for process in (app, stubs):
+                if process is not None:
+                    process.terminate()
+                    process.wait(timeout=10)
+    return results, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="Comma-separated endpoints to drive")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients per endpoint")
+    parser.add_argument("--duration", type=float, default=15, help="Seconds to drive each endpoint")
+    parser.add_argument("--warmup", type=float, default=2, help="Unrecorded seconds before each endpoint")
+    parser.add_argument("--timeout", type=float, default=60, help="Client timeout per request")
+    parser.add_argument("--unique-prompts", action="store_true", help="Make every prompt unique to bypass caches")
+    parser.add_argument("--latency", action="append", metavar="STUB=SECONDS", help="Mean stub latency")
+    parser.add_argument("--error-rate", action="append", metavar="STUB=RATE", help="Stub failure rate")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Stub latency deviation, relative to the mean")
+    parser.add_argument("--json", help="Write results and the app's /stats to this file")
+    parser.add_argument("--max-p95", action="append", metavar="ENDPOINT=SECONDS", help="Fail above this p95")
+    parser.add_argument("--max-error-rate", type=float, help="Fail above this error rate on any endpoint")
+    parser.add_argument("--app-output", action="store_true", help="Show the app's stdout")
+    args = parser.parse_args()
+
+    unknown = set(args.endpoints.split(",")) - set(ENDPOINTS)
+    if unknown:
+        raise SystemExit(f"Unknown endpoints {sorted(unknown)}, expected some of {list(ENDPOINTS)}")
+    max_p95 = {}
+    for value in args.max_p95 or []:
+        name, _, seconds = value.partition("=")
+        max_p95[name] = float(seconds)
+
+    results, stats = asyncio.run(run(args))
+    report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"results": results, "stats": stats}, f, indent=2)
+    failures = budget_failures(results, max_p95, args.max_error_rate)
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Local stand-ins for the backend's upstream services, for load testing:
+
+    cohere   Cohere v2 chat API (`/v2/chat`)
+    secret   Secret AI, i.e. the Ollama chat API (`/api/chat`)
+    zerepy   The Zerepy agent server (`/agent/action`)
+    rpc      An EVM JSON-RPC node, single and batch requests
+
+Every stub can add latency and fail a share of requests with 503s.
+
+Usage (from backend/):
+    python benchmarks/stubs.py --port 9100 --latency secret=0.8 --error-rate rpc=0.01
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import uvicorn
+from eth_utils import keccak
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+STUBS = ["cohere", "secret", "zerepy", "rpc"]
+
+DEFAULT_LATENCY = {"cohere": 0.4, "secret": 0.6, "zerepy": 0.2, "rpc": 0.05}
+
+TOKEN = {"name": "Agentonic", "symbol": "AGT", "initialSupply": 1000000000, "owner": None}
+ANALYSIS = {
+    "protocols": ["Aave", "Compound"],
+    "apy": {"Aave": 4.2, "Compound": 3.8},
+    "risks": ["smart contract risk"],
+    "alternative_protocols": ["Morpho"],
+}
+TWEET_TEXTS = [
+    "$BTC breaks a new ATH as ETF inflows keep coming",
+    "Protocol paused after an exploit drained the lending pool",
+    "New L2 launching next week with a points program",
+    "Stablecoin supply flat this week",
+]
+
+
+class Faults:
+    """Latency and error injection for one stub."""
+
+    def __init__(self, latency: float, jitter: float, error_rate: float):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+
+    async def apply(self):
+        """Sleep for the injected latency; True if the request should fail."""
+        self.requests += 1
+        await asyncio.sleep(max(0.0, random.gauss(self.latency, self.latency * self.jitter)))
+        if random.random() < self.error_rate:
+            self.errors += 1
+            return True
+        return False
+
+
+def _unavailable():
+    return JSONResponse({"message": "injected failure"}, status_code=503)
+
+
+def cohere_app(faults: Faults):
+    app = FastAPI()
+
+    @app.post("/v2/chat")
+    async def chat(request: Request):
+        body = await request.json()
+        if await faults.apply():
+            return _unavailable()
+        system = body["messages"][0]["content"] if body.get("messages") else ""
+        if "right action" in system:
+            text = json.dumps({"action": random.choice(["analyze", "other"]), "parameters": []})
+        else:
+            text = json.dumps(ANALYSIS)
+        return {
+            "id": "stub",
+            "finish_reason": "COMPLETE",
+            "message": {"role": "assistant", "content": [{"type": "text", "text": text}]},
+            "usage": {"billed_units": {"input_tokens": 100, "output_tokens": 50},
+                      "tokens": {"input_tokens": 100, "output_tokens": 50}},
+        }
+
+    return app
+
+
+def secret_app(faults: Faults):
+    app = FastAPI()
+
+    @app.get("/")
+    async def health():
+        return "Ollama is running"
+
+    @app.post("/api/chat")
+    async def chat(request: Request):
+        body = await request.json()
+        if await faults.apply():
+            return _unavailable()
+        system = body["messages"][0]["content"] if body.get("messages") else ""
+        if body.get("format") or "slot filling" in system:
+            content = json.dumps(TOKEN)
+        elif "Score the market sentiment" in system:
+            content = json.dumps({"scores": {}})
+        elif "sentiment" in system:
+            content = json.dumps({"sentiment": True})
+        else:
+            content = "Diversify across blue-chip lending markets and keep an eye on utilisation. " * 4
+        message = {
+            "model": body.get("model", "stub"),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "done_reason": "stop",
+            "eval_count": len(content.split()),
+            "prompt_eval_count": 100,
+        }
+        if not body.get("stream", True):
+            return {**message, "message": {"role": "assistant", "content": content}, "done": True}
+
+        async def chunks():
+            words = content.split(" ")
+            for i, word in enumerate(words):
+                text = word if i == len(words) - 1 else word + " "
+                yield json.dumps({**message, "message": {"role": "assistant", "content": text}, "done": False}) + "\n"
+            yield json.dumps({**message, "message": {"role": "assistant", "content": ""}, "done": True}) + "\n"
+
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    return app
+
+
+def zerepy_app(faults: Faults):
+    app = FastAPI()
+    counter = {"id": 1000}
+
+    @app.post("/agent/action")
+    async def action(request: Request):
+        body = await request.json()
+        if await faults.apply():
+            return _unavailable()
+        if body.get("action") != "get-latest-tweets":
+            return {"status": "success", "result": {"id": "stub"}}
+        now = datetime.now(timezone.utc)
+        tweets = []
+        for i in range(5):
+            counter["id"] += 1
+            tweets.append({
+                "id": str(counter["id"]),
+                "text": random.choice(TWEET_TEXTS),
+                "created_at": (now - timedelta(minutes=i)).isoformat(),
+            })
+        return {"status": "success", "result": tweets}
+
+    return app
+
+
+def rpc_app(faults: Faults, mine_after: float = 2.0):
+    app = FastAPI()
+    sent = {}
+
+    def handle(call: dict):
+        method, params = call.get("method"), call.get("params", [])
+        result = None
+        if method == "eth_chainId":
+            result = hex(490000)
+        elif method == "eth_gasPrice":
+            result = hex(10**9)
+        elif method == "eth_estimateGas":
+            result = hex(60000)
+        elif method == "eth_blockNumber":
+            result = hex(int(time.time()))
+        elif method == "eth_getBalance":
+            result = hex(10**21)
+        elif method == "eth_getTransactionCount":
+            # Nonces are assigned by the backend after this first lookup
+            result = hex(0)
+        elif method == "eth_sendRawTransaction":
+            tx_hash = "0x" + keccak(hexstr=params[0]).hex()
+            sent[tx_hash] = time.time()
+            result = tx_hash
+        elif method == "eth_getTransactionReceipt":
+            sent_at = sent.get(params[0].lower())
+            if sent_at is not None and time.time() - sent_at > mine_after:
+                result = {
+                    "transactionHash": params[0],
+                    "blockNumber": hex(int(sent_at) + 1),
+                    "blockHash": "0x" + "00" * 32,
+                    "status": "0x1",
+                    "gasUsed": hex(50000),
+                    "cumulativeGasUsed": hex(50000),
+                    "contractAddress": None,
+                    "logs": [],
+                }
+        return {"jsonrpc": "2.0", "id": call.get("id"), "result": result}
+
+    @app.post("/")
+    async def rpc(request: Request):
+        body = await request.json()
+        if await faults.apply():
+            return _unavailable()
+        if isinstance(body, list):
+            return [handle(call) for call in body]
+        return handle(body)
+
+    return app
+
+
+APPS = {"cohere": cohere_app, "secret": secret_app, "zerepy": zerepy_app, "rpc": rpc_app}
+
+
+def parse_overrides(values: list, cast=float):
+    """`name=value` pairs from the command line."""
+    overrides = {}
+    for value in values or []:
+        name, _, number = value.partition("=")
+        if name not in STUBS:
+            raise SystemExit(f"Unknown stub {name!r}, expected one of {STUBS}")
+        overrides[name] = cast(number)
+    return overrides
+
+
+def serve(port: int, latency: dict = None, error_rate: dict = None, jitter: float = 0.2):
+    """
+    Run every stub on consecutive ports starting at `port`, in this order:
+    cohere, secret, zerepy, rpc. Blocks until interrupted.
+    """
+    latency = {**DEFAULT_LATENCY, **(latency or {})}
+    error_rate = error_rate or {}
+    servers = []
+    for offset, name in enumerate(STUBS):
+        faults = Faults(latency[name], jitter, error_rate.get(name, 0.0))
+        config = uvicorn.Config(APPS[name](faults), host="127.0.0.1", port=port + offset, log_level="warning")
+        servers.append(uvicorn.Server(config))
+    print(f"Stubs listening on ports {port}-{port + len(STUBS) - 1} ({', '.join(STUBS)})", flush=True)
+
+    async def run():
+        await asyncio.gather(*(server.serve() for server in servers))
+
+    asyncio.run(run())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=9100, help="First port; stubs use four consecutive ports")
+    parser.add_argument("--latency", action="append", metavar="STUB=SECONDS", help="Mean latency per stub")
+    parser.add_argument("--error-rate", action="append", metavar="STUB=RATE", help="Share of requests failed with 503")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Latency standard deviation, relative to the mean")
+    args = parser.parse_args()
+    serve(args.port, parse_overrides(args.latency), parse_overrides(args.error_rate), args.jitter)
+
+
+if __name__ == "__main__":
+    main()
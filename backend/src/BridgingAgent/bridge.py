@@ -1,54 +1,59 @@
+import logging
 import os 
 from dotenv import load_dotenv
 from eth_account import Account
 from web3 import Web3
+from BridgingAgent.tx_pipeline import get_pipeline
+import asyncio
 import json
 
 base_url = "http://localhost:8000"
 
 load_dotenv()
 
-private_key = os.getenv("PRIVATE_KEY")
-
-SEPOLIA_RPC_URL = os.getenv("SEPOLIA_RPC_URL")
-AUTO_EVM_RPC_URL = os.getenv("AUTO_EVM_RPC_URL")
+logger = logging.getLogger(__name__)
 
-sepolia_web3 = Web3(Web3.HTTPProvider(SEPOLIA_RPC_URL))
-auto_evm_web3 = Web3(Web3.HTTPProvider(AUTO_EVM_RPC_URL))
+private_key = os.getenv("PRIVATE_KEY")
 
-def bridge_sepolia_to_auto_evm(amount: int, address: str):
+EXPLORER_URLS = {
+    "sepolia": "https://sepolia.etherscan.io/tx/0x{}",
+    "auto_evm": "https://blockscout.taurus.autonomys.xyz/tx/0x{}",
+}
+
+def bridge_legs(amount, address: str):
+    """
+    The two transactions making up a bridge: the Sepolia leg locks the
+    amount in the hot wallet and the Auto EVM leg pays it out to `address`.
+    Nonce, gas price and chain id are filled in by the chain's pipeline.
+    """
     account = Account.from_key(private_key)
-    tx = {
-        'nonce': sepolia_web3.eth.get_transaction_count(account.address),
-        'to': account.address,
-        'value': Web3.to_wei(amount, 'ether'),
-        'gas': 30000,
-        'gasPrice': int(sepolia_web3.eth.gas_price * 1.2),
-        'chainId': 11155111,
-    }   
-    signed_tx = sepolia_web3.eth.account.sign_transaction(tx, private_key)
-    tx_hash = sepolia_web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+    return {
+        "sepolia": {
+            'to': account.address,
+            'value': Web3.to_wei(amount, 'ether'),
+            'gas': 30000,
+        },
+        "auto_evm": {
+            'from': account.address,
+            'to': address,
+            'value': Web3.to_wei(amount, 'ether'),
+            'gas': 30000,
+        },
+    }
+
+async def bridge_sepolia_to_auto_evm(amount: int, address: str):
+    nonce, tx_hash = await get_pipeline("sepolia").submit(bridge_legs(amount, address)["sepolia"])
     return tx_hash.hex()
 
-def bridge_auto_evm_to_sepolia(amount: int, address: str):
-    tx_hash = bridge_sepolia_to_auto_evm(amount, address)
-    print(f"Transaction sent on Sepolia: {tx_hash}")
-    txh_url = f"https://sepolia.etherscan.io/tx/0x{tx_hash}"
-
-    account = Account.from_key(private_key)
-    tx = {
-        'nonce': auto_evm_web3.eth.get_transaction_count(account.address),
-        'from': account.address,
-        'to': address,
-        'value': Web3.to_wei(amount, 'ether'),
-        'gas': 30000,
-        'gasPrice': int(auto_evm_web3.eth.gas_price * 1.2),
-        'chainId': 490000,
-    }   
-    signed_tx = auto_evm_web3.eth.account.sign_transaction(tx, private_key)
-    tx_hash = auto_evm_web3.eth.send_raw_transaction(signed_tx.raw_transaction).hex()
-    print(f"Transaction sent on AutoEVM: {tx_hash}")
-    txn_url = f"https://blockscout.taurus.autonomys.xyz/tx/0x{tx_hash}"
-    return {"AutoEVMURL": txn_url , "SepoliaURL": txh_url}
-    
-    
\ No newline at end of file
+async def bridge_auto_evm_to_sepolia(amount: int, address: str):
+    legs = bridge_legs(amount, address)
+    (_, sepolia_hash), (_, auto_evm_hash) = await asyncio.gather(
+        get_pipeline("sepolia").submit(legs["sepolia"]),
+        get_pipeline("auto_evm").submit(legs["auto_evm"]),
+    )
+    logger.info("Transaction sent on Sepolia: %s", sepolia_hash.hex())
+    logger.info("Transaction sent on AutoEVM: %s", auto_evm_hash.hex())
+    return {
+        "AutoEVMURL": EXPLORER_URLS["auto_evm"].format(auto_evm_hash.hex()),
+        "SepoliaURL": EXPLORER_URLS["sepolia"].format(sepolia_hash.hex()),
+    }
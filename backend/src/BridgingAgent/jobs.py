@@ -0,0 +1,214 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from dotenv import load_dotenv
+from BridgingAgent.bridge import bridge_legs, EXPLORER_URLS
+from BridgingAgent.tx_pipeline import get_pipeline
+from BridgingAgent.receipts import get_watcher
+from telemetry import span
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+BRIDGE_JOBS_DB = os.getenv(
+    "BRIDGE_JOBS_DB",
+    str(Path(__file__).resolve().parents[2] / ".cache" / "bridge_jobs.sqlite3"),
+)
+BRIDGE_RECEIPT_TIMEOUT = float(os.getenv("BRIDGE_RECEIPT_TIMEOUT", "900"))
+
+URL_KEYS = {"sepolia": "SepoliaURL", "auto_evm": "AutoEVMURL"}
+
+
+class BridgeJobStore:
+    """SQLite persistence for bridge jobs, one JSON document per job."""
+
+    def __init__(self, path: str = BRIDGE_JOBS_DB):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS bridge_jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                data TEXT NOT NULL
+            )"""
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def row(job: dict):
+        """Stamp and serialize a job, on the thread that owns it."""
+        job["updated_at"] = time.time()
+        return job["job_id"], job["status"], job["created_at"], job["updated_at"], json.dumps(job)
+
+    def write(self, row: tuple):
+        # Writes may finish out of order, so an older row never replaces a newer one
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO bridge_jobs (id, status, created_at, updated_at, data) VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET status = excluded.status, updated_at = excluded.updated_at,
+                    data = excluded.data
+                WHERE excluded.updated_at >= bridge_jobs.updated_at""",
+                row,
+            )
+            self._conn.commit()
+
+    def get(self, job_id: str):
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM bridge_jobs WHERE id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def unfinished(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM bridge_jobs WHERE status IN ('queued', 'submitted')"
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+
+class BridgeJobEngine:
+    """
+    Runs bridges as background jobs. Both legs are submitted concurrently,
+    receipts are tracked asynchronously and every state change is persisted,
+    so callers get a job id immediately and can poll `/bridge/{job_id}`.
+
+    Job status goes `queued` -> `submitted` -> `confirmed`, or `failed` if
+    any leg fails. Each leg carries its own status, nonce, tx hash and
+    explorer URL.
+    """
+
+    def __init__(self, store: BridgeJobStore = None):
+        self._store = store
+        self._jobs = {}
+        self._tasks = set()
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = BridgeJobStore()
+        return self._store
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _save(self, job: dict):
+        # SQLite commits block, so keep them off the event loop
+        await asyncio.to_thread(self.store.write, self.store.row(job))
+
+    async def _update_status(self, job: dict):
+        statuses = [leg["status"] for leg in job["legs"].values()]
+        if "failed" in statuses:
+            job["status"] = "failed"
+        elif all(status == "confirmed" for status in statuses):
+            job["status"] = "confirmed"
+        elif all(status in ("submitted", "confirmed") for status in statuses):
+            job["status"] = "submitted"
+        for chain, leg in job["legs"].items():
+            if leg.get("tx_hash"):
+                job[URL_KEYS[chain]] = leg["url"]
+        await self._save(job)
+        if not any(status in ("queued", "submitted") for status in statuses):
+            # Finished jobs are only kept in SQLite
+            self._jobs.pop(job["job_id"], None)
+
+    async def create(self, amount, address: str):
+        """
+        Create a bridge job and start it in the background.
+
+        Returns:
+            dict: The new job, in `queued` status
+        """
+        now = time.time()
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": "queued",
+            "amount": str(amount),
+            "address": address,
+            "created_at": now,
+            "legs": {chain: {"status": "queued"} for chain in bridge_legs(amount, address)},
+        }
+        job["status_url"] = f"/bridge/{job['job_id']}"
+        self._jobs[job["job_id"]] = job
+        await self._save(job)
+        self._spawn(self._run(job))
+        return dict(job)
+
+    async def _run(self, job: dict):
+        txs = bridge_legs(job["amount"], job["address"])
+        await asyncio.gather(*(self._run_leg(job, chain, tx) for chain, tx in txs.items()))
+
+    async def _run_leg(self, job: dict, chain: str, tx: dict):
+        leg = job["legs"][chain]
+        try:
+            async with span("bridge_leg", chain=chain):
+                nonce, tx_hash = await get_pipeline(chain).submit(tx)
+        except Exception as e:
+            leg.update(status="failed", error=str(e))
+            await self._update_status(job)
+            return
+        leg.update(status="submitted", nonce=nonce, tx_hash=tx_hash.hex(), url=EXPLORER_URLS[chain].format(tx_hash.hex()))
+        logger.info("Transaction sent on %s: %s", chain, leg["tx_hash"])
+        await self._update_status(job)
+        await self._track_receipt(job, chain)
+
+    async def _track_receipt(self, job: dict, chain: str):
+        leg = job["legs"][chain]
+        receipt = await get_watcher(chain).wait(leg["tx_hash"], timeout=BRIDGE_RECEIPT_TIMEOUT)
+        await get_pipeline(chain).settle(leg["nonce"], receipt)
+        if receipt is None:
+            leg.update(status="failed", error="timed out waiting for receipt")
+            await self._update_status(job)
+            return
+        leg["block_number"] = receipt["blockNumber"]
+        leg["status"] = "confirmed" if receipt["status"] == 1 else "failed"
+        if leg["status"] == "failed":
+            leg["error"] = "transaction reverted"
+        await self._update_status(job)
+
+    async def get(self, job_id: str):
+        job = self._jobs.get(job_id) or await asyncio.to_thread(self.store.get, job_id)
+        return dict(job) if job else None
+
+    async def resume(self):
+        """
+        Pick up jobs left unfinished by a previous process. Submitted legs go
+        back to receipt tracking; legs that never reached the pipeline are
+        failed rather than resent, since the process may have died after
+        broadcasting them.
+        """
+        for job in await asyncio.to_thread(self.store.unfinished):
+            self._jobs[job["job_id"]] = job
+            for chain, leg in job["legs"].items():
+                if leg["status"] == "queued":
+                    leg.update(status="failed", error="interrupted before submission was recorded")
+                elif leg["status"] == "submitted":
+                    self._spawn(self._track_receipt(job, chain))
+            await self._update_status(job)
+
+    async def stop(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self):
+        """Counts of in-memory (unfinished) jobs by status."""
+        statuses = {}
+        for job in self._jobs.values():
+            statuses[job["status"]] = statuses.get(job["status"], 0) + 1
+        return {"active_tasks": len(self._tasks), "jobs": statuses}
+
+
+bridge_jobs = BridgeJobEngine()
@@ -0,0 +1,207 @@
+import asyncio
+import inspect
+import logging
+import os
+import time
+
+import requests
+from dotenv import load_dotenv
+from web3 import Web3
+
+from BridgingAgent.tx_pipeline import get_pipeline
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+RECEIPT_POLL_INTERVAL = float(os.getenv("RECEIPT_POLL_INTERVAL", "3"))
+RECEIPT_TIMEOUT = float(os.getenv("RECEIPT_TIMEOUT", "900"))
+# Receipts requested per JSON-RPC batch
+RECEIPT_BATCH_SIZE = int(os.getenv("RECEIPT_BATCH_SIZE", "100"))
+# How long shutdown waits for receipt callbacks that are still running
+RECEIPT_CALLBACK_DRAIN_TIMEOUT = float(os.getenv("RECEIPT_CALLBACK_DRAIN_TIMEOUT", "10"))
+
+
+def _normalize_hash(tx_hash):
+    if isinstance(tx_hash, (bytes, bytearray)):
+        tx_hash = tx_hash.hex()
+    tx_hash = tx_hash.lower()
+    return tx_hash if tx_hash.startswith("0x") else "0x" + tx_hash
+
+
+def _parse_receipt(raw: dict):
+    def quantity(value):
+        return int(value, 16) if isinstance(value, str) else value
+
+    return {
+        "transactionHash": raw["transactionHash"],
+        "blockNumber": quantity(raw["blockNumber"]),
+        "status": quantity(raw.get("status", "0x1")),
+        "gasUsed": quantity(raw.get("gasUsed", 0)),
+        "contractAddress": raw.get("contractAddress"),
+    }
+
+
+class ReceiptWatcher:
+    """
+    Resolves receipts for every pending transaction on one chain from a
+    single poll loop. Each round asks the node for all pending receipts in
+    JSON-RPC batches of `eth_getTransactionReceipt`, so N pending
+    transactions cost one loop and N/`batch_size` HTTP requests per
+    interval instead of N blocking waits.
+
+    The loop starts with the first watched transaction and exits once
+    nothing is pending.
+    """
+
+    def __init__(self, name: str, web3: Web3, poll_interval: float = RECEIPT_POLL_INTERVAL,
+                 batch_size: int = RECEIPT_BATCH_SIZE):
+        self.name = name
+        self.web3 = web3
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self._pending = {}
+        self._task = None
+        # Running coroutine callbacks, referenced so they aren't garbage collected
+        self._callbacks = set()
+        self._batching = True
+        self.metrics = {"polls": 0, "rpc_requests": 0, "resolved": 0, "timed_out": 0, "errors": 0}
+
+    def watch(self, tx_hash, callback=None, timeout: float = RECEIPT_TIMEOUT):
+        """
+        Track a transaction until it is mined.
+
+        Args:
+            tx_hash: Transaction hash, with or without `0x`
+            callback: Called with the receipt, or None on timeout; may be a
+                coroutine function
+            timeout (float): Seconds to wait before giving up
+
+        Returns:
+            asyncio.Future: Resolves to the receipt dict, or None on timeout
+        """
+        tx_hash = _normalize_hash(tx_hash)
+        entry = self._pending.get(tx_hash)
+        if entry is None:
+            entry = {"future": asyncio.get_running_loop().create_future(), "callbacks": [], "deadline": 0.0}
+            self._pending[tx_hash] = entry
+        entry["deadline"] = max(entry["deadline"], time.time() + timeout)
+        if callback is not None:
+            entry["callbacks"].append(callback)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return entry["future"]
+
+    async def wait(self, tx_hash, timeout: float = RECEIPT_TIMEOUT):
+        return await asyncio.shield(self.watch(tx_hash, timeout=timeout))
+
+    def _fetch_batch(self, hashes: list):
+        """Raw receipts for `hashes`; missing (not yet mined) ones are None."""
+        if self._batching:
+            self.metrics["rpc_requests"] += 1
+            try:
+                responses = self.web3.provider.make_batch_request(
+                    [("eth_getTransactionReceipt", [tx_hash]) for tx_hash in hashes]
+                )
+            except requests.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                if status is None or status >= 500:
+                    raise
+                # Rejected outright, e.g. 400/405 without batch support or 413 for an oversized batch
+                responses = {"error": f"HTTP {status}"}
+            if isinstance(responses, list) and not all("error" in response for response in responses):
+                return [response.get("result") for response in responses]
+            # Nodes without batch support answer with a single error object,
+            # or with an error for every request of an oversized batch
+            error = responses[0].get("error") if isinstance(responses, list) and responses else None
+            if isinstance(responses, dict):
+                error = responses.get("error")
+            logger.warning("RPC on %s rejected batch request, polling receipts individually: %s", self.name, error)
+            self._batching = False
+        receipts = []
+        for tx_hash in hashes:
+            self.metrics["rpc_requests"] += 1
+            receipts.append(self.web3.provider.make_request("eth_getTransactionReceipt", [tx_hash]).get("result"))
+        return receipts
+
+    def _fetch(self, hashes: list):
+        receipts = {}
+        for i in range(0, len(hashes), self.batch_size):
+            chunk = hashes[i:i + self.batch_size]
+            receipts.update(zip(chunk, self._fetch_batch(chunk)))
+        return receipts
+
+    def _resolve(self, tx_hash: str, receipt):
+        entry = self._pending.pop(tx_hash)
+        self.metrics["resolved" if receipt is not None else "timed_out"] += 1
+        if not entry["future"].done():
+            entry["future"].set_result(receipt)
+        for callback in entry["callbacks"]:
+            try:
+                result = callback(receipt)
+                if inspect.isawaitable(result):
+                    task = asyncio.ensure_future(result)
+                    self._callbacks.add(task)
+                    task.add_done_callback(lambda task, tx_hash=tx_hash: self._callback_done(tx_hash, task))
+            except Exception:
+                logger.exception("Receipt callback for %s failed", tx_hash)
+
+    def _callback_done(self, tx_hash: str, task: asyncio.Future):
+        self._callbacks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Receipt callback for %s failed", tx_hash, exc_info=task.exception())
+
+    async def _run(self):
+        while self._pending:
+            await asyncio.sleep(self.poll_interval)
+            self.metrics["polls"] += 1
+            hashes = list(self._pending)
+            try:
+                receipts = await asyncio.to_thread(self._fetch, hashes)
+            except Exception as e:
+                # Transient RPC error, try again next round
+                self.metrics["errors"] += 1
+                logger.warning("Error polling receipts on %s: %s", self.name, e)
+                receipts = {}
+            now = time.time()
+            for tx_hash in hashes:
+                raw = receipts.get(tx_hash)
+                if raw:
+                    self._resolve(tx_hash, _parse_receipt(raw))
+                elif now > self._pending[tx_hash]["deadline"]:
+                    self._resolve(tx_hash, None)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        # Callbacks persist transaction outcomes, so let running ones finish
+        if self._callbacks:
+            _, unfinished = await asyncio.wait(set(self._callbacks), timeout=RECEIPT_CALLBACK_DRAIN_TIMEOUT)
+            for task in unfinished:
+                logger.warning("Cancelling receipt callback still running on %s at shutdown", self.name)
+                task.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
+
+    def stats(self):
+        return {**self.metrics, "pending": len(self._pending), "batching": self._batching}
+
+
+watchers = {}
+
+
+def get_watcher(chain: str):
+    """Shared receipt watcher for a chain, polling through its pipeline's RPC."""
+    if chain not in watchers:
+        watchers[chain] = ReceiptWatcher(chain, get_pipeline(chain).web3)
+    return watchers[chain]
+
+
+async def stop_watchers():
+    for watcher in watchers.values():
+        await watcher.stop()
+
+
+def watcher_stats():
+    return {chain: watcher.stats() for chain, watcher in watchers.items()}
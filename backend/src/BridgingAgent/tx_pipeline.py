@@ -0,0 +1,254 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+
+from dotenv import load_dotenv
+from eth_account import Account
+from web3 import Web3
+from telemetry import InstrumentedHTTPProvider
+from shared_state import SharedState, shared_state
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+GAS_PRICE_TTL = float(os.getenv("GAS_PRICE_TTL", "15"))
+GAS_PRICE_MULTIPLIER = float(os.getenv("GAS_PRICE_MULTIPLIER", "1.2"))
+TX_SUBMIT_WORKERS = int(os.getenv("TX_SUBMIT_WORKERS", "4"))
+TX_SUBMIT_RETRIES = int(os.getenv("TX_SUBMIT_RETRIES", "2"))
+NONCE_STATE_TTL = float(os.getenv("NONCE_STATE_TTL", "300"))
+
+CHAINS = {
+    "sepolia": {"rpc_url": os.getenv("SEPOLIA_RPC_URL"), "chain_id": 11155111},
+    "auto_evm": {"rpc_url": os.getenv("AUTO_EVM_RPC_URL"), "chain_id": 490000},
+}
+
+# Node errors that mean our local nonce is out of sync with the chain
+NONCE_ERRORS = ("nonce too low", "already known", "replacement transaction underpriced", "invalid nonce")
+
+
+class NonceManager:
+    """
+    Hands out nonces for one account on one chain from a counter in the
+    shared state store, so concurrent transactions from any worker don't
+    each call `get_transaction_count` and collide on the same value. The
+    counter is seeded from the chain's pending count, nonces of
+    transactions that failed to broadcast are reused first so they don't
+    leave gaps, and the counter is raised to the chain's when the node
+    reports a nonce conflict.
+
+    The counter expires after `NONCE_STATE_TTL` idle seconds, so a
+    transaction dropped from the mempool only leaves the counter ahead of
+    the chain until the account next goes quiet.
+    """
+
+    def __init__(self, web3: Web3, address: str, chain: str, state: SharedState = shared_state):
+        self.web3 = web3
+        self.address = address
+        self.state = state
+        self.key = state.key("nonce", chain, address.lower())
+        self.released_key = state.key("nonce_released", chain, address.lower())
+        self._lock = threading.Lock()
+        self._reserved = set()
+        self._last_nonce = None
+        self.pending = {}
+
+    def _chain_nonce(self):
+        return self.web3.eth.get_transaction_count(self.address, "pending")
+
+    def reserve(self):
+        with self._lock:
+            store = self.state.store
+            nonce = store.set_pop_min(self.released_key)
+            while nonce is None:
+                next_nonce = store.incr(self.key, NONCE_STATE_TTL)
+                if next_nonce is not None:
+                    nonce = next_nonce - 1
+                elif store.add(self.key, str(self._chain_nonce()), NONCE_STATE_TTL):
+                    # Released nonces from before the counter expired are stale
+                    store.set_clear(self.released_key)
+            self._reserved.add(nonce)
+            self._last_nonce = nonce
+            return nonce
+
+    def sent(self, nonce: int, tx_hash: str):
+        with self._lock:
+            self._reserved.discard(nonce)
+            self.pending[nonce] = tx_hash
+
+    def release(self, nonce: int):
+        """Give back a nonce whose transaction was never broadcast."""
+        with self._lock:
+            self._reserved.discard(nonce)
+            self.state.store.set_add(self.released_key, nonce)
+
+    def confirmed(self, nonce: int):
+        with self._lock:
+            self.pending.pop(nonce, None)
+
+    def resync(self, failed_nonce: int = None):
+        """
+        Re-align the shared counter with the chain after a nonce conflict.
+        The counter only ever moves up here: other workers may hold reserved
+        nonces below it that they haven't broadcast yet.
+        """
+        with self._lock:
+            self._reserved.discard(failed_nonce)
+            chain_nonce = self._chain_nonce()
+            self.pending = {nonce: tx_hash for nonce, tx_hash in self.pending.items() if nonce >= chain_nonce}
+            store = self.state.store
+            store.raise_to(self.key, chain_nonce, NONCE_STATE_TTL)
+            store.set_discard_below(self.released_key, chain_nonce)
+
+    def stats(self):
+        return {"last_nonce": self._last_nonce, "pending": len(self.pending), "reserved": len(self._reserved)}
+
+
+class GasPriceCache:
+    """Caches the node's gas price for `ttl` seconds."""
+
+    def __init__(self, web3: Web3, ttl: float = GAS_PRICE_TTL, multiplier: float = GAS_PRICE_MULTIPLIER):
+        self.web3 = web3
+        self.ttl = ttl
+        self.multiplier = multiplier
+        self._lock = threading.Lock()
+        self._value = None
+        self._fetched_at = 0.0
+
+    def get(self):
+        with self._lock:
+            if self._value is None or time.time() - self._fetched_at > self.ttl:
+                self._value = int(self.web3.eth.gas_price * self.multiplier)
+                self._fetched_at = time.time()
+            return self._value
+
+
+class TransactionPipeline:
+    """
+    Async submission queue for transactions from the hot wallet on one
+    chain. A small pool of workers takes nonces from the shared counter,
+    fills in the cached gas price, signs and broadcasts, so callers only
+    wait for their own `eth_sendRawTransaction` round-trip.
+    """
+
+    def __init__(self, name: str, rpc_url: str, chain_id: int, private_key: str, workers: int = TX_SUBMIT_WORKERS):
+        self.name = name
+        self.chain_id = chain_id
+        self.web3 = Web3(InstrumentedHTTPProvider(rpc_url, name))
+        self.private_key = private_key
+        self.account = Account.from_key(private_key)
+        self.nonces = NonceManager(self.web3, self.account.address, name)
+        self.gas_price = GasPriceCache(self.web3)
+        self.workers = workers
+        self._queue = None
+        self._tasks = []
+        self.metrics = {"submitted": 0, "failed": 0, "nonce_resyncs": 0}
+
+    def _send(self, tx: dict):
+        for attempt in range(TX_SUBMIT_RETRIES + 1):
+            nonce = self.nonces.reserve()
+            signed_tx = self.web3.eth.account.sign_transaction(
+                {**tx, "nonce": nonce, "gasPrice": tx.get("gasPrice") or self.gas_price.get(), "chainId": self.chain_id},
+                self.private_key,
+            )
+            try:
+                tx_hash = self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            except Exception as e:
+                if not any(err in str(e).lower() for err in NONCE_ERRORS):
+                    self.nonces.release(nonce)
+                    raise
+                self.nonces.resync(nonce)
+                self.metrics["nonce_resyncs"] += 1
+                if attempt == TX_SUBMIT_RETRIES:
+                    raise
+                continue
+            self.nonces.sent(nonce, tx_hash.hex())
+            return nonce, tx_hash
+
+    async def _worker(self):
+        while True:
+            tx, future = await self._queue.get()
+            try:
+                result = await asyncio.to_thread(self._send, tx)
+                self.metrics["submitted"] += 1
+                if not future.cancelled():
+                    future.set_result(result)
+            except Exception as e:
+                self.metrics["failed"] += 1
+                if not future.cancelled():
+                    future.set_exception(e)
+            finally:
+                self._queue.task_done()
+
+    def _start(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def submit(self, tx: dict):
+        """
+        Queue a transaction for signing and broadcast.
+
+        Args:
+            tx (dict): Transaction fields without `nonce` and `chainId`;
+                `gasPrice` defaults to the cached gas price
+
+        Returns:
+            tuple: The assigned nonce and the transaction hash
+        """
+        self._start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((tx, future))
+        return await future
+
+    async def settle(self, nonce: int, receipt):
+        """
+        Record the outcome of a sent transaction. A mined one, reverted or
+        not, frees its nonce. After a receipt timeout the nonce manager is
+        re-aligned with the chain, so the nonce stays pending only while the
+        chain hasn't moved past it (the transaction may still be mined).
+        """
+        if receipt is not None:
+            self.nonces.confirmed(nonce)
+            return
+        try:
+            await asyncio.to_thread(self.nonces.resync)
+        except Exception as e:
+            logger.warning("Could not resync nonces on %s after a receipt timeout, nonce %s left pending: %s",
+                           self.name, nonce, e)
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._queue = None
+        self._tasks = []
+
+    def stats(self):
+        return {
+            **self.metrics,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            **self.nonces.stats(),
+        }
+
+
+pipelines = {}
+
+
+def get_pipeline(chain: str):
+    """Shared transaction pipeline for the backend's hot wallet on a chain."""
+    if chain not in pipelines:
+        config = CHAINS[chain]
+        pipelines[chain] = TransactionPipeline(chain, config["rpc_url"], config["chain_id"], os.getenv("PRIVATE_KEY"))
+    return pipelines[chain]
+
+
+async def stop_pipelines():
+    for pipeline in pipelines.values():
+        await pipeline.stop()
+
+
+def pipeline_stats():
+    return {chain: pipeline.stats() for chain, pipeline in pipelines.items()}
@@ -1,22 +1,29 @@
-from secret_ai_sdk.secret_ai import ChatSecret
-from secret_ai_sdk.secret import Secret
-
-import cohere
+from DefiAgent.llm import cohere_chat, cohere_chat_stream, secret_invoke, secret_stream
+from DefiAgent.intent_classifier import classify_intent
+from DefiAgent.response_cache import cached_response, cached_stream
+from DefiAgent.singleflight import coalesced, exact_prompt
+from DefiAgent.structured import StructuredOutput
+from utils import LAUNCHPAD_SCHEMA
 from dotenv import load_dotenv
-import os 
+import json
 
 load_dotenv()
 
-secret_client = Secret(chain_id='pulsar-3', node_url="https://pulsar.lcd.secretnodes.com")
-models = secret_client.get_models()
-urls = secret_client.get_urls(model=models[0])
-secret_ai_llm = ChatSecret(base_url=urls[0], model=models[0], temperature=1.)
-
-api_key = os.environ.get("COHERE_API_KEY")
+# Enforced while decoding; the parsed object is accepted with the looser
+# LAUNCHPAD_SCHEMA
+LAUNCHPAD_OUTPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "symbol": {"type": "string"},
+        "initialSupply": {"type": "integer"},
+        "owner": {"type": ["string", "null"]},
+    },
+    "required": ["name", "symbol", "initialSupply", "owner"],
+}
+launchpad_output = StructuredOutput("launchpad", LAUNCHPAD_OUTPUT_SCHEMA, LAUNCHPAD_SCHEMA)
 
-co = cohere.ClientV2(api_key=api_key)
-
-def intent_detection_and_slot_filling(prompt: str):
+async def intent_detection_and_slot_filling(prompt: str):
     try:
         messages =  [
             (
@@ -56,9 +63,7 @@ def intent_detection_and_slot_filling(prompt: str):
                 prompt
             )
         ]
-        response = secret_ai_llm.invoke(messages, stream=False)
-        # print(response.content)
-        return response.content
+        return await launchpad_output.generate(messages)
     except Exception as e:
         return f"Error generating response: {str(e)}"
 
@@ -96,60 +101,79 @@ DefiAnalysisSystemPrompt = """Context: You are an expert DeFi Optimizer.
                         "alternative_protocols": ["string"]
                     }
                 """
+def defi_analysis_messages(prompt: str):
+    return [
+        {
+            "role": "system",
+            "content": DefiAnalysisSystemPrompt 
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+
+@coalesced("defi_analysis")
+@cached_response("defi_analysis")
 async def defi_analysis(prompt: str):
     try:
-        res = co.chat(
+        res = await cohere_chat(
             model="command-r-plus-08-2024",
-            messages=[
-                {
-                    "role": "system",
-                    "content": DefiAnalysisSystemPrompt 
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],  
+            messages=defi_analysis_messages(prompt),
             response_format={"type": "json_object"}
         )
         return res.message.content[0].text
     except Exception as e:
         return f"Error generating response: {str(e)}"
+
+@cached_stream("defi_analysis")
+async def defi_analysis_stream(prompt: str):
+    async for chunk in cohere_chat_stream(
+        model="command-r-plus-08-2024",
+        messages=defi_analysis_messages(prompt),
+        response_format={"type": "json_object"}
+    ):
+        yield chunk
     
-def sentiment_analysis(prompt: str, tweets: list):
+async def sentiment_scores(tweets: list):
     try:
         messages = [
             (
                 "system",
-                f"""Context: You are an expert in sentiment analysis.
+                f"""Context: You are an expert in crypto market sentiment analysis.
                     Instructions: 
-                    - Analyze the user's query and find the sentiment of the user
-                    - Analyze the tweets and find the sentiment of the user
-                    - Return false if the sentiment is very negative and for all other cases return true
-                    The tweets are : {list(tweets)}
+                    - Score the market sentiment of every tweet below from -1 (very negative) to 1 (very positive), 0 being neutral
+                    - Return a score for every tweet id, and nothing else
+                    The tweets are : {[{"id": tweet["id"], "text": tweet["text"]} for tweet in tweets]}
                     
                     """+
                     """JSON message format(response) : 
                     {
-                        "sentiment": "boolean"
+                        "scores": {"<tweet id>": "number"}
                     }
                     """
             ),
             (
                 "human",
-                prompt
+                "Score the sentiment of these tweets"
             )
         ]
-        response = secret_ai_llm.invoke(messages, stream=False)
-        # print(response.content)
+        response = await secret_invoke(messages)
         return response.content
     except Exception as e:
         return f"Error generating response: {str(e)}"
     
+# Bridge and transfer parameters are read from the prompt, so only
+# prompts that are identical up to whitespace share an intent
+@coalesced("intent", key=exact_prompt)
 async def detect_intent(prompt: str):
     actions = ['transfer', 'bridge', 'analyze', 'other']
+    # Obvious analysis prompts are answered locally
+    fast_path = classify_intent(prompt)
+    if fast_path is not None:
+        return json.dumps(fast_path)
     try:
-        res = co.chat(
+        res = await cohere_chat(
             model="command-r-plus-08-2024",
             messages=[
                 {
@@ -187,21 +211,30 @@ async def detect_intent(prompt: str):
     except Exception as e:
         return f"Error generating response: {str(e)}"
     
-def normal_query(prompt: str):
+def normal_query_messages(prompt: str):
+    return [
+        (
+            "system",
+            """Context: You are an expert DeFi Optimizer. You have all the Defi related knowledge and you are able to analyze the user's query about DeFi protocols and provide a comprehensive, step-by-step response. You are more statistical and you are able to give the best possible analysis for the user's query 
+            """
+        ),
+        (
+            "human",
+            prompt
+        )
+    ]
+
+@coalesced("normal_query")
+@cached_response("normal_query")
+async def normal_query(prompt: str):
     try:
-        messages = [
-            (
-                "system",
-                """Context: You are an expert DeFi Optimizer. You have all the Defi related knowledge and you are able to analyze the user's query about DeFi protocols and provide a comprehensive, step-by-step response. You are more statistical and you are able to give the best possible analysis for the user's query 
-                """
-            ),
-            (
-                "human",
-                prompt
-            )
-        ]
-        response = secret_ai_llm.invoke(messages, stream=False)
+        response = await secret_invoke(normal_query_messages(prompt))
         # print(response.content)
         return response.content
     except Exception as e:
-        return f"Error generating response: {str(e)}"
\ No newline at end of file
+        return f"Error generating response: {str(e)}"
+
+@cached_stream("normal_query")
+async def normal_query_stream(prompt: str):
+    async for chunk in secret_stream(normal_query_messages(prompt)):
+        yield chunk
@@ -0,0 +1,197 @@
+import json
+import math
+import os
+import re
+from collections import Counter
+from pathlib import Path
+
+INTENT_FAST_PATH_THRESHOLD = float(os.getenv("INTENT_FAST_PATH_THRESHOLD", "0.75"))
+EXAMPLES_PATH = Path(__file__).with_name("intent_examples.json")
+
+# Actions that may be answered without asking Cohere. Bridges and transfers
+# move funds, so they are only ever started on the LLM's reading of the
+# prompt; `other` is the catch-all for anything the rules don't understand.
+FAST_PATH_ACTIONS = ("analyze",)
+
+# "don't", "never ...": the keyword model can't tell these from the plain request
+NEGATION = re.compile(r"\b(?:not|no|never|don'?t|do\s+not|doesn'?t|won'?t|without|stop|cancel)\b", re.IGNORECASE)
+EVM_ADDRESS = re.compile(r"\b0x[a-fA-F0-9]{40}\b")
+AMOUNT = re.compile(r"(?<![\w.])(\d+(?:\.\d+)?)(?![\w.])")
+TOKEN = re.compile(r"[a-z0-9$<>]+")
+
+CHAIN_ALIASES = {
+    "auto evm": "taurus",
+    "autoevm": "taurus",
+    "autonomys": "taurus",
+    "taurus": "taurus",
+    "sepolia": "sepolia",
+    "ethereum": "ethereum",
+    "mainnet": "ethereum",
+    "base": "base",
+    "sonic": "sonic",
+    "polygon": "polygon",
+    "arbitrum": "arbitrum",
+    "optimism": "optimism",
+    "solana": "solana",
+    "secret": "secret",
+}
+CHAIN_NAMES = "|".join(
+    r"\s+".join(re.escape(word) for word in alias.split())
+    for alias in sorted(CHAIN_ALIASES, key=len, reverse=True)
+)
+CHAIN = re.compile(rf"\b({CHAIN_NAMES})\b", re.IGNORECASE)
+FROM_CHAIN = re.compile(rf"\bfrom\s+(?:the\s+)?({CHAIN_NAMES})\b", re.IGNORECASE)
+TO_CHAIN = re.compile(rf"\b(?:to|into|onto)\s+(?:the\s+)?({CHAIN_NAMES})\b", re.IGNORECASE)
+
+
+def _canonical_chain(name: str):
+    return CHAIN_ALIASES[" ".join(name.lower().split())]
+
+
+def tokenize(text: str):
+    """
+    Lower-case and tokenize a prompt, replacing addresses, amounts and chain
+    names with placeholder tokens so the model learns their role rather than
+    their value.
+    """
+    text = EVM_ADDRESS.sub(" <addr> ", text)
+    text = CHAIN.sub(" <chain> ", text)
+    text = AMOUNT.sub(" <num> ", text)
+    return TOKEN.findall(text.lower())
+
+
+def extract_slots(prompt: str):
+    """Extract addresses, amounts and chain names from a prompt."""
+    addresses = EVM_ADDRESS.findall(prompt)
+    without_addresses = EVM_ADDRESS.sub(" ", prompt)
+    amounts = AMOUNT.findall(without_addresses)
+    chains = [_canonical_chain(m) for m in CHAIN.findall(without_addresses)]
+    source = FROM_CHAIN.search(without_addresses)
+    destination = TO_CHAIN.search(without_addresses)
+    return {
+        "addresses": addresses,
+        "amounts": amounts,
+        "chains": chains,
+        "source": _canonical_chain(source.group(1)) if source else None,
+        "destination": _canonical_chain(destination.group(1)) if destination else None,
+    }
+
+
+class KeywordIntentModel:
+    """
+    Small TF-IDF nearest-centroid model trained on the labelled prompts in
+    intent_examples.json.
+    """
+
+    def __init__(self, examples: dict):
+        documents = [(label, tokenize(text)) for label, texts in examples.items() for text in texts]
+        document_frequency = Counter()
+        for _, tokens in documents:
+            document_frequency.update(set(tokens))
+        total = len(documents)
+        self.idf = {
+            token: math.log((1 + total) / (1 + count)) + 1
+            for token, count in document_frequency.items()
+        }
+
+        self.centroids = {}
+        for label in examples:
+            centroid = Counter()
+            for doc_label, tokens in documents:
+                if doc_label == label:
+                    centroid.update(self._vector(tokens))
+            self.centroids[label] = self._normalize(centroid)
+
+    def _vector(self, tokens):
+        counts = Counter(token for token in tokens if token in self.idf)
+        return self._normalize({token: count * self.idf[token] for token, count in counts.items()})
+
+    @staticmethod
+    def _normalize(vector):
+        norm = math.sqrt(sum(value * value for value in vector.values()))
+        if not norm:
+            return {}
+        return {token: value / norm for token, value in vector.items()}
+
+    def predict_proba(self, text: str):
+        vector = self._vector(tokenize(text))
+        similarities = {
+            label: sum(weight * centroid.get(token, 0.0) for token, weight in vector.items())
+            for label, centroid in self.centroids.items()
+        }
+        # Sharpened softmax over cosine similarities
+        exps = {label: math.exp(8 * similarity) for label, similarity in similarities.items()}
+        total = sum(exps.values())
+        return {label: value / total for label, value in exps.items()}
+
+
+def _load_model():
+    with open(EXAMPLES_PATH, "r") as f:
+        return KeywordIntentModel(json.load(f))
+
+
+model = _load_model()
+
+stats = {"fast_path": 0, "fallback": 0}
+
+
+def predict(prompt: str):
+    """
+    Classify a prompt locally.
+
+    Args:
+        prompt (str): The user prompt
+
+    Returns:
+        dict: `action`, `parameters` (in the shape `detect_intent` returns)
+        and a `confidence` between 0 and 1
+    """
+    probabilities = model.predict_proba(prompt)
+    action = max(probabilities, key=probabilities.get)
+    confidence = probabilities[action]
+    slots = extract_slots(prompt)
+    parameters = []
+
+    if action == "bridge":
+        source = slots["source"]
+        destination = slots["destination"]
+        chains = slots["chains"]
+        if source is None and len(chains) >= 2:
+            source = chains[0]
+        if destination is None and chains:
+            destination = next((chain for chain in reversed(chains) if chain != source), None)
+        if source and destination and slots["amounts"] and slots["addresses"]:
+            parameters = [source, destination, slots["amounts"][0], slots["addresses"][0]]
+        else:
+            # Missing slots have to be filled in by the LLM
+            confidence *= 0.5
+    elif action == "transfer":
+        if slots["addresses"] and slots["amounts"] and len(slots["chains"]) < 2:
+            parameters = [slots["addresses"][0], slots["amounts"][0]]
+        else:
+            confidence *= 0.5
+    elif action == "analyze" and slots["addresses"]:
+        # Prompts with addresses are almost always a transfer or bridge
+        confidence *= 0.5
+
+    return {"action": action, "parameters": parameters, "confidence": confidence}
+
+
+def classify_intent(prompt: str, threshold: float = INTENT_FAST_PATH_THRESHOLD):
+    """
+    Fast-path intent detection.
+
+    Returns:
+        dict: The `{action, parameters}` structure if the local classifier is
+        confident enough, otherwise None so the caller falls back to the LLM
+    """
+    prediction = predict(prompt)
+    if (
+        prediction["action"] in FAST_PATH_ACTIONS
+        and prediction["confidence"] >= threshold
+        and not NEGATION.search(prompt)
+    ):
+        stats["fast_path"] += 1
+        return {"action": prediction["action"], "parameters": prediction["parameters"]}
+    stats["fallback"] += 1
+    return None
@@ -0,0 +1,252 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cohere
+import httpx
+from dotenv import load_dotenv
+from DefiAgent.secret_discovery import secret_ai
+from telemetry import LLM_ERRORS, observe_llm
+
+load_dotenv()
+
+COHERE_MAX_CONCURRENCY = int(os.getenv("COHERE_MAX_CONCURRENCY", "32"))
+SECRET_AI_MAX_CONCURRENCY = int(os.getenv("SECRET_AI_MAX_CONCURRENCY", "16"))
+COHERE_TIMEOUT = float(os.getenv("COHERE_TIMEOUT", "300"))
+
+
+class ProviderLimiter:
+    """
+    Bounded concurrency limiter for a single LLM provider.
+
+    Callers that exceed the limit wait for a free slot instead of piling
+    more in-flight requests onto the provider.
+    """
+
+    def __init__(self, name: str, max_concurrency: int):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight = 0
+        self.waiting = 0
+
+    async def acquire(self):
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+
+    def release(self):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+    def stats(self):
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+        }
+
+
+limiters = {
+    "cohere": ProviderLimiter("cohere", COHERE_MAX_CONCURRENCY),
+    "secret_ai": ProviderLimiter("secret_ai", SECRET_AI_MAX_CONCURRENCY),
+}
+
+_cohere = None
+_cohere_http = None
+
+
+def cohere_client():
+    """
+    This process's Cohere client. It is opened by the app lifespan (or on
+    first use) rather than at import, so every worker process gets its own
+    connection pool instead of inheriting one across a fork.
+    """
+    global _cohere, _cohere_http
+    if _cohere is None:
+        _cohere_http = httpx.AsyncClient(timeout=COHERE_TIMEOUT, follow_redirects=True)
+        _cohere = cohere.AsyncClientV2(api_key=os.environ.get("COHERE_API_KEY"), httpx_client=_cohere_http)
+    return _cohere
+
+
+async def close_cohere():
+    global _cohere, _cohere_http
+    if _cohere_http is not None:
+        await _cohere_http.aclose()
+    _cohere = _cohere_http = None
+
+# ChatSecret only exposes a blocking client, so its calls run on a dedicated
+# pool sized to the provider limit rather than on the event loop.
+_secret_executor = ThreadPoolExecutor(
+    max_workers=SECRET_AI_MAX_CONCURRENCY, thread_name_prefix="secret-ai"
+)
+
+
+async def cohere_chat(**kwargs):
+    """
+    Run a Cohere v2 chat completion without blocking the event loop.
+
+    Args:
+        **kwargs: Arguments forwarded to `AsyncClientV2.chat`
+
+    Returns:
+        The Cohere chat response
+    """
+    async with limiters["cohere"]:
+        start = time.perf_counter()
+        try:
+            response = await cohere_client().chat(**kwargs)
+        except Exception:
+            LLM_ERRORS.labels("cohere", "chat").inc()
+            raise
+    tokens = getattr(response.usage, "tokens", None) if getattr(response, "usage", None) else None
+    observe_llm("cohere", "chat", time.perf_counter() - start,
+                getattr(tokens, "input_tokens", None), getattr(tokens, "output_tokens", None))
+    return response
+
+
+def _secret_usage(message):
+    usage = getattr(message, "usage_metadata", None) or {}
+    return usage.get("input_tokens"), usage.get("output_tokens")
+
+
+def _invoke_with_failover(messages, **kwargs):
+    last_error = None
+    for url, llm in secret_ai.candidates():
+        start = time.perf_counter()
+        try:
+            response = llm.invoke(messages, stream=False, **kwargs)
+        except Exception as e:
+            LLM_ERRORS.labels("secret_ai", "chat").inc()
+            secret_ai.mark_failed(url)
+            last_error = e
+            continue
+        observe_llm("secret_ai", "chat", time.perf_counter() - start, *_secret_usage(response))
+        return response
+    raise last_error or RuntimeError("no Secret AI endpoints available")
+
+
+async def secret_invoke(messages, **kwargs):
+    """
+    Run a ChatSecret completion on the Secret AI thread pool, failing over
+    across the discovered Secret AI endpoints.
+
+    Args:
+        messages (list): The chat messages
+        **kwargs: Per-call ChatOllama options, e.g. `format`
+
+    Returns:
+        The LangChain message returned by the model
+    """
+    limiter = limiters["secret_ai"]
+    await limiter.acquire()
+    loop = asyncio.get_running_loop()
+    future = _secret_executor.submit(_invoke_with_failover, messages, **kwargs)
+    # A cancelled caller cannot stop a call that is already running on the
+    # pool, so the slot is only released once the thread is actually done.
+    future.add_done_callback(lambda _: loop.call_soon_threadsafe(limiter.release))
+    return await asyncio.wrap_future(future)
+
+
+async def cohere_chat_stream(**kwargs):
+    """
+    Stream a Cohere v2 chat completion.
+
+    Args:
+        **kwargs: Arguments forwarded to `AsyncClientV2.chat_stream`
+
+    Yields:
+        str: Text deltas as they arrive
+    """
+    async with limiters["cohere"]:
+        start = time.perf_counter()
+        tokens = None
+        try:
+            async for event in cohere_client().chat_stream(**kwargs):
+                if event.type == "content-delta":
+                    yield event.delta.message.content.text
+                elif event.type == "message-end" and getattr(event.delta, "usage", None):
+                    tokens = event.delta.usage.tokens
+        except Exception:
+            LLM_ERRORS.labels("cohere", "stream").inc()
+            raise
+    observe_llm("cohere", "stream", time.perf_counter() - start,
+                getattr(tokens, "input_tokens", None), getattr(tokens, "output_tokens", None))
+
+
+async def secret_stream(messages):
+    """
+    Stream a ChatSecret completion. The blocking `llm.stream` iterator runs on
+    the Secret AI thread pool and hands chunks back to the event loop. An
+    endpoint that fails before producing output is failed over like in
+    `secret_invoke`.
+
+    Args:
+        messages (list): The chat messages
+
+    Yields:
+        str: Text chunks as they arrive
+    """
+    limiter = limiters["secret_ai"]
+    await limiter.acquire()
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def produce():
+        last_error = None
+        try:
+            for url, llm in secret_ai.candidates():
+                started = False
+                start = time.perf_counter()
+                usage = (None, None)
+                try:
+                    for chunk in llm.stream(messages):
+                        if stop.is_set():
+                            break
+                        started = True
+                        usage = _secret_usage(chunk) if getattr(chunk, "usage_metadata", None) else usage
+                        loop.call_soon_threadsafe(queue.put_nowait, ("chunk", chunk.content))
+                    observe_llm("secret_ai", "stream", time.perf_counter() - start, *usage)
+                    loop.call_soon_threadsafe(queue.put_nowait, ("done", None))
+                    return
+                except Exception as e:
+                    LLM_ERRORS.labels("secret_ai", "stream").inc()
+                    secret_ai.mark_failed(url)
+                    last_error = e
+                    if started:
+                        break
+        except Exception as e:
+            last_error = e
+        loop.call_soon_threadsafe(queue.put_nowait, ("error", last_error or RuntimeError("no Secret AI endpoints available")))
+
+    future = _secret_executor.submit(produce)
+    future.add_done_callback(lambda _: loop.call_soon_threadsafe(limiter.release))
+    try:
+        while True:
+            kind, value = await queue.get()
+            if kind == "done":
+                return
+            if kind == "error":
+                raise value
+            if value:
+                yield value
+    finally:
+        # Lets the producer thread stop early when the client disconnects
+        stop.set()
+
+
+def limiter_stats():
+    return {name: limiter.stats() for name, limiter in limiters.items()}
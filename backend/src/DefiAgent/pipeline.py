@@ -0,0 +1,152 @@
+import asyncio
+import json
+import logging
+import os
+import time
+
+from DefiAgent.agents import detect_intent, defi_analysis, defi_analysis_stream, normal_query, normal_query_stream
+from DefiAgent.intent_classifier import predict
+from BridgingAgent.jobs import bridge_jobs
+from telemetry import span
+
+logger = logging.getLogger(__name__)
+
+SPECULATIVE_CHAT = os.getenv("SPECULATIVE_CHAT", "true").lower() == "true"
+
+
+def guess_action(prompt: str):
+    """
+    Cheaply guess which answer stage a prompt will need before the intent
+    detection result is available. Returns None for likely bridges, which
+    must never run before the intent is known.
+    """
+    action = predict(prompt)["action"]
+    if action == "bridge":
+        return None
+    return answer_stage(action)
+
+
+def answer_stage(action: str):
+    """Name of the answer stage that serves an action once it is known."""
+    if action == "analyze":
+        return "analyze"
+    if action == "bridge":
+        return "bridge"
+    # transfer intents are answered by the general DeFi model as well
+    return "other"
+
+
+async def run_answer(stage: str, prompt: str, data: dict = None):
+    if stage == "analyze":
+        response = await defi_analysis(prompt)
+        return json.loads(response)
+    if stage == "bridge":
+        # Bridges run as background jobs; the client polls the job's status_url
+        return await bridge_jobs.create(data['parameters'][2], data['parameters'][3])
+    return await normal_query(prompt)
+
+
+async def _timed(coro, timings: dict, name: str):
+    start = time.perf_counter()
+    try:
+        async with span(name):
+            return await coro
+    finally:
+        timings[name] = (time.perf_counter() - start) * 1000
+
+
+async def run_chat(prompt: str, speculative: bool = SPECULATIVE_CHAT):
+    """
+    Run the /chat pipeline: intent detection followed by the matching answer.
+
+    In speculative mode the most likely answer stage is launched alongside
+    intent detection and is kept only if the detected intent agrees with
+    the guess; otherwise it is cancelled and the right stage is run.
+
+    Args:
+        prompt (str): The user prompt
+        speculative (bool): Whether to speculatively start the answer stage
+
+    Returns:
+        tuple: The response body and a dict of per-stage timings in ms
+    """
+    timings = {}
+    start = time.perf_counter()
+    speculation = None
+    guessed = guess_action(prompt) if speculative else None
+    if guessed is not None:
+        speculation = asyncio.create_task(
+            _timed(run_answer(guessed, prompt), timings, "answer")
+        )
+
+    try:
+        response = await _timed(detect_intent(prompt), timings, "intent")
+        data = json.loads(response)
+        logger.debug("Intent: %s", data)
+        stage = answer_stage(data['action'])
+
+        if speculation is not None and stage == guessed:
+            timings["speculation"] = "hit"
+            result = await speculation
+        else:
+            if speculation is not None:
+                timings["speculation"] = "miss"
+                speculation.cancel()
+            result = await _timed(run_answer(stage, prompt, data), timings, "answer")
+    except BaseException:
+        if speculation is not None:
+            speculation.cancel()
+        raise
+
+    timings["total"] = (time.perf_counter() - start) * 1000
+    return result, timings
+
+
+async def stream_chat(prompt: str):
+    """
+    Streaming variant of `run_chat`. Intent routing is applied first and the
+    answer is then streamed from the provider as it is generated.
+
+    Yields:
+        tuple: `(event, data)` pairs. `intent` carries the detected intent,
+        `token` a text chunk, `result` a complete (non-streamed or parsed)
+        response, `error` a failure message and `done` the stage timings.
+    """
+    timings = {}
+    start = time.perf_counter()
+    try:
+        response = await _timed(detect_intent(prompt), timings, "intent")
+        data = json.loads(response)
+        yield "intent", data
+        stage = answer_stage(data['action'])
+
+        answer_start = time.perf_counter()
+        if stage == "bridge":
+            yield "result", await run_answer(stage, prompt, data)
+        else:
+            chunks = defi_analysis_stream(prompt) if stage == "analyze" else normal_query_stream(prompt)
+            text = []
+            async for chunk in chunks:
+                if not text:
+                    timings["first_token"] = (time.perf_counter() - start) * 1000
+                text.append(chunk)
+                yield "token", chunk
+            if stage == "analyze":
+                yield "result", json.loads("".join(text))
+        timings["answer"] = (time.perf_counter() - answer_start) * 1000
+    except Exception as e:
+        yield "error", f"Error generating response: {str(e)}"
+
+    timings["total"] = (time.perf_counter() - start) * 1000
+    yield "done", timings
+
+
+def server_timing_header(timings: dict):
+    """Format stage timings as a `Server-Timing` header value."""
+    parts = []
+    for name, value in timings.items():
+        if isinstance(value, str):
+            parts.append(f'{name};desc="{value}"')
+        else:
+            parts.append(f"{name};dur={value:.1f}")
+    return ", ".join(parts)
@@ -0,0 +1,326 @@
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from shared_state import shared_state
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+RESPONSE_CACHE_SIMILARITY = float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0.92"))
+# Serve near-duplicate prompts from the cache, not only exact (normalized) ones
+RESPONSE_CACHE_SEMANTIC = os.getenv("RESPONSE_CACHE_SEMANTIC", "false").lower() == "true"
+# Directory for on-disk persistence; the cache is memory-only when unset
+RESPONSE_CACHE_DIR = os.getenv("RESPONSE_CACHE_DIR")
+RESPONSE_CACHE_SAVE_INTERVAL = float(os.getenv("RESPONSE_CACHE_SAVE_INTERVAL", "30"))
+# Also keep exact-prompt entries in the shared state store, so a response
+# generated by one worker is a hit on every other worker
+RESPONSE_CACHE_SHARED = os.getenv("RESPONSE_CACHE_SHARED", "true").lower() == "true"
+
+EMBEDDING_DIM = 512
+WORD = re.compile(r"[a-z0-9$]+")
+# Words that can differ between two phrasings of the same question. Every
+# other word may name a token, protocol, chain, amount or address, which
+# change the answer, so near-duplicates must have those identical and in
+# the same order
+FILLER_WORDS = frozenset("""
+    a an the is are was were be been do does did can could would should will shall may might must
+    i me my we our you your it its this that these those there here what whats which who how
+    please pls tell show give explain describe let lets know about of for in on at by with as
+    and or so just also some any current currently now today right
+""".split())
+
+
+def normalize_prompt(prompt: str):
+    return " ".join(prompt.lower().split()).strip(" ?!.")
+
+
+def entities(text: str):
+    return tuple(word for word in WORD.findall(text) if word not in FILLER_WORDS)
+
+
+def _bucket(feature: str):
+    digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+    value = int.from_bytes(digest, "little")
+    return value % EMBEDDING_DIM, 1.0 if value >> 63 else -1.0
+
+
+def embed(text: str):
+    """
+    Local hashed bag-of-features embedding of a normalized prompt.
+
+    Word unigrams, bigrams and character trigrams are hashed into a fixed
+    size signed vector, which is enough to match reworded or re-punctuated
+    versions of the same question without shipping a neural model.
+    """
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    words = WORD.findall(text)
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    for word in words:
+        padded = f" {word} "
+        features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+    for feature in features:
+        index, sign = _bucket(feature)
+        vector[index] += sign
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class SemanticCache:
+    """
+    In-process response cache keyed by normalized prompt, with an optional
+    nearest-neighbour lookup over prompt embeddings.
+
+    Entries expire after `ttl` seconds and the least recently used entry is
+    evicted once `max_size` is reached. With `shared` set, exact-prompt
+    entries are also written to the shared state store and looked up there
+    on a local miss. With `semantic` set, a remaining miss is served by the
+    most similar cached prompt with the same entities (see `entities`).
+    """
+
+    def __init__(self, name: str, max_size: int = RESPONSE_CACHE_SIZE, ttl: float = RESPONSE_CACHE_TTL,
+                 similarity: float = RESPONSE_CACHE_SIMILARITY, persist_dir: str = RESPONSE_CACHE_DIR,
+                 shared: bool = RESPONSE_CACHE_SHARED, semantic: bool = RESPONSE_CACHE_SEMANTIC):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self.similarity = similarity
+        self.path = os.path.join(persist_dir, f"{name}.json") if persist_dir else None
+        self.shared = shared
+        self.semantic = semantic
+        self._entries = OrderedDict()
+        self._keys = []
+        self._matrix = np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+        self._index_dirty = False
+        self._last_save = 0.0
+        self._save_lock = threading.Lock()
+        self.metrics = {
+            "exact_hits": 0,
+            "shared_hits": 0,
+            "semantic_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "shared_errors": 0,
+        }
+        if self.path:
+            self.load()
+
+    def _rebuild_index(self):
+        self._keys = list(self._entries)
+        if self._keys:
+            self._matrix = np.stack([self._entries[key]["vector"] for key in self._keys])
+        else:
+            self._matrix = np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+        self._index_dirty = False
+
+    def _expired(self, entry, now):
+        return now - entry["created_at"] > self.ttl
+
+    def _remove(self, key):
+        del self._entries[key]
+        self._index_dirty = True
+
+    def _shared_key(self, key: str):
+        return shared_state.key("response_cache", self.name, hashlib.blake2b(key.encode(), digest_size=16).hexdigest())
+
+    def _get_shared(self, key: str):
+        try:
+            raw = shared_state.store.get(self._shared_key(key))
+        except Exception as e:
+            # The shared tier is an optimisation; never fail a request on it
+            self.metrics["shared_errors"] += 1
+            logger.warning("Shared response cache lookup failed: %s", e)
+            return None
+        return json.loads(raw) if raw else None
+
+    def _put_shared(self, key: str, value, created_at: float):
+        ttl = self.ttl - (time.time() - created_at)
+        if ttl <= 0:
+            return
+        try:
+            shared_state.store.set(self._shared_key(key), json.dumps({"value": value, "created_at": created_at}), ttl)
+        except Exception as e:
+            self.metrics["shared_errors"] += 1
+            logger.warning("Shared response cache write failed: %s", e)
+
+    async def get(self, prompt: str):
+        key = normalize_prompt(prompt)
+        now = time.time()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if self._expired(entry, now):
+                self._remove(key)
+                self.metrics["expirations"] += 1
+            else:
+                self._entries.move_to_end(key)
+                self.metrics["exact_hits"] += 1
+                return entry["value"]
+
+        if self.shared:
+            # The store client blocks, so keep it off the event loop
+            item = await asyncio.to_thread(self._get_shared, key)
+            if item is not None:
+                self._put_local(key, item["value"], item["created_at"])
+                self.metrics["shared_hits"] += 1
+                return item["value"]
+
+        if self.semantic and self._entries:
+            if self._index_dirty:
+                self._rebuild_index()
+            scores = self._matrix @ embed(key)
+            words = entities(key)
+            for position in np.argsort(scores)[::-1]:
+                if scores[position] < self.similarity:
+                    break
+                candidate = self._keys[position]
+                entry = self._entries.get(candidate)
+                if entry is None or entry["entities"] != words:
+                    continue
+                if self._expired(entry, now):
+                    self._remove(candidate)
+                    self.metrics["expirations"] += 1
+                    continue
+                self._entries.move_to_end(candidate)
+                self.metrics["semantic_hits"] += 1
+                return entry["value"]
+
+        self.metrics["misses"] += 1
+        return None
+
+    async def put(self, prompt: str, value, created_at: float = None):
+        key = normalize_prompt(prompt)
+        created_at = created_at or time.time()
+        self._put_local(key, value, created_at)
+        if self.shared:
+            await asyncio.to_thread(self._put_shared, key, value, created_at)
+        if self.path and time.time() - self._last_save >= RESPONSE_CACHE_SAVE_INTERVAL:
+            # Claim the interval before writing so concurrent puts don't all save
+            self._last_save = time.time()
+            await asyncio.to_thread(self._write, self._snapshot())
+
+    def _put_local(self, key: str, value, created_at: float):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = {
+            "value": value,
+            "vector": embed(key) if self.semantic else None,
+            "entities": entities(key),
+            "created_at": created_at,
+        }
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.metrics["evictions"] += 1
+        self._index_dirty = True
+
+    def _snapshot(self):
+        return [
+            {"prompt": key, "value": entry["value"], "created_at": entry["created_at"]}
+            for key, entry in self._entries.items()
+        ]
+
+    def _write(self, data):
+        with self._save_lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+
+    def save(self):
+        if not self.path:
+            return
+        self._write(self._snapshot())
+        self._last_save = time.time()
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        now = time.time()
+        self._last_save = now
+        for item in data:
+            if now - item["created_at"] <= self.ttl:
+                self._put_local(item["prompt"], item["value"], item["created_at"])
+
+    def stats(self):
+        lookups = (self.metrics["exact_hits"] + self.metrics["shared_hits"] + self.metrics["semantic_hits"]
+                   + self.metrics["misses"])
+        hits = lookups - self.metrics["misses"]
+        return {
+            **self.metrics,
+            "size": len(self._entries),
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+
+caches = {
+    "defi_analysis": SemanticCache("defi_analysis"),
+    "normal_query": SemanticCache("normal_query"),
+}
+
+
+def cached_response(name: str):
+    """
+    Wrap an async `prompt -> str` LLM call with the named semantic cache.
+    Error responses are never cached.
+    """
+    cache = caches[name]
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(prompt: str):
+            cached = await cache.get(prompt)
+            if cached is not None:
+                return cached
+            response = await func(prompt)
+            if isinstance(response, str) and not response.startswith("Error generating response"):
+                await cache.put(prompt, response)
+            return response
+        return wrapper
+    return decorator
+
+
+def cached_stream(name: str):
+    """
+    Streaming counterpart of `cached_response` for async generators yielding
+    text chunks. A cache hit is yielded as a single chunk and a completed
+    stream is stored as the concatenated text.
+    """
+    cache = caches[name]
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(prompt: str):
+            cached = await cache.get(prompt)
+            if cached is not None:
+                yield cached
+                return
+            chunks = []
+            async for chunk in func(prompt):
+                chunks.append(chunk)
+                yield chunk
+            await cache.put(prompt, "".join(chunks))
+        return wrapper
+    return decorator
+
+
+def cache_stats():
+    return {name: cache.stats() for name, cache in caches.items()}
+
+
+def save_caches():
+    for cache in caches.values():
+        cache.save()
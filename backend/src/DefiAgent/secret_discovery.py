@@ -0,0 +1,205 @@
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import requests
+from dotenv import load_dotenv
+from shared_state import shared_state
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+SECRET_CHAIN_ID = os.getenv("SECRET_CHAIN_ID", "pulsar-3")
+SECRET_NODE_URL = os.getenv("SECRET_NODE_URL", "https://pulsar.lcd.secretnodes.com")
+SECRET_DISCOVERY_CACHE = os.getenv(
+    "SECRET_DISCOVERY_CACHE",
+    str(Path(__file__).resolve().parents[2] / ".cache" / "secret_ai_discovery.json"),
+)
+SECRET_DISCOVERY_TTL = float(os.getenv("SECRET_DISCOVERY_TTL", "3600"))
+SECRET_FAILOVER_COOLDOWN = float(os.getenv("SECRET_FAILOVER_COOLDOWN", "60"))
+SECRET_HEALTH_TIMEOUT = float(os.getenv("SECRET_HEALTH_TIMEOUT", "2"))
+# Longest a worker may hold the discovery lock; the others wait at most this
+# long for its result on a cold start
+SECRET_DISCOVERY_LOCK_TTL = float(os.getenv("SECRET_DISCOVERY_LOCK_TTL", "60"))
+# Pin a model/endpoint and skip on-chain discovery entirely
+SECRET_AI_URL = os.getenv("SECRET_AI_URL")
+SECRET_AI_MODEL = os.getenv("SECRET_AI_MODEL")
+
+
+class SecretAIDiscovery:
+    """
+    Lazily discovers Secret AI models and endpoint URLs from the Secret
+    Network LCD node.
+
+    Discovery results are persisted to disk so restarts don't have to wait
+    on the node, stale results are refreshed in the background while still
+    being served, and calls fail over across every URL returned for the
+    model instead of always using the first one. Only one worker process
+    runs discovery at a time; the others pick its result up from the cache
+    file.
+    """
+
+    def __init__(self, cache_path: str = SECRET_DISCOVERY_CACHE, ttl: float = SECRET_DISCOVERY_TTL):
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.model = None
+        self.urls = []
+        self.discovered_at = 0.0
+        self._failed_at = {}
+        self._clients = {}
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+        if SECRET_AI_URL and SECRET_AI_MODEL:
+            self.model = SECRET_AI_MODEL
+            self.urls = [SECRET_AI_URL]
+            self.discovered_at = float("inf")
+
+    def _read_cache(self):
+        try:
+            with open(self.cache_path, "r") as f:
+                data = json.load(f)
+            return data["model"], data["urls"], data["discovered_at"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return None
+
+    def _write_cache(self):
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"model": self.model, "urls": self.urls, "discovered_at": self.discovered_at}, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def _is_healthy(self, url: str):
+        try:
+            # Any HTTP answer (even an auth error) means the endpoint is up
+            return requests.get(url, timeout=SECRET_HEALTH_TIMEOUT).status_code < 500
+        except requests.RequestException:
+            return False
+
+    def refresh(self):
+        """Query the LCD node for models and URLs and health-check each URL."""
+        from secret_ai_sdk.secret import Secret
+
+        secret_client = Secret(chain_id=SECRET_CHAIN_ID, node_url=SECRET_NODE_URL)
+        models = secret_client.get_models()
+        urls = secret_client.get_urls(model=models[0])
+        if not urls:
+            raise RuntimeError(f"No Secret AI URLs registered for model {models[0]}")
+
+        now = time.time()
+        failed_at = {url: now for url in urls if not self._is_healthy(url)}
+        with self._lock:
+            self.model = models[0]
+            self.urls = list(urls)
+            self.discovered_at = now
+            self._failed_at = failed_at
+        self._write_cache()
+
+    def _adopt_cache(self):
+        """Use the cache file if another worker wrote a newer discovery."""
+        cached = self._read_cache()
+        if cached is not None and cached[2] > self.discovered_at:
+            with self._lock:
+                self.model, self.urls, self.discovered_at = cached
+                self._failed_at = {}
+
+    def _refresh_once(self, wait: bool):
+        """
+        Run discovery unless another worker already is. With `wait`, wait
+        for that worker's result instead, and only discover here if it
+        doesn't arrive within the lock TTL.
+        """
+        token = shared_state.acquire("secret_ai_discovery", SECRET_DISCOVERY_LOCK_TTL)
+        if token is None:
+            if not wait:
+                return
+            deadline = time.time() + SECRET_DISCOVERY_LOCK_TTL
+            while time.time() < deadline:
+                time.sleep(0.5)
+                self._adopt_cache()
+                if self.urls:
+                    return
+            self.refresh()
+            return
+        try:
+            self.refresh()
+        finally:
+            shared_state.release("secret_ai_discovery", token)
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self._refresh_once(wait=False)
+            except Exception as e:
+                logger.warning("Secret AI discovery refresh failed: %s", e)
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="secret-ai-discovery", daemon=True).start()
+
+    def ensure_discovered(self):
+        """
+        Make sure a model and URLs are known, loading the on-disk cache or
+        running discovery synchronously only on a cold start. Stale results
+        trigger a background refresh and keep being used meanwhile.
+        """
+        if not self.urls or time.time() - self.discovered_at > self.ttl:
+            self._adopt_cache()
+        if not self.urls:
+            self._refresh_once(wait=True)
+        elif time.time() - self.discovered_at > self.ttl:
+            self._refresh_in_background()
+
+    def warm_up(self):
+        """Start discovery in the background so the first request doesn't pay for it."""
+        if not self.urls and self._read_cache() is None:
+            self._refresh_in_background()
+
+    def _client(self, url: str):
+        from secret_ai_sdk.secret_ai import ChatSecret
+
+        key = (url, self.model)
+        if key not in self._clients:
+            self._clients[key] = ChatSecret(base_url=url, model=self.model, temperature=1.)
+        return self._clients[key]
+
+    def candidates(self):
+        """
+        ChatSecret clients to try, in order. URLs that failed within the
+        cooldown window are moved to the back rather than dropped, so a
+        request still has somewhere to go if every endpoint had a blip.
+        """
+        self.ensure_discovered()
+        now = time.time()
+        with self._lock:
+            urls = list(self.urls)
+            failed_at = dict(self._failed_at)
+        healthy = [url for url in urls if now - failed_at.get(url, 0) > SECRET_FAILOVER_COOLDOWN]
+        cooling = [url for url in urls if url not in healthy]
+        return [(url, self._client(url)) for url in healthy + cooling]
+
+    def mark_failed(self, url: str):
+        with self._lock:
+            self._failed_at[url] = time.time()
+
+    def stats(self):
+        now = time.time()
+        return {
+            "model": self.model,
+            "urls": len(self.urls),
+            "unhealthy_urls": sum(1 for t in self._failed_at.values() if now - t <= SECRET_FAILOVER_COOLDOWN),
+            "age": now - self.discovered_at if self.discovered_at != float("inf") else None,
+        }
+
+
+secret_ai = SecretAIDiscovery()
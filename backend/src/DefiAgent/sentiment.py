@@ -0,0 +1,167 @@
+import asyncio
+import os
+import re
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from DefiAgent.agents import sentiment_scores
+from utils import parse_sentiment_analysis_response
+
+SENTIMENT_LLM_BATCH = int(os.getenv("SENTIMENT_LLM_BATCH", "20"))
+# Lexicon scores closer to neutral than this are re-scored by the LLM
+SENTIMENT_AMBIGUITY = float(os.getenv("SENTIMENT_AMBIGUITY", "0.2"))
+SENTIMENT_HALF_LIFE_HOURS = float(os.getenv("SENTIMENT_HALF_LIFE_HOURS", "12"))
+# Aggregate scores below this are "very negative"
+SENTIMENT_NEGATIVE_THRESHOLD = float(os.getenv("SENTIMENT_NEGATIVE_THRESHOLD", "-0.4"))
+SENTIMENT_CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "10000"))
+SENTIMENT_USE_LLM = os.getenv("SENTIMENT_USE_LLM", "true").lower() == "true"
+
+LEXICON = {
+    "ath": 1.0, "bullish": 1.0, "moon": 0.8, "pump": 0.6, "rally": 0.8, "surge": 0.8,
+    "breakout": 0.7, "gains": 0.6, "growth": 0.5, "launch": 0.3, "launching": 0.3, "live": 0.3,
+    "listing": 0.5, "partnership": 0.6, "adoption": 0.6, "upgrade": 0.4, "record": 0.5,
+    "dominance": 0.5, "confirmed": 0.3, "buybacks": 0.5, "burns": 0.4, "inflows": 0.6,
+    "backed": 0.4, "strong": 0.5, "running": 0.3, "better": 0.4, "optimal": 0.4, "wins": 0.5,
+    "transparent": 0.4, "activated": 0.3, "enabled": 0.3, "approved": 0.6, "license": 0.4,
+    "bearish": -1.0, "dump": -0.8, "crash": -1.0, "rug": -1.0, "rugpull": -1.0, "scam": -1.0,
+    "hack": -1.0, "hacked": -1.0, "exploit": -1.0, "exploited": -1.0, "drained": -1.0,
+    "outflows": -0.6, "selloff": -0.8, "liquidated": -0.8, "liquidations": -0.7, "losses": -0.5,
+    "fud": -0.6, "delisting": -0.8, "delisted": -0.8, "lawsuit": -0.7, "sec": -0.3,
+    "insolvent": -1.0, "bankrupt": -1.0, "down": -0.4, "plunge": -0.9, "fear": -0.6,
+    "warning": -0.5, "risk": -0.3, "paused": -0.5, "halted": -0.6, "depeg": -0.9,
+}
+NEGATIONS = {"not", "no", "never", "without", "isnt", "arent", "wasnt", "dont", "doesnt"}
+WORD = re.compile(r"[a-z$']+")
+
+
+def lexicon_score(text: str):
+    """
+    Score a tweet with the crypto sentiment lexicon.
+
+    Returns:
+        tuple: A score between -1 and 1 and the number of lexicon hits
+    """
+    words = [word.replace("'", "") for word in WORD.findall(text.lower())]
+    total = 0.0
+    hits = 0
+    for i, word in enumerate(words):
+        weight = LEXICON.get(word.lstrip("$"))
+        if weight is None:
+            continue
+        if any(previous in NEGATIONS for previous in words[max(0, i - 2):i]):
+            weight = -weight
+        total += weight
+        hits += 1
+    if not hits:
+        return 0.0, 0
+    return max(-1.0, min(1.0, total / hits)), hits
+
+
+def _created_at(tweet: dict):
+    try:
+        return datetime.fromisoformat(tweet["created_at"].replace("Z", "+00:00"))
+    except (KeyError, ValueError):
+        return None
+
+
+class SentimentEngine:
+    """
+    Scores tweets individually and aggregates them into a time-weighted
+    market sentiment.
+
+    Tweets are scored with the local lexicon first; only ambiguous ones are
+    sent to the LLM, in batches. Scores are cached per tweet id, so each
+    call only pays for tweets it hasn't seen before.
+    """
+
+    def __init__(self, batch_size: int = SENTIMENT_LLM_BATCH, half_life_hours: float = SENTIMENT_HALF_LIFE_HOURS,
+                 use_llm: bool = SENTIMENT_USE_LLM, cache_size: int = SENTIMENT_CACHE_SIZE):
+        self.batch_size = batch_size
+        self.half_life_hours = half_life_hours
+        self.use_llm = use_llm
+        self.cache_size = cache_size
+        self._scores = OrderedDict()
+        self.metrics = {"cached": 0, "lexicon": 0, "llm": 0, "llm_errors": 0}
+
+    def _remember(self, tweet_id: str, score: float):
+        self._scores[tweet_id] = score
+        self._scores.move_to_end(tweet_id)
+        while len(self._scores) > self.cache_size:
+            self._scores.popitem(last=False)
+
+    async def _score_with_llm(self, batch: list):
+        response = await sentiment_scores(batch)
+        try:
+            scores = parse_sentiment_analysis_response(response)["scores"]
+            return {str(tweet_id): max(-1.0, min(1.0, float(score))) for tweet_id, score in scores.items()}
+        except (ValueError, KeyError, TypeError, AttributeError):
+            self.metrics["llm_errors"] += 1
+            return {}
+
+    async def score_tweets(self, tweets: list):
+        """
+        Score every tweet, reusing cached scores.
+
+        Returns:
+            dict: tweet id -> score between -1 and 1
+        """
+        scores = {}
+        ambiguous = []
+        for tweet in tweets:
+            tweet_id = str(tweet["id"])
+            if tweet_id in self._scores:
+                scores[tweet_id] = self._scores[tweet_id]
+                self.metrics["cached"] += 1
+                continue
+            score, hits = lexicon_score(tweet["text"])
+            scores[tweet_id] = score
+            if self.use_llm and (not hits or abs(score) < SENTIMENT_AMBIGUITY):
+                ambiguous.append(tweet)
+            else:
+                self._remember(tweet_id, score)
+                self.metrics["lexicon"] += 1
+
+        batches = [ambiguous[i:i + self.batch_size] for i in range(0, len(ambiguous), self.batch_size)]
+        for batch, llm_scores in zip(batches, await asyncio.gather(*(self._score_with_llm(b) for b in batches))):
+            for tweet in batch:
+                tweet_id = str(tweet["id"])
+                if tweet_id in llm_scores:
+                    scores[tweet_id] = llm_scores[tweet_id]
+                    self._remember(tweet_id, scores[tweet_id])
+                    self.metrics["llm"] += 1
+                # Tweets the LLM skipped or failed on get their lexicon score
+                # for this request only, and are sent to the LLM again next time
+        return scores
+
+    def aggregate(self, tweets: list, scores: dict):
+        """
+        Exponentially time-decayed mean score; newer tweets weigh more. Ages
+        are measured from the newest tweet so an old corpus still weighs its
+        tweets relative to each other.
+        """
+        timestamps = [_created_at(tweet) for tweet in tweets]
+        newest = max((t for t in timestamps if t is not None), default=datetime.now(timezone.utc))
+        total = 0.0
+        weights = 0.0
+        for tweet, created_at in zip(tweets, timestamps):
+            age_hours = (newest - created_at).total_seconds() / 3600 if created_at else 0.0
+            weight = 0.5 ** (age_hours / self.half_life_hours)
+            total += weight * scores[str(tweet["id"])]
+            weights += weight
+        return total / weights if weights else 0.0
+
+    async def analyze(self, tweets: list):
+        """
+        Returns:
+            dict: `sentiment` (False only for very negative markets), the
+            aggregate `score` and the number of tweets considered
+        """
+        scores = await self.score_tweets(tweets)
+        score = self.aggregate(tweets, scores)
+        return {"sentiment": score >= SENTIMENT_NEGATIVE_THRESHOLD, "score": score, "tweets": len(tweets)}
+
+    def stats(self):
+        return {**self.metrics, "cache_size": len(self._scores)}
+
+
+sentiment_engine = SentimentEngine()
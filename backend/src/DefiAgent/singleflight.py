@@ -0,0 +1,94 @@
+import asyncio
+import functools
+import os
+
+from DefiAgent.response_cache import normalize_prompt
+
+COALESCE_REQUESTS = os.getenv("COALESCE_REQUESTS", "true").lower() == "true"
+
+
+def exact_prompt(prompt: str):
+    """Key for stages whose output echoes the prompt's literals (addresses, amounts)."""
+    return " ".join(prompt.split())
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls: while a call for a key is in
+    flight, further callers with the same key await that call's result
+    instead of starting their own.
+
+    The call runs as its own task, so a caller going away (a disconnected
+    client, a discarded speculative stage) doesn't cancel it for the
+    others; it is only cancelled once every caller waiting on it is gone.
+    """
+
+    def __init__(self, name: str, key=normalize_prompt):
+        self.name = name
+        self.key = key
+        self._flights = {}
+        self.metrics = {"calls": 0, "coalesced": 0, "abandoned": 0}
+
+    async def run(self, prompt: str, call):
+        """
+        Await `call()` for `prompt`, sharing the result with concurrent
+        callers of the same key. Exceptions are shared as well.
+        """
+        self.metrics["calls"] += 1
+        key = self.key(prompt)
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = {"task": asyncio.ensure_future(call()), "waiters": 0}
+            flight["task"].add_done_callback(lambda _: self._land(key, flight))
+        else:
+            self.metrics["coalesced"] += 1
+
+        flight["waiters"] += 1
+        try:
+            return await asyncio.shield(flight["task"])
+        except asyncio.CancelledError:
+            if flight["waiters"] == 1 and not flight["task"].done():
+                # Nobody is left waiting; later callers start a fresh call
+                self._land(key, flight)
+                flight["task"].cancel()
+                self.metrics["abandoned"] += 1
+            raise
+        finally:
+            flight["waiters"] -= 1
+
+    def _land(self, key: str, flight: dict):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self):
+        calls = self.metrics["calls"]
+        return {
+            **self.metrics,
+            "in_flight": len(self._flights),
+            "coalesced_rate": self.metrics["coalesced"] / calls if calls else 0.0,
+        }
+
+
+flights = {}
+
+
+def coalesced(name: str, key=normalize_prompt):
+    """
+    Wrap an async `prompt -> result` call so concurrent identical prompts
+    share one in-flight call. Disabled with `COALESCE_REQUESTS=false`.
+    """
+    flight = flights[name] = SingleFlight(name, key)
+
+    def decorator(func):
+        if not COALESCE_REQUESTS:
+            return func
+
+        @functools.wraps(func)
+        async def wrapper(prompt: str):
+            return await flight.run(prompt, lambda: func(prompt))
+        return wrapper
+    return decorator
+
+
+def coalescing_stats():
+    return {name: flight.stats() for name, flight in flights.items()}
@@ -0,0 +1,137 @@
+import logging
+import os
+
+from dotenv import load_dotenv
+from DefiAgent.llm import secret_invoke
+from utils import extract_json, repair_json
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# "schema" constrains decoding to the JSON schema, "json" only to valid
+# JSON, "prompt" relies on the instructions alone
+STRUCTURED_OUTPUT_MODE = os.getenv("STRUCTURED_OUTPUT_MODE", "schema")
+STRUCTURED_OUTPUT_RETRIES = int(os.getenv("STRUCTURED_OUTPUT_RETRIES", "1"))
+
+MODES = ["schema", "json", "prompt"]
+
+
+def format_unsupported(error: Exception):
+    """
+    Whether an error means the client or endpoint doesn't accept the
+    `format` option: an unexpected keyword, or a 400 that names it.
+    """
+    if isinstance(error, TypeError):
+        return True
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    message = str(error).lower()
+    return status in (400, 422) and ("format" in message or "schema" in message)
+
+
+class StructuredOutput:
+    """
+    Structured JSON generation from Secret AI for one response shape.
+
+    The schema is passed to Ollama's `format` so decoding is constrained to
+    it. Endpoints that reject that option fall back to plain JSON mode, then
+    to prompt-only generation, and the fallback sticks for later calls;
+    other errors are raised without changing the mode. Output
+    that still doesn't parse is repaired locally (Python literals, quotes,
+    comments, trailing commas) and only regenerated, with the errors fed
+    back, as a last resort.
+    """
+
+    def __init__(self, name: str, schema: dict, validation_schema: dict = None,
+                 mode: str = STRUCTURED_OUTPUT_MODE, retries: int = STRUCTURED_OUTPUT_RETRIES):
+        self.name = name
+        self.schema = schema
+        # Looser schema the parsed object is accepted with
+        self.validation_schema = validation_schema or schema
+        self.mode = mode if mode in MODES else "prompt"
+        self.retries = retries
+        self.metrics = {
+            "requests": 0, "responses": 0, "parse_failures": 0, "repaired": 0,
+            "retries": 0, "failures": 0, "mode_fallbacks": 0,
+        }
+        structured_outputs[name] = self
+
+    def _format(self, mode: str):
+        if mode == "schema":
+            return {"format": self.schema}
+        if mode == "json":
+            return {"format": "json"}
+        return {}
+
+    async def _invoke(self, messages: list):
+        try:
+            return await secret_invoke(messages, **self._format(self.mode))
+        except Exception as e:
+            # Network errors, timeouts and 5xx say nothing about the format
+            # support, so only an explicit rejection of it downgrades the mode
+            if self.mode == "prompt" or not format_unsupported(e):
+                raise
+            weaker = MODES[MODES.index(self.mode) + 1]
+            logger.warning("Structured output for %s falling back from %s to %s mode: %s",
+                           self.name, self.mode, weaker, e)
+            self.mode = weaker
+            self.metrics["mode_fallbacks"] += 1
+        return await self._invoke(messages)
+
+    def _parse(self, content: str):
+        try:
+            return extract_json(content, self.validation_schema)
+        except ValueError:
+            self.metrics["parse_failures"] += 1
+        value = extract_json(repair_json(content), self.validation_schema)
+        self.metrics["repaired"] += 1
+        return value
+
+    async def generate(self, messages: list):
+        """
+        Generate and parse one object.
+
+        Args:
+            messages (list): The chat messages
+
+        Returns:
+            dict: The parsed object
+
+        Raises:
+            ValueError: If no valid object was produced within the retries
+        """
+        self.metrics["requests"] += 1
+        messages = list(messages)
+        for attempt in range(self.retries + 1):
+            content = (await self._invoke(messages)).content
+            self.metrics["responses"] += 1
+            try:
+                return self._parse(content)
+            except ValueError as e:
+                error = e
+            if attempt < self.retries:
+                self.metrics["retries"] += 1
+                messages += [
+                    ("ai", content),
+                    ("human", f"That reply was not valid JSON for the required structure ({error}). "
+                              "Reply with only the JSON object."),
+                ]
+        self.metrics["failures"] += 1
+        raise error
+
+    def stats(self):
+        responses = self.metrics["responses"] or 1
+        requests = self.metrics["requests"] or 1
+        return {
+            **self.metrics,
+            "mode": self.mode,
+            "parse_failure_rate": self.metrics["parse_failures"] / responses,
+            "retry_rate": self.metrics["retries"] / requests,
+        }
+
+
+structured_outputs = {}
+
+
+def structured_stats():
+    return {name: output.stats() for name, output in structured_outputs.items()}
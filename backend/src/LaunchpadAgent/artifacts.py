@@ -0,0 +1,102 @@
+import json
+import logging
+import mmap
+import os
+import threading
+import time
+
+from web3 import Web3
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_RELOAD_CHECK_INTERVAL = float(os.getenv("ARTIFACT_RELOAD_CHECK_INTERVAL", "2"))
+
+
+class ArtifactError(ValueError):
+    pass
+
+
+def load_artifact(path: str):
+    """
+    Load and validate a Hardhat artifact. The file is memory-mapped and
+    parsed in a single pass.
+
+    Raises:
+        ArtifactError: If the artifact has no ABI or bytecode
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        artifact = json.loads(data[:])
+    if not isinstance(artifact.get("abi"), list):
+        raise ArtifactError(f"{path} has no ABI")
+    bytecode = artifact.get("bytecode")
+    if not isinstance(bytecode, str) or not bytecode.startswith("0x") or len(bytecode) <= 2:
+        raise ArtifactError(f"{path} has no deployable bytecode")
+    return artifact
+
+
+class ArtifactRegistry:
+    """
+    Process-wide cache of contract artifacts, contract factories and
+    address-bound contract instances.
+
+    Each artifact is read and parsed once. Its file is re-stat'ed at most
+    every `check_interval` seconds and, when it changed on disk (e.g. after
+    `npx hardhat compile`), reloaded along with every factory and instance
+    built from it.
+    """
+
+    def __init__(self, w3: Web3, check_interval: float = ARTIFACT_RELOAD_CHECK_INTERVAL):
+        self.w3 = w3
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._artifacts = {}
+        self._factories = {}
+        self._instances = {}
+
+    def _signature(self, path: str):
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _evict(self, path: str):
+        self._factories.pop(path, None)
+        for key in [key for key in self._instances if key[0] == path]:
+            del self._instances[key]
+
+    def get(self, path: str):
+        """The parsed artifact at `path`, reloaded if the file changed."""
+        path = os.path.abspath(path)
+        with self._lock:
+            entry = self._artifacts.get(path)
+            now = time.monotonic()
+            if entry is not None and now - entry["checked_at"] < self.check_interval:
+                return entry["artifact"]
+
+            signature = self._signature(path)
+            if entry is not None and entry["signature"] == signature:
+                entry["checked_at"] = now
+                return entry["artifact"]
+
+            artifact = load_artifact(path)
+            if entry is not None:
+                logger.info("Reloaded contract artifact %s", path)
+                self._evict(path)
+            self._artifacts[path] = {"artifact": artifact, "signature": signature, "checked_at": now}
+            return artifact
+
+    def factory(self, path: str):
+        """Contract factory (ABI + bytecode) for deployments."""
+        artifact = self.get(path)
+        path = os.path.abspath(path)
+        with self._lock:
+            if path not in self._factories:
+                self._factories[path] = self.w3.eth.contract(abi=artifact["abi"], bytecode=artifact["bytecode"])
+            return self._factories[path]
+
+    def instance(self, path: str, address: str):
+        """Contract instance bound to a deployed address."""
+        artifact = self.get(path)
+        key = (os.path.abspath(path), Web3.to_checksum_address(address))
+        with self._lock:
+            if key not in self._instances:
+                self._instances[key] = self.w3.eth.contract(address=key[1], abi=artifact["abi"])
+            return self._instances[key]
@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import os
+from decimal import Decimal, InvalidOperation
+
+from dotenv import load_dotenv
+from eth_account import Account
+from web3 import Web3
+
+from BridgingAgent.bridge import EXPLORER_URLS
+from BridgingAgent.tx_pipeline import get_pipeline
+from BridgingAgent.receipts import get_watcher
+from LaunchpadAgent.launchpad import artifacts, LAUNCHPAD_ARTIFACT
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Mints packed into one `multicall` transaction
+MINT_BATCH_CHUNK = int(os.getenv("MINT_BATCH_CHUNK", "100"))
+MINT_GAS_MULTIPLIER = float(os.getenv("MINT_GAS_MULTIPLIER", "1.2"))
+MINT_RECEIPT_TIMEOUT = float(os.getenv("MINT_RECEIPT_TIMEOUT", "600"))
+
+CHAIN = "auto_evm"
+
+
+def _to_wei(amount):
+    try:
+        value = int(Decimal(str(amount)) * 10**18)
+    except (InvalidOperation, ValueError):
+        raise ValueError(f"invalid amount {amount!r}")
+    if value <= 0:
+        raise ValueError("amount must be positive")
+    return value
+
+
+def _probe_addresses(count: int):
+    # Fresh addresses have no balance, so minting to them is the most
+    # expensive case and the estimate covers every real recipient
+    return [Account.create().address for _ in range(count)]
+
+
+class BatchMint:
+    """
+    Mints launchpad tokens to many recipients from the hot wallet.
+
+    Transactions go through the shared auto_evm transaction pipeline, so
+    nonces are assigned locally and broadcasts run concurrently. Gas is
+    estimated once per transaction shape (a single `mint`, or a `multicall`
+    of N mints) and reused for every transaction of that shape. With
+    `multicall`, up to `MINT_BATCH_CHUNK` mints are packed into one
+    transaction through the contract's own `multicall`, which delegatecalls
+    itself so the `onlyOwner` check still sees the hot wallet.
+    """
+
+    def __init__(self, contract_address: str, recipients: list, use_multicall: bool = False,
+                 chunk_size: int = MINT_BATCH_CHUNK):
+        self.contract = artifacts.instance(LAUNCHPAD_ARTIFACT, contract_address)
+        self.pipeline = get_pipeline(CHAIN)
+        self.use_multicall = use_multicall
+        self.chunk_size = chunk_size
+        self.results = []
+        self._valid = []
+        for recipient in recipients:
+            to = recipient.get("to") or recipient.get("recipient")
+            result = {"to": to, "amount": recipient.get("amount"), "status": "queued"}
+            self.results.append(result)
+            try:
+                if not to or not Web3.is_address(to):
+                    raise ValueError(f"invalid address {to!r}")
+                self._valid.append((result, Web3.to_checksum_address(to), _to_wei(result["amount"])))
+            except ValueError as e:
+                result.update(status="failed", error=str(e))
+        self._gas = {}
+
+    def _mint_data(self, to: str, amount: int):
+        return self.contract.encode_abi("mint", args=[to, amount])
+
+    def _estimate(self, shape, probe):
+        """Gas for a transaction shape; `probe` builds the calldata to estimate with."""
+        if shape not in self._gas:
+            gas = self.pipeline.web3.eth.estimate_gas(
+                {"from": self.pipeline.account.address, "to": self.contract.address, "data": probe()}
+            )
+            self._gas[shape] = int(gas * MINT_GAS_MULTIPLIER)
+        return self._gas[shape]
+
+    def _single_tx(self, to: str, amount: int):
+        gas = self._estimate(("mint",), lambda: self._mint_data(_probe_addresses(1)[0], amount))
+        return {"to": self.contract.address, "data": self._mint_data(to, amount), "gas": gas, "value": 0}
+
+    def _multicall_tx(self, chunk: list):
+        def probe():
+            calls = [self._mint_data(to, amount) for to, (_, _, amount) in zip(_probe_addresses(len(chunk)), chunk)]
+            return self.contract.encode_abi("multicall", args=[calls])
+
+        gas = self._estimate(("multicall", len(chunk)), probe)
+        data = self.contract.encode_abi("multicall", args=[[self._mint_data(to, amount) for _, to, amount in chunk]])
+        return {"to": self.contract.address, "data": data, "gas": gas, "value": 0}
+
+    def _build(self):
+        """Group recipients into transactions: (results, tx) pairs, or (results, error)."""
+        if self.use_multicall and not any(item.get("name") == "multicall" for item in self.contract.abi):
+            self.use_multicall = False
+        if self.use_multicall:
+            chunks = [self._valid[i:i + self.chunk_size] for i in range(0, len(self._valid), self.chunk_size)]
+            try:
+                return [([result for result, _, _ in chunk], self._multicall_tx(chunk)) for chunk in chunks]
+            except Exception as e:
+                # Contracts deployed before `multicall` was added revert here
+                logger.warning("Multicall unavailable, minting individually: %s", e)
+                self.use_multicall = False
+                self._gas.clear()
+        groups = []
+        for result, to, amount in self._valid:
+            try:
+                groups.append(([result], self._single_tx(to, amount)))
+            except Exception as e:
+                groups.append(([result], e))
+        return groups
+
+    async def _submit(self, results: list, tx):
+        if isinstance(tx, Exception):
+            for result in results:
+                result.update(status="failed", error=str(tx))
+            return None
+        try:
+            nonce, tx_hash = await self.pipeline.submit(tx)
+        except Exception as e:
+            for result in results:
+                result.update(status="failed", error=str(e))
+            return None
+        for result in results:
+            result.update(status="submitted", nonce=nonce, tx_hash=tx_hash.hex(),
+                          url=EXPLORER_URLS[CHAIN].format(tx_hash.hex()))
+        return nonce, tx_hash, results
+
+    async def _wait_for_receipts(self, submitted: list):
+        watcher = get_watcher(CHAIN)
+        receipts = await asyncio.gather(
+            *(watcher.wait(tx_hash, timeout=MINT_RECEIPT_TIMEOUT) for _, tx_hash, _ in submitted)
+        )
+        for (nonce, _, results), receipt in zip(submitted, receipts):
+            await self.pipeline.settle(nonce, receipt)
+            if receipt is None:
+                for result in results:
+                    result["error"] = "timed out waiting for receipt"
+                continue
+            for result in results:
+                result["block_number"] = receipt["blockNumber"]
+                if receipt["status"] == 1:
+                    result["status"] = "confirmed"
+                else:
+                    result.update(status="failed", error="transaction reverted")
+
+    async def run(self, wait: bool = True):
+        """
+        Submit every mint and, if `wait`, track receipts until all are mined.
+
+        Returns:
+            dict: Per-status counts and one outcome per recipient, in request order
+        """
+        groups = await asyncio.to_thread(self._build)
+        submitted = await asyncio.gather(*(self._submit(results, tx) for results, tx in groups))
+        submitted = [item for item in submitted if item is not None]
+        logger.info("Submitted %d mint transactions for %d recipients", len(submitted), len(self.results))
+        if wait:
+            await self._wait_for_receipts(submitted)
+        counts = {}
+        for result in self.results:
+            counts[result["status"]] = counts.get(result["status"], 0) + 1
+        return {
+            "contractAddress": self.contract.address,
+            "multicall": self.use_multicall,
+            "transactions": len(submitted),
+            "counts": counts,
+            "results": self.results,
+        }
+
+
+async def mint_tokens_batch(contract_address: str, recipients: list, use_multicall: bool = False, wait: bool = True):
+    """
+    Mint tokens to many recipients.
+
+    Args:
+        contract_address (str): Deployed launchpad token
+        recipients (list): `{"to": address, "amount": tokens}` entries
+        use_multicall (bool): Pack mints into `multicall` transactions
+        wait (bool): Wait for receipts before returning
+
+    Returns:
+        dict: Per-status counts and per-recipient outcomes
+    """
+    return await BatchMint(contract_address, recipients, use_multicall).run(wait)
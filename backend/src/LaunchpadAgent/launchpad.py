@@ -1,89 +1,146 @@
+import logging
 import os 
 from dotenv import load_dotenv
 from eth_account import Account
 from web3 import Web3
+from LaunchpadAgent.artifacts import ArtifactRegistry
+from telemetry import InstrumentedHTTPProvider
+from BridgingAgent.bridge import EXPLORER_URLS
+from BridgingAgent.tx_pipeline import get_pipeline
+from BridgingAgent.receipts import get_watcher
+from shared_state import shared_state
+import asyncio
+import inspect
 import requests
 import json
 
+logger = logging.getLogger(__name__)
+
 auto_evm_rpc_url = os.getenv("AUTO_EVM_RPC_URL")
 
-w3 = Web3(Web3.HTTPProvider(auto_evm_rpc_url))
+w3 = Web3(InstrumentedHTTPProvider(auto_evm_rpc_url, "auto_evm"))
 private_key = os.getenv("PRIVATE_KEY")
 account = Account.from_key(private_key)
 
+LAUNCHPAD_ARTIFACT = os.getenv("LAUNCHPAD_ARTIFACT", "../contracts/artifacts/contracts/SentinexLaunchpad.sol/SentinexLaunchpad.json")
+artifacts = ArtifactRegistry(w3)
+
+CHAIN = "auto_evm"
+DEPLOY_RECEIPT_TIMEOUT = float(os.getenv("DEPLOY_RECEIPT_TIMEOUT", "600"))
+MINT_RECEIPT_TIMEOUT = float(os.getenv("MINT_RECEIPT_TIMEOUT", "600"))
+# How long deployment records stay queryable from every worker
+DEPLOYMENT_RECORD_TTL = float(os.getenv("DEPLOYMENT_RECORD_TTL", str(7 * 24 * 3600)))
+# Deployments submitted by this worker, by transaction hash
+deployments = {}
+
 def compile_contract():
-    with open("../contracts/artifacts/contracts/SentinexLaunchpad.sol/SentinexLaunchpad.json", "r") as f:
+    with open(LAUNCHPAD_ARTIFACT, "r") as f:
         contract_source = f.read()
     compiled_sol = w3.eth.compile_source(contract_source)
     contract_id, contract_interface = compiled_sol.popitem()
     return contract_interface["abi"], contract_interface["bytecode"]
 
 def get_contract_interface():
-    with open("../contracts/artifacts/contracts/SentinexLaunchpad.sol/SentinexLaunchpad.json", "r") as f:
-        contract_interface = json.load(f)
-    return contract_interface
-
-def deploy_contract(name: str, symbol: str, initialSupply: int, maxSupply: int):
-    contract_interface = get_contract_interface()
-    abi = contract_interface["abi"]
-    bytecode = contract_interface["bytecode"]
-    
-    nonce = w3.eth.get_transaction_count(account.address)
-    contract = w3.eth.contract(abi=abi, bytecode=bytecode)
-    balance = w3.eth.get_balance(account.address)
-    print(f"Account balance: {w3.from_wei(balance, 'ether')} ETH")
+    return artifacts.get(LAUNCHPAD_ARTIFACT)
+
+async def _publish(deployment: dict):
+    # The store client blocks, so keep it off the event loop
+    await asyncio.to_thread(shared_state.store.set, shared_state.key("deployment", deployment["tx_hash"]),
+                            json.dumps(deployment), DEPLOYMENT_RECORD_TTL)
+
+async def _on_deployed(tx_hash: str, receipt):
+    deployment = deployments[tx_hash]
+    if receipt is None:
+        deployment.update(status="failed", error="timed out waiting for receipt")
+    elif receipt["status"] != 1:
+        deployment.update(status="failed", error="transaction reverted", block_number=receipt["blockNumber"])
+    else:
+        deployment.update(status="deployed", contract_address=receipt["contractAddress"], block_number=receipt["blockNumber"])
+        logger.info("Contract deployed successfully at %s", receipt["contractAddress"])
+    await _publish(deployment)
+
+async def deploy_contract(name: str, symbol: str, initialSupply: int, maxSupply: int, callback=None):
+    """
+    Submit a launchpad token deployment without waiting for it to be mined.
+    The shared receipt watcher resolves it in the background and updates
+    `deployments[tx_hash]` and the shared record; `callback` is then
+    called with that record.
+
+    Returns:
+        dict: The deployment, in `submitted` status, or None if it could not be sent
+    """
+    contract = artifacts.factory(LAUNCHPAD_ARTIFACT)
+    pipeline = get_pipeline(CHAIN)
     initialSupply = initialSupply * 10**18
     maxSupply = maxSupply * 10**18
-    gas_estimate = contract.constructor(name, symbol, initialSupply, maxSupply).estimate_gas({"from": account.address})
-    print(gas_estimate)
-
-    transaction = {
-        'nonce': nonce,
-        'gas': int(gas_estimate * 1.2),
-        'gasPrice': w3.eth.gas_price,
-        'from': account.address,
-    }
     try:
-        # Deploy contract
-        contract_tx = contract.constructor(name, symbol, initialSupply, maxSupply).build_transaction(transaction)
-        
-        signed_tx = w3.eth.account.sign_transaction(contract_tx, private_key)
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-        
-        # Wait for transaction receipt
-        tx_receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
-        contract_address = tx_receipt['contractAddress']
-        
-        print(f"Contract deployed successfully!")
-        print(f"Contract address: {contract_address}")
-        print(f"Transaction hash: {tx_hash.hex()}")
-        
-        return contract_address
-        
+        constructor = contract.constructor(name, symbol, initialSupply, maxSupply)
+        gas_estimate = await asyncio.to_thread(constructor.estimate_gas, {"from": account.address})
+        logger.debug("Deployment gas estimate: %s", gas_estimate)
+        tx = {"data": constructor.data_in_transaction, "gas": int(gas_estimate * 1.2), "value": 0}
+        nonce, tx_hash = await pipeline.submit(tx)
     except Exception as e:
-        print(f"Error deploying contract: {str(e)}")
+        logger.error("Error deploying contract: %s", e)
         return None
+
+    tx_hash = "0x" + tx_hash.hex()
+    deployment = {
+        "status": "submitted",
+        "tx_hash": tx_hash,
+        "nonce": nonce,
+        "url": EXPLORER_URLS[CHAIN].format(tx_hash[2:]),
+        "status_url": f"/deployments/{tx_hash}",
+    }
+    deployments[tx_hash] = deployment
+    await _publish(deployment)
+    logger.info("Deployment transaction sent: %s", tx_hash)
+
+    async def on_receipt(receipt):
+        await pipeline.settle(nonce, receipt)
+        await _on_deployed(tx_hash, receipt)
+        if callback is not None:
+            result = callback(dict(deployments[tx_hash]))
+            if inspect.isawaitable(result):
+                await result
+
+    get_watcher(CHAIN).watch(tx_hash, on_receipt, timeout=DEPLOY_RECEIPT_TIMEOUT)
+    return dict(deployment)
+
+async def get_deployment(tx_hash: str):
+    """A deployment submitted by any worker, or None if unknown."""
+    tx_hash = tx_hash.lower() if tx_hash.startswith("0x") else "0x" + tx_hash.lower()
+    deployment = deployments.get(tx_hash)
+    if deployment is not None:
+        return dict(deployment)
+    raw = await asyncio.to_thread(shared_state.store.get, shared_state.key("deployment", tx_hash))
+    return json.loads(raw) if raw else None
     
-def mint_tokens(contract_address: str, to: str, amount: int):
-    abi = get_contract_interface()["abi"]
-    contract = w3.eth.contract(address=contract_address, abi=abi)
-    nonce = w3.eth.get_transaction_count(account.address)
+async def mint_tokens(contract_address: str, to: str, amount: int):
+    """
+    Mint launchpad tokens through the shared auto_evm transaction pipeline,
+    so the nonce can't collide with a deployment, batch mint or bridge sent
+    from the same wallet at the same time.
+
+    Returns:
+        str: The transaction hash once mined, or False if it failed
+    """
+    contract = artifacts.instance(LAUNCHPAD_ARTIFACT, contract_address)
+    pipeline = get_pipeline(CHAIN)
     amount = amount * 10**18
-    gas_estimate = contract.functions.mint(to, amount).estimate_gas({"from": account.address})
-    transaction = {
-        'nonce': nonce,
-        'gas': int(gas_estimate * 1.2),
-        'gasPrice': w3.eth.gas_price,
-        'from': account.address,
-    }
     try:
-        tx = contract.functions.mint(to, amount).build_transaction(transaction)
-        signed_tx = w3.eth.account.sign_transaction(tx, private_key)
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.raw_transaction)    
-        tx_receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
-        print(f"Tokens minted successfully!")
-        print(f"Transaction hash: 0x{tx_hash.hex()}")
-        return tx_hash.hex()
+        mint = contract.functions.mint(to, amount)
+        gas_estimate = await asyncio.to_thread(mint.estimate_gas, {"from": account.address})
+        tx = {"to": contract.address, "data": contract.encode_abi("mint", args=[to, amount]),
+              "gas": int(gas_estimate * 1.2), "value": 0}
+        nonce, tx_hash = await pipeline.submit(tx)
     except Exception as e:
-        print(f"Error minting tokens: {str(e)}")
-        return False
\ No newline at end of file
+        logger.error("Error minting tokens: %s", e)
+        return False
+
+    receipt = await get_watcher(CHAIN).wait(tx_hash, timeout=MINT_RECEIPT_TIMEOUT)
+    await pipeline.settle(nonce, receipt)
+    if receipt is None or receipt["status"] != 1:
+        logger.error("Error minting tokens: %s", "timed out waiting for receipt" if receipt is None else "transaction reverted")
+        return False
+    logger.info("Tokens minted successfully: 0x%s", tx_hash.hex())
+    return tx_hash.hex()
@@ -0,0 +1,38 @@
+"""
+Production server settings. `gunicorn main:app`, run from backend/src,
+picks this file up automatically:
+
+    WEB_CONCURRENCY=4 gunicorn main:app
+
+Workers share nonces, caches and locks through shared_state (SQLite on the
+host, or Redis when REDIS_URL is set) and their metrics are aggregated on
+/metrics.
+"""
+import multiprocessing
+import os
+import tempfile
+
+# Must be set before prometheus_client is first imported
+os.environ["PROMETHEUS_MULTIPROC_DIR"] = (
+    os.getenv("PROMETHEUS_MULTIPROC_DIR") or os.path.join(tempfile.gettempdir(), "sentinex-prometheus")
+)
+
+from shared_state import start_run
+from telemetry import mark_worker_dead, prepare_multiprocess_metrics
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5001')}"
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count())))
+worker_class = "uvicorn_worker.UvicornWorker"
+# LLM calls and receipt waits can legitimately take a while
+timeout = int(os.getenv("WORKER_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("WORKER_GRACEFUL_TIMEOUT", "30"))
+keepalive = 5
+
+
+def on_starting(server):
+    start_run()
+    prepare_multiprocess_metrics()
+
+
+def child_exit(server, worker):
+    mark_worker_dead(worker.pid)
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import random
+import time
+
+import httpx
+from dotenv import load_dotenv
+from telemetry import UPSTREAM_LATENCY
+
+load_dotenv()
+
+# ZEREPY_BASE_URL = "http://localhost:8000"
+ZEREPY_BASE_URL = os.getenv("ZEREPY_BASE_URL", "https://sentinex-zerepytwitter.onrender.com")
+# SECRET_DEPLOY_URL = "http://localhost:3000/"
+SECRET_DEPLOY_URL = os.getenv("SECRET_DEPLOY_URL", "https://sentinex.onrender.com/")
+
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", "0.25"))
+
+# Errors raised before the request reached the server, safe to retry for any call
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+RETRYABLE_STATUS = {429, 502, 503, 504}
+
+
+class ServiceClient:
+    """
+    Shared keep-alive HTTP/2 client for one upstream service.
+
+    Non-idempotent calls (deploys, transfers, tweets) are only retried when
+    the connection could not be established, so a request is never sent
+    twice. Idempotent calls are also retried on read errors and on
+    429/5xx gateway responses. Retries use exponential backoff with full
+    jitter.
+    """
+
+    def __init__(self, name: str, base_url: str):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                http2=True,
+                timeout=httpx.Timeout(HTTP_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+                ),
+                headers={"Content-Type": "application/json"},
+            )
+        return self._client
+
+    async def _backoff(self, attempt: int):
+        await asyncio.sleep(random.uniform(0, HTTP_RETRY_BACKOFF * 2 ** attempt))
+
+    async def post_json(self, path: str, payload, idempotent: bool = False):
+        """
+        POST a JSON payload and return the decoded JSON response.
+
+        Args:
+            path (str): Path relative to the service base URL
+            payload: JSON-serialisable request body
+            idempotent (bool): Whether the call may be retried after it
+                possibly reached the server
+
+        Returns:
+            The decoded JSON response body
+        """
+        retryable_errors = httpx.TransportError if idempotent else CONNECT_ERRORS
+        for attempt in range(HTTP_MAX_RETRIES + 1):
+            last_attempt = attempt == HTTP_MAX_RETRIES
+            start = time.perf_counter()
+            try:
+                response = await self.client.post("/" + path.lstrip("/"), json=payload)
+            except retryable_errors as e:
+                UPSTREAM_LATENCY.labels(self.name, path, type(e).__name__).observe(time.perf_counter() - start)
+                if last_attempt:
+                    raise
+                await self._backoff(attempt)
+                continue
+            UPSTREAM_LATENCY.labels(self.name, path, str(response.status_code)).observe(time.perf_counter() - start)
+            if idempotent and response.status_code in RETRYABLE_STATUS and not last_attempt:
+                await self._backoff(attempt)
+                continue
+            return response.json()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+zerepy = ServiceClient("zerepy", ZEREPY_BASE_URL)
+secret_deploy = ServiceClient("secret_deploy", SECRET_DEPLOY_URL)
+
+
+async def close_clients():
+    await zerepy.aclose()
+    await secret_deploy.aclose()
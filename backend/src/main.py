@@ -1,18 +1,62 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
 import uvicorn
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
-from DefiAgent.agents import detect_intent, defi_analysis, normal_query, intent_detection_and_slot_filling, sentiment_analysis, normal_query
-from BridgingAgent.bridge import bridge_auto_evm_to_sepolia
-from LaunchpadAgent.launchpad import deploy_contract, mint_tokens
-from utils import parse_ai_agent_launchpad_response, parse_sentiment_analysis_response
+from DefiAgent.agents import detect_intent, defi_analysis, normal_query, intent_detection_and_slot_filling, normal_query
+from DefiAgent.llm import limiter_stats, cohere_client, close_cohere
+from DefiAgent import intent_classifier
+from DefiAgent.response_cache import cache_stats, save_caches
+from DefiAgent.secret_discovery import secret_ai
+from DefiAgent.sentiment import sentiment_engine
+from DefiAgent.structured import structured_stats
+from DefiAgent.singleflight import coalescing_stats
+from DefiAgent.pipeline import run_chat, stream_chat, server_timing_header, SPECULATIVE_CHAT
+from LaunchpadAgent.launchpad import deploy_contract, mint_tokens, get_deployment
+from LaunchpadAgent.batch_mint import mint_tokens_batch
+from http_client import zerepy, secret_deploy, close_clients
+from tweet_store import tweet_store, FALLBACK_TWEETS
+from BridgingAgent.tx_pipeline import pipeline_stats, stop_pipelines
+from BridgingAgent.jobs import bridge_jobs
+from BridgingAgent.receipts import watcher_stats, stop_watchers
+from telemetry import configure_logging, trace_requests, metrics_payload, span, prepare_multiprocess_metrics
+from shared_state import shared_state, start_run
+from fastapi import HTTPException
+from contextlib import asynccontextmanager
 import json
-import requests
+import logging
 import os
 import certifi
 
 load_dotenv() 
-app = FastAPI()
+
+configure_logging()
+logger = logging.getLogger(__name__)
+
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "5001"))
+# More than one runs the production server with that many worker processes
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs once per worker process: clients are opened here rather than at
+    # import, and one-off startup work is claimed through the shared state
+    cohere_client()
+    secret_ai.warm_up()
+    tweet_store.start()
+    if shared_state.once_per_run("bridge_jobs_resume"):
+        await bridge_jobs.resume()
+    yield
+    await tweet_store.stop()
+    await bridge_jobs.stop()
+    await stop_watchers()
+    await stop_pipelines()
+    await close_clients()
+    await close_cohere()
+    save_caches()
+
+app = FastAPI(lifespan=lifespan)
 
 import os
 import certifi
@@ -27,118 +71,152 @@ allow_credentials = True
 allow_methods = ["*"]
 allow_headers = ["*"]
 
+app.middleware("http")(trace_requests)
 app.add_middleware(CORSMiddleware, allow_origins=origins, allow_credentials=allow_credentials, allow_methods=allow_methods, allow_headers=allow_headers)
-# base_url = "http://localhost:8000"
-base_url = "https://sentinex-zerepytwitter.onrender.com"
-# secret_deploy_url = "http://localhost:3000/"
-secret_deploy_url = "https://sentinex.onrender.com/"
 
 @app.get("/")
 def read_root():
     return {"message": "Hello World"}
 
+@app.get("/metrics")
+def metrics():
+    payload, content_type = metrics_payload()
+    return Response(content=payload, media_type=content_type)
+
+@app.get("/stats")
+def stats():
+    return {
+        "llm_limiters": limiter_stats(),
+        "intent_classifier": intent_classifier.stats,
+        "structured_output": structured_stats(),
+        "response_cache": cache_stats(),
+        "coalescing": coalescing_stats(),
+        "secret_ai": secret_ai.stats(),
+        "tweet_store": tweet_store.stats(),
+        "sentiment": sentiment_engine.stats(),
+        "tx_pipelines": pipeline_stats(),
+        "bridge_jobs": bridge_jobs.stats(),
+        "receipt_watchers": watcher_stats(),
+        "shared_state": shared_state.stats(),
+        "pid": os.getpid(),
+    }
+
 @app.post("/chat")
-async def chat(request: Request):
+async def chat(request: Request, http_response: Response):
     body = await request.json()
     prompt = body["prompt"]
-    response = await detect_intent(prompt)
-    data = json.loads(response)
-    print(data)
-    if data['action'] != 'other':
-        if data['action'] == 'analyze':
-            response = await defi_analysis(prompt)
-            data = json.loads(response)
-            print(data)
-            return data
-        if data['action'] == 'bridge':
-            data = bridge_auto_evm_to_sepolia(data['parameters'][2], data['parameters'][3])
-            print(data)
-            return data
-        response = normal_query(prompt)
-        print(response)
-        return response
-    else:
-        response = normal_query(prompt)
-        return response
+    speculative = body.get("speculative", SPECULATIVE_CHAT)
+    response, timings = await run_chat(prompt, speculative=speculative)
+    http_response.headers["Server-Timing"] = server_timing_header(timings)
+    logger.debug("Chat response: %s", response)
+    return response
     
+@app.post("/chat/stream")
+async def chat_stream(request: Request):
+    body = await request.json()
+    prompt = body["prompt"]
+
+    async def events():
+        async for event, data in stream_chat(prompt):
+            yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return StreamingResponse(events(), media_type="text/event-stream", headers=headers)
+
+@app.get("/bridge/{job_id}")
+async def bridge_status(job_id: str):
+    job = await bridge_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Bridge job not found")
+    return job
+
+@app.get("/deployments/{tx_hash}")
+async def deployment_status(tx_hash: str):
+    deployment = await get_deployment(tx_hash)
+    if deployment is None:
+        raise HTTPException(status_code=404, detail="Deployment not found")
+    return deployment
+
 @app.post("/launchpadChat")
 async def lauchpad_chat(request: Request):
     body = await request.json()
     prompt = body["prompt"]
-    print(f"Prompt: {prompt}")
-    response = intent_detection_and_slot_filling(prompt)
-    print(response)
-    response = parse_ai_agent_launchpad_response(response)
-    if response["owner"] == "None" or response["owner"] == "" or response["owner"] == None or response["owner"] == "0x":
+    logger.debug("Launchpad prompt: %s", prompt)
+    async with span("slot_filling"):
+        response = await intent_detection_and_slot_filling(prompt)
+    if isinstance(response, str):
+        raise HTTPException(status_code=502, detail=response)
+    # The schema only requires name and symbol, so owner may be missing
+    if response.get("owner") in (None, "", "None", "0x"):
         response["owner"] = ""
-    print(response)
+    logger.debug("Launchpad parameters: %s", response)
     return response
 
 @app.post("/deployContract")
 async def deploy_contract_endpoint(request: Request):
     body = await request.json()
-    # response = deploy_contract(body["name"], body["symbol"], body["initialSupply"], body["maxSupply"])  
-    # print(response)
-    headers = {
-    "Content-Type": "application/json"
-    }
+    # response = await deploy_contract(body["name"], body["symbol"], body["initialSupply"], body["maxSupply"])  
     payload = {
         "name": body["name"],
         "symbol": body["symbol"],
         "initialAmount": body["initialSupply"],
     }
-    response = requests.post(secret_deploy_url+"deploy", json=payload, headers=headers)
-    return response.json()
+    async with span("proxy", service="secret_deploy", path="deploy"):
+        return await secret_deploy.post_json("deploy", payload)
 
 @app.post("/mintTokens")
 async def mint_tokens_endpoint(request: Request):
     body = await request.json()
-    # response = mint_tokens(body["contractAddress"], body["to"], body["amount"])
-    # print(response)
-    headers = {
-    "Content-Type": "application/json"
-    }
+    # response = await mint_tokens(body["contractAddress"], body["to"], body["amount"])
     payload = {
         "contractAddress": body["contractAddress"],
         "recipient": body["recipient"],
         "amount": body["amount"],
         "contractCodeHash": body["contractCodeHash"]
     }
-    response = requests.post(secret_deploy_url+"transfer", json=payload, headers=headers)
-    return response.json()
+    async with span("proxy", service="secret_deploy", path="transfer"):
+        return await secret_deploy.post_json("transfer", payload)
+
+@app.post("/mintTokensBatch")
+async def mint_tokens_batch_endpoint(request: Request):
+    body = await request.json()
+    async with span("batch_mint", recipients=len(body["recipients"])):
+        response = await mint_tokens_batch(
+            body["contractAddress"],
+            body["recipients"],
+            use_multicall=body.get("multicall", False),
+            wait=body.get("wait", True),
+        )
+    logger.info("Batch mint: %s", response["counts"])
+    return response
 
 @app.post("/sentimentAnalysis")
 async def sentiment_analysis_endpoint(request: Request):
     body = await request.json()
     prompt = body["prompt"]
-    try:
-        docs = requests.post(f"{base_url}/agent/action", json={"connection": "twitter", "action": "get-latest-tweets", "params": ['aixbt_agent']})
-        print(docs.json())
-    except Exception as e:
-        print(e)
-        docs = []
-    if not docs or not docs.json()["result"]:
+    async with span("tweets"):
+        tweets = await tweet_store.get('aixbt_agent')
+    if not tweets:
         # rate limit on twitter api 
-        tweets = [{'created_at': '2025-02-23T11:13:11.000Z', 'id': '1893620114656010557', 'edit_history_tweet_ids': ['1893620114656010557'], 'text': 'retail flows hitting $tao post coinbase listing\n\nsubnet evaluations now fully market-driven after dtao upgrade, moving away from validator control'}, {'created_at': '2025-02-23T10:14:50.000Z', 'id': '1893605429244268653', 'edit_history_tweet_ids': ['1893605429244268653'], 'text': '$SHADOW weekly rebase hits optimal pricing on sundays. direct x33 buys getting 40% better entry. current price $128.02'}, {'created_at': '2025-02-23T09:11:26.000Z', 'id': '1893589474996855003', 'edit_history_tweet_ids': ['1893589474996855003'], 'text': '$STX sBTC cap increase confirmed for Feb 25\n\nfirst decentralized BTC peg with smart contracts launching after Nakamoto upgrade'}, {'created_at': '2025-02-23T08:10:48.000Z', 'id': '1893574214999048459', 'edit_history_tweet_ids': ['1893574214999048459'], 'text': '$ANDY trading at 65M mcap on eth vs 5M on base. 13x arb gap if you know what youre doing'}, {'created_at': '2025-02-23T07:10:48.000Z', 'id': '1893559117568188702', 'edit_history_tweet_ids': ['1893559117568188702'], 'text': 'https://t.co/Fbh7MpjT3S now 40% of eigenlayer and symbiotic tvl. clear market dominance in restaking infrastructure forming'}, {'created_at': '2025-02-23T06:10:58.000Z', 'id': '1893544058032910426', 'edit_history_tweet_ids': ['1893544058032910426'], 'text': 'somnia shannon testnet live\n\nbacked by $270M from improbable and virtual society foundation\n\ndev tooling and validator setup activated, staking protocols enabled'}, {'created_at': '2025-02-23T05:11:04.000Z', 'id': '1893528982102122558', 'edit_history_tweet_ids': ['1893528982102122558'], 'text': 'infected launching feb 24 12pm EST. 30 virus tokens including $COVID $HIV $EBOLA competing for winner pot\n\n7-day games running on bonding curves.'}, {'created_at': '2025-02-23T04:10:22.000Z', 'id': '1893513709848502556', 'edit_history_tweet_ids': ['1893513709848502556'], 'text': '$SUPER exchange confirms feb 24 launch\n\ninfinite bonding curve, 50% of fees to buybacks/burns\n\nno VC allocation or insider bags'}, {'created_at': '2025-02-23T03:10:47.000Z', 'id': '1893498714087661733', 'edit_history_tweet_ids': ['1893498714087661733'], 'text': 'vector pushing new UI release\n\nteam keeps building while showing both wins and losses on their own trades\n\ntransparent'}, {'created_at': '2025-02-23T02:10:55.000Z', 'id': '1893483645916283317', 'edit_history_tweet_ids': ['1893483645916283317'], 'text': '$OM just hit ath of $8.81. first defi protocol to get dubai vasp license. fully diluted val at $13.4b and still running'}],[{'created_at': '2025-02-23T11:13:11.000Z', 'id': '1893620114656010557', 'edit_history_tweet_ids': ['1893620114656010557'], 'text': 'retail flows hitting $tao post coinbase listing\n\nsubnet evaluations now fully market-driven after dtao upgrade, moving away from validator control'}, {'created_at': '2025-02-23T10:14:50.000Z', 'id': '1893605429244268653', 'edit_history_tweet_ids': ['1893605429244268653'], 'text': '$SHADOW weekly rebase hits optimal pricing on sundays. direct x33 buys getting 40% better entry. current price $128.02'}, {'created_at': '2025-02-23T09:11:26.000Z', 'id': '1893589474996855003', 'edit_history_tweet_ids': ['1893589474996855003'], 'text': '$STX sBTC cap increase confirmed for Feb 25\n\nfirst decentralized BTC peg with smart contracts launching after Nakamoto upgrade'}, {'created_at': '2025-02-23T08:10:48.000Z', 'id': '1893574214999048459', 'edit_history_tweet_ids': ['1893574214999048459'], 'text': '$ANDY trading at 65M mcap on eth vs 5M on base. 13x arb gap if you know what youre doing'}, {'created_at': '2025-02-23T07:10:48.000Z', 'id': '1893559117568188702', 'edit_history_tweet_ids': ['1893559117568188702'], 'text': 'https://t.co/Fbh7MpjT3S now 40% of eigenlayer and symbiotic tvl. clear market dominance in restaking infrastructure forming'}, {'created_at': '2025-02-23T06:10:58.000Z', 'id': '1893544058032910426', 'edit_history_tweet_ids': ['1893544058032910426'], 'text': 'somnia shannon testnet live\n\nbacked by $270M from improbable and virtual society foundation\n\ndev tooling and validator setup activated, staking protocols enabled'}, {'created_at': '2025-02-23T05:11:04.000Z', 'id': '1893528982102122558', 'edit_history_tweet_ids': ['1893528982102122558'], 'text': 'infected launching feb 24 12pm EST. 30 virus tokens including $COVID $HIV $EBOLA competing for winner pot\n\n7-day games running on bonding curves.'}, {'created_at': '2025-02-23T04:10:22.000Z', 'id': '1893513709848502556', 'edit_history_tweet_ids': ['1893513709848502556'], 'text': '$SUPER exchange confirms feb 24 launch\n\ninfinite bonding curve, 50% of fees to buybacks/burns\n\nno VC allocation or insider bags'}, {'created_at': '2025-02-23T03:10:47.000Z', 'id': '1893498714087661733', 'edit_history_tweet_ids': ['1893498714087661733'], 'text': 'vector pushing new UI release\n\nteam keeps building while showing both wins and losses on their own trades\n\ntransparent'}, {'created_at': '2025-02-23T02:10:55.000Z', 'id': '1893483645916283317', 'edit_history_tweet_ids': ['1893483645916283317'], 'text': '$OM just hit ath of $8.81. first defi protocol to get dubai vasp license. fully diluted val at $13.4b and still running'}]
-    else:
-        tweets = docs.json()["result"]
-    # response = sentiment_analysis(prompt, tweets)
-    response = '{"sentiment": true}'
-    try:
-        response = json.loads(response)
-    except Exception as e:
-        response = parse_sentiment_analysis_response(response)
-    print(response)
+        tweets = FALLBACK_TWEETS
+    async with span("sentiment", tweets=len(tweets)):
+        response = await sentiment_engine.analyze(tweets)
+    logger.debug("Sentiment: %s", response)
     return response
 
 @app.post("/postTweet")
 async def post_tweet(request: Request):
     body = await request.json()
     content = body["content"]
-    docs = requests.post(f"{base_url}/agent/action", json={"connection": "twitter", "action": "post-tweet", "params": [content]})
-    response = docs.json()
-    print(response)
+    async with span("proxy", service="zerepy", path="agent/action"):
+        response = await zerepy.post_json("agent/action", {"connection": "twitter", "action": "post-tweet", "params": [content]})
+    logger.debug("Post tweet: %s", response)
     return response
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=5001, reload=True)
+    if WEB_CONCURRENCY > 1:
+        start_run()
+        prepare_multiprocess_metrics()
+        uvicorn.run("main:app", host=HOST, port=PORT, workers=WEB_CONCURRENCY)
+    else:
+        uvicorn.run("main:app", host=HOST, port=PORT, reload=True)
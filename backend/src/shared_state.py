@@ -0,0 +1,281 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Use a Redis (or Redis-compatible, e.g. Valkey/KeyDB) server when set,
+# otherwise a SQLite file every worker on the host opens
+REDIS_URL = os.getenv("REDIS_URL")
+SHARED_STATE_DB = os.getenv(
+    "SHARED_STATE_DB",
+    str(Path(__file__).resolve().parents[1] / ".cache" / "shared_state.sqlite3"),
+)
+KEY_PREFIX = os.getenv("SHARED_STATE_PREFIX", "sentinex:")
+# Set by the process that starts the workers, so they can tell a worker
+# restart from a fresh start of the whole server
+RUN_ID_ENV = "SENTINEX_RUN_ID"
+RUN_LOCK_TTL = 7 * 24 * 3600
+
+
+class SQLiteStateStore:
+    """
+    Key/value store with expiry, atomic counters, locks and integer sets,
+    backed by one SQLite file in WAL mode. Every operation is a single
+    statement, so concurrent workers on the same host never interleave
+    inside one.
+
+    The connection is reopened after a fork, so the store can be created
+    before gunicorn forks its workers.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: str = SHARED_STATE_DB):
+        self.path = path
+        self._conn = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _connection(self):
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS int_sets (key TEXT NOT NULL, member INTEGER NOT NULL, "
+                "PRIMARY KEY (key, member))"
+            )
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def _execute(self, sql: str, params=()):
+        with self._lock:
+            return self._connection().execute(sql, params).fetchone()
+
+    def _write(self, sql: str, params=()):
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(sql, params).fetchone()
+            self._writes += 1
+            if self._writes % 500 == 0:
+                conn.execute("DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+            return row
+
+    @staticmethod
+    def _expiry(ttl):
+        return time.time() + ttl if ttl else None
+
+    def get(self, key: str):
+        row = self._execute(
+            "SELECT value FROM kv WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)", (key, time.time())
+        )
+        return row[0] if row else None
+
+    def set(self, key: str, value: str, ttl: float = None):
+        self._write(
+            "INSERT INTO kv (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at",
+            (key, value, self._expiry(ttl)),
+        )
+
+    def add(self, key: str, value: str, ttl: float = None):
+        """Set `key` only if it is absent or expired; True if it was set."""
+        row = self._write(
+            "INSERT INTO kv (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+            "WHERE kv.expires_at IS NOT NULL AND kv.expires_at <= ? RETURNING key",
+            (key, value, self._expiry(ttl), time.time()),
+        )
+        return row is not None
+
+    def delete(self, key: str, value: str = None):
+        """Delete `key`, only while it still holds `value` if that is given."""
+        if value is None:
+            self._write("DELETE FROM kv WHERE key = ?", (key,))
+        else:
+            self._write("DELETE FROM kv WHERE key = ? AND value = ?", (key, value))
+
+    def incr(self, key: str, ttl: float = None):
+        """Increment an integer key and refresh its expiry; None if the key is absent."""
+        row = self._write(
+            "UPDATE kv SET value = CAST(value AS INTEGER) + 1, expires_at = ? "
+            "WHERE key = ? AND (expires_at IS NULL OR expires_at > ?) RETURNING value",
+            (self._expiry(ttl), key, time.time()),
+        )
+        return int(row[0]) if row else None
+
+    def raise_to(self, key: str, value: int, ttl: float = None):
+        """Set an integer key to `value` unless it already holds more."""
+        self._write(
+            "INSERT INTO kv (key, value, expires_at) VALUES (?, ?, ?) ON CONFLICT(key) DO UPDATE SET "
+            "value = CASE WHEN kv.expires_at IS NOT NULL AND kv.expires_at <= ? THEN excluded.value "
+            "ELSE MAX(CAST(kv.value AS INTEGER), CAST(excluded.value AS INTEGER)) END, expires_at = excluded.expires_at",
+            (key, value, self._expiry(ttl), time.time()),
+        )
+
+    def set_add(self, key: str, member: int):
+        self._write("INSERT OR IGNORE INTO int_sets (key, member) VALUES (?, ?)", (key, member))
+
+    def set_pop_min(self, key: str):
+        row = self._write(
+            "DELETE FROM int_sets WHERE key = ? AND member = "
+            "(SELECT MIN(member) FROM int_sets WHERE key = ?) RETURNING member",
+            (key, key),
+        )
+        return row[0] if row else None
+
+    def set_discard_below(self, key: str, bound: int):
+        self._write("DELETE FROM int_sets WHERE key = ? AND member < ?", (key, bound))
+
+    def set_clear(self, key: str):
+        self._write("DELETE FROM int_sets WHERE key = ?", (key,))
+
+
+class RedisStateStore:
+    """`SQLiteStateStore` on a Redis-compatible server, for workers on several hosts."""
+
+    backend = "redis"
+
+    INCR_EXISTING = """
+        if redis.call('EXISTS', KEYS[1]) == 0 then return nil end
+        local value = redis.call('INCR', KEYS[1])
+        if tonumber(ARGV[1]) > 0 then redis.call('PEXPIRE', KEYS[1], ARGV[1]) end
+        return value
+    """
+    RAISE_TO = """
+        local current = tonumber(redis.call('GET', KEYS[1]) or '-1')
+        if tonumber(ARGV[1]) > current then redis.call('SET', KEYS[1], ARGV[1]) end
+        if tonumber(ARGV[2]) > 0 then redis.call('PEXPIRE', KEYS[1], ARGV[2]) end
+    """
+    DELETE_IF = """
+        if redis.call('GET', KEYS[1]) == ARGV[1] then return redis.call('DEL', KEYS[1]) end
+        return 0
+    """
+
+    def __init__(self, url: str = REDIS_URL):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("REDIS_URL is set but the redis package is not installed (pip install redis)") from e
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self._incr_existing = self._redis.register_script(self.INCR_EXISTING)
+        self._raise_to = self._redis.register_script(self.RAISE_TO)
+        self._delete_if = self._redis.register_script(self.DELETE_IF)
+
+    @staticmethod
+    def _ms(ttl):
+        return int(ttl * 1000) if ttl else 0
+
+    def get(self, key: str):
+        return self._redis.get(key)
+
+    def set(self, key: str, value: str, ttl: float = None):
+        self._redis.set(key, value, px=self._ms(ttl) or None)
+
+    def add(self, key: str, value: str, ttl: float = None):
+        return bool(self._redis.set(key, value, px=self._ms(ttl) or None, nx=True))
+
+    def delete(self, key: str, value: str = None):
+        if value is None:
+            self._redis.delete(key)
+        else:
+            self._delete_if(keys=[key], args=[value])
+
+    def incr(self, key: str, ttl: float = None):
+        value = self._incr_existing(keys=[key], args=[self._ms(ttl)])
+        return int(value) if value is not None else None
+
+    def raise_to(self, key: str, value: int, ttl: float = None):
+        self._raise_to(keys=[key], args=[value, self._ms(ttl)])
+
+    def set_add(self, key: str, member: int):
+        self._redis.zadd(key, {str(member): member})
+
+    def set_pop_min(self, key: str):
+        popped = self._redis.zpopmin(key)
+        return int(popped[0][1]) if popped else None
+
+    def set_discard_below(self, key: str, bound: int):
+        self._redis.zremrangebyscore(key, "-inf", f"({bound}")
+
+    def set_clear(self, key: str):
+        self._redis.delete(key)
+
+
+class SharedState:
+    """
+    State shared by every worker process of the backend: nonce counters,
+    response cache entries, locks that keep warmup and background refreshes
+    to one worker, and records a request on another worker may ask for.
+
+    Keys are namespaced with `SHARED_STATE_PREFIX` so several deployments
+    can share one Redis.
+    """
+
+    def __init__(self, store=None, prefix: str = KEY_PREFIX):
+        self._store = store
+        self.prefix = prefix
+        self.metrics = {"locks_acquired": 0, "locks_contended": 0}
+
+    @property
+    def store(self):
+        if self._store is None:
+            self._store = RedisStateStore() if REDIS_URL else SQLiteStateStore()
+            logger.info("Shared state backend: %s", self._store.backend)
+        return self._store
+
+    def key(self, *parts):
+        return self.prefix + ":".join(str(part) for part in parts)
+
+    def acquire(self, name: str, ttl: float):
+        """
+        Take the lock `name` for at most `ttl` seconds.
+
+        Returns:
+            str: A token to pass to `release`, or None if another process holds it
+        """
+        token = f"{os.getpid()}:{uuid.uuid4().hex}"
+        if self.store.add(self.key("lock", name), token, ttl):
+            self.metrics["locks_acquired"] += 1
+            return token
+        self.metrics["locks_contended"] += 1
+        return None
+
+    def release(self, name: str, token: str):
+        self.store.delete(self.key("lock", name), token)
+
+    def once_per_run(self, name: str):
+        """
+        True in exactly one worker per server start. Without a run id (a
+        single process started directly) this is always True.
+        """
+        run_id = os.getenv(RUN_ID_ENV)
+        if not run_id:
+            return True
+        return self.acquire(f"{name}:{run_id}", RUN_LOCK_TTL) is not None
+
+    def stats(self):
+        return {"backend": self._store.backend if self._store is not None else None, **self.metrics}
+
+
+def start_run():
+    """Mark the start of a server run; called once before the workers start."""
+    os.environ.setdefault(RUN_ID_ENV, uuid.uuid4().hex)
+
+
+shared_state = SharedState()
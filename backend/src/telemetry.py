@@ -0,0 +1,189 @@
+import contextvars
+import logging
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+from dotenv import load_dotenv
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+from web3 import HTTPProvider
+
+load_dotenv()
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# prometheus_client reads this itself; when set, every worker writes its
+# samples there and /metrics aggregates them
+MULTIPROC_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+TOKEN_BUCKETS = (16, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+
+REQUEST_LATENCY = Histogram(
+    "sentinex_http_request_duration_seconds", "HTTP request latency until the response starts",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS,
+)
+STAGE_LATENCY = Histogram(
+    "sentinex_stage_duration_seconds", "Latency of traced request stages", ["stage"], buckets=LATENCY_BUCKETS,
+)
+LLM_LATENCY = Histogram(
+    "sentinex_llm_request_duration_seconds", "LLM call latency", ["provider", "operation"], buckets=LATENCY_BUCKETS,
+)
+LLM_TOKENS = Histogram(
+    "sentinex_llm_tokens", "Tokens per LLM call", ["provider", "kind"], buckets=TOKEN_BUCKETS,
+)
+LLM_ERRORS = Counter("sentinex_llm_errors_total", "Failed LLM calls", ["provider", "operation"])
+RPC_LATENCY = Histogram(
+    "sentinex_rpc_request_duration_seconds", "EVM JSON-RPC latency", ["chain", "method"], buckets=LATENCY_BUCKETS,
+)
+RPC_ERRORS = Counter("sentinex_rpc_errors_total", "Failed EVM JSON-RPC requests", ["chain", "method"])
+UPSTREAM_LATENCY = Histogram(
+    "sentinex_upstream_request_duration_seconds", "Latency of proxied calls to other services",
+    ["service", "path", "status"], buckets=LATENCY_BUCKETS,
+)
+
+
+class Trace:
+    """The spans recorded while handling one request."""
+
+    def __init__(self, trace_id: str):
+        self.id = trace_id
+        self.spans = []
+
+    def summary(self):
+        return " ".join(f"{name}={ms:.1f}ms" for name, ms, _ in self.spans)
+
+
+_trace = contextvars.ContextVar("trace", default=None)
+
+
+def current_trace():
+    return _trace.get()
+
+
+class span:
+    """
+    Time a stage of request handling, as `with span("intent"):` or
+    `async with span("intent"):`. The duration goes to the stage histogram
+    and, inside a request, to that request's trace.
+    """
+
+    def __init__(self, name: str, **attributes):
+        self.name = name
+        self.attributes = attributes
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self._start
+        STAGE_LATENCY.labels(self.name).observe(seconds)
+        trace = _trace.get()
+        if trace is not None:
+            trace.spans.append((self.name, seconds * 1000, {**self.attributes, "error": exc_type is not None}))
+        return False
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return self.__exit__(exc_type, exc, tb)
+
+
+def observe_llm(provider: str, operation: str, seconds: float, input_tokens=None, output_tokens=None):
+    LLM_LATENCY.labels(provider, operation).observe(seconds)
+    if input_tokens is not None:
+        LLM_TOKENS.labels(provider, "input").observe(input_tokens)
+    if output_tokens is not None:
+        LLM_TOKENS.labels(provider, "output").observe(output_tokens)
+
+
+class InstrumentedHTTPProvider(HTTPProvider):
+    """Web3 HTTP provider recording per-chain, per-method RPC latency."""
+
+    def __init__(self, endpoint_uri: str, chain: str, **kwargs):
+        super().__init__(endpoint_uri, **kwargs)
+        self.chain = chain
+
+    def make_request(self, method, params):
+        start = time.perf_counter()
+        try:
+            return super().make_request(method, params)
+        except Exception:
+            RPC_ERRORS.labels(self.chain, method).inc()
+            raise
+        finally:
+            RPC_LATENCY.labels(self.chain, method).observe(time.perf_counter() - start)
+
+    def make_batch_request(self, batch_requests):
+        method = "batch:" + batch_requests[0][0] if batch_requests else "batch"
+        start = time.perf_counter()
+        try:
+            return super().make_batch_request(batch_requests)
+        except Exception:
+            RPC_ERRORS.labels(self.chain, method).inc()
+            raise
+        finally:
+            RPC_LATENCY.labels(self.chain, method).observe(time.perf_counter() - start)
+
+
+def configure_logging():
+    logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    # Upstream calls are already covered by the metrics
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+async def trace_requests(request, call_next):
+    """
+    HTTP middleware: opens a trace for the request, records its latency by
+    route template (so `/bridge/{job_id}` is one series) and logs the spans.
+    """
+    trace = Trace(request.headers.get("x-request-id") or uuid.uuid4().hex)
+    token = _trace.set(trace)
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers["X-Request-ID"] = trace.id
+        return response
+    finally:
+        seconds = time.perf_counter() - start
+        route = request.scope.get("route")
+        route = route.path if route is not None else "unmatched"
+        REQUEST_LATENCY.labels(request.method, route, str(status)).observe(seconds)
+        logger.info("%s %s %s %.1fms [%s] %s", request.method, route, status, seconds * 1000, trace.id, trace.summary())
+        _trace.reset(token)
+
+
+def prepare_multiprocess_metrics():
+    """
+    Point every worker at an empty Prometheus multiprocess directory. Must
+    run in the parent process before any worker imports the metrics.
+    """
+    path = os.getenv(MULTIPROC_ENV) or os.path.join(tempfile.gettempdir(), "sentinex-prometheus")
+    os.environ[MULTIPROC_ENV] = path
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+
+
+def mark_worker_dead(pid: int):
+    if os.getenv(MULTIPROC_ENV):
+        multiprocess.mark_process_dead(pid)
+
+
+def metrics_payload():
+    """
+    Prometheus exposition of every metric, and its content type. With
+    multiple workers this is the aggregate across all of them.
+    """
+    if os.getenv(MULTIPROC_ENV):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
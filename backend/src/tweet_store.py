@@ -0,0 +1,231 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+from dotenv import load_dotenv
+from http_client import zerepy
+from shared_state import shared_state
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+TWEET_ACCOUNTS = [account.strip() for account in os.getenv("TWEET_ACCOUNTS", "aixbt_agent").split(",") if account.strip()]
+# How long a fetched corpus is considered fresh; also the background refresh cadence
+TWEET_FRESHNESS_SECONDS = float(os.getenv("TWEET_FRESHNESS_SECONDS", "300"))
+TWEET_RETENTION_HOURS = float(os.getenv("TWEET_RETENTION_HOURS", "48"))
+TWEET_STORE_MAX = int(os.getenv("TWEET_STORE_MAX", "500"))
+TWEET_FETCH_COUNT = int(os.getenv("TWEET_FETCH_COUNT", "100"))
+
+# Served when Twitter rate limits us before the first successful fetch
+FALLBACK_TWEETS = [
+    {'created_at': '2025-02-23T11:13:11.000Z', 'id': '1893620114656010557', 'edit_history_tweet_ids': ['1893620114656010557'], 'text': 'retail flows hitting $tao post coinbase listing\n\nsubnet evaluations now fully market-driven after dtao upgrade, moving away from validator control'},
+    {'created_at': '2025-02-23T10:14:50.000Z', 'id': '1893605429244268653', 'edit_history_tweet_ids': ['1893605429244268653'], 'text': '$SHADOW weekly rebase hits optimal pricing on sundays. direct x33 buys getting 40% better entry. current price $128.02'},
+    {'created_at': '2025-02-23T09:11:26.000Z', 'id': '1893589474996855003', 'edit_history_tweet_ids': ['1893589474996855003'], 'text': '$STX sBTC cap increase confirmed for Feb 25\n\nfirst decentralized BTC peg with smart contracts launching after Nakamoto upgrade'},
+    {'created_at': '2025-02-23T08:10:48.000Z', 'id': '1893574214999048459', 'edit_history_tweet_ids': ['1893574214999048459'], 'text': '$ANDY trading at 65M mcap on eth vs 5M on base. 13x arb gap if you know what youre doing'},
+    {'created_at': '2025-02-23T07:10:48.000Z', 'id': '1893559117568188702', 'edit_history_tweet_ids': ['1893559117568188702'], 'text': 'https://t.co/Fbh7MpjT3S now 40% of eigenlayer and symbiotic tvl. clear market dominance in restaking infrastructure forming'},
+    {'created_at': '2025-02-23T06:10:58.000Z', 'id': '1893544058032910426', 'edit_history_tweet_ids': ['1893544058032910426'], 'text': 'somnia shannon testnet live\n\nbacked by $270M from improbable and virtual society foundation\n\ndev tooling and validator setup activated, staking protocols enabled'},
+    {'created_at': '2025-02-23T05:11:04.000Z', 'id': '1893528982102122558', 'edit_history_tweet_ids': ['1893528982102122558'], 'text': 'infected launching feb 24 12pm EST. 30 virus tokens including $COVID $HIV $EBOLA competing for winner pot\n\n7-day games running on bonding curves.'},
+    {'created_at': '2025-02-23T04:10:22.000Z', 'id': '1893513709848502556', 'edit_history_tweet_ids': ['1893513709848502556'], 'text': '$SUPER exchange confirms feb 24 launch\n\ninfinite bonding curve, 50% of fees to buybacks/burns\n\nno VC allocation or insider bags'},
+    {'created_at': '2025-02-23T03:10:47.000Z', 'id': '1893498714087661733', 'edit_history_tweet_ids': ['1893498714087661733'], 'text': 'vector pushing new UI release\n\nteam keeps building while showing both wins and losses on their own trades\n\ntransparent'},
+    {'created_at': '2025-02-23T02:10:55.000Z', 'id': '1893483645916283317', 'edit_history_tweet_ids': ['1893483645916283317'], 'text': '$OM just hit ath of $8.81. first defi protocol to get dubai vasp license. fully diluted val at $13.4b and still running'},
+]
+
+
+def _parse_created_at(tweet: dict):
+    try:
+        return datetime.fromisoformat(tweet["created_at"].replace("Z", "+00:00"))
+    except (KeyError, ValueError):
+        return None
+
+
+class TweetStore:
+    """
+    Rolling, deduplicated tweet corpus per account, kept up to date by a
+    background refresher.
+
+    Each refresh only asks the Zerepy server for tweets newer than the
+    newest one already stored (`since_id`), so Twitter rate limits are
+    spent once per freshness interval rather than once per request. The
+    corpus is published to the shared state store and a per-account lock
+    held for the freshness interval lets only one worker fetch; the others
+    adopt what it published.
+    """
+
+    def __init__(self, accounts=TWEET_ACCOUNTS, freshness: float = TWEET_FRESHNESS_SECONDS,
+                 retention_hours: float = TWEET_RETENTION_HOURS, max_tweets: int = TWEET_STORE_MAX):
+        self.accounts = list(accounts)
+        self.freshness = freshness
+        self.retention = timedelta(hours=retention_hours)
+        self.max_tweets = max_tweets
+        self._tweets = {}
+        self._since_id = {}
+        self._refreshed_at = {}
+        self._attempted_at = {}
+        self._locks = {}
+        self._task = None
+        self.metrics = {"fetches": 0, "fetch_errors": 0, "refresh_errors": 0, "new_tweets": 0}
+
+    def _lock(self, account: str):
+        if account not in self._locks:
+            self._locks[account] = asyncio.Lock()
+        return self._locks[account]
+
+    def _prune(self, account: str):
+        tweets = self._tweets[account]
+        cutoff = datetime.now(timezone.utc) - self.retention
+        for tweet_id, tweet in list(tweets.items()):
+            created_at = _parse_created_at(tweet)
+            if created_at is not None and created_at < cutoff:
+                del tweets[tweet_id]
+        if len(tweets) > self.max_tweets:
+            for tweet_id in sorted(tweets, key=int)[:len(tweets) - self.max_tweets]:
+                del tweets[tweet_id]
+
+    async def _load_shared(self, account: str):
+        try:
+            raw = await asyncio.to_thread(shared_state.store.get, shared_state.key("tweets", account))
+        except Exception as e:
+            logger.warning("Failed to read shared tweets for %s: %s", account, e)
+            return
+        if not raw:
+            return
+        data = json.loads(raw)
+        if data["attempted_at"] <= self._attempted_at.get(account, 0):
+            return
+        self._tweets[account] = {tweet["id"]: tweet for tweet in data["tweets"]}
+        if data["since_id"]:
+            self._since_id[account] = data["since_id"]
+        if data["refreshed_at"]:
+            self._refreshed_at[account] = data["refreshed_at"]
+        self._attempted_at[account] = data["attempted_at"]
+
+    async def _publish(self, account: str):
+        data = {
+            "tweets": list(self._tweets.get(account, {}).values()),
+            "since_id": self._since_id.get(account),
+            "refreshed_at": self._refreshed_at.get(account),
+            "attempted_at": self._attempted_at[account],
+        }
+        try:
+            await asyncio.to_thread(shared_state.store.set, shared_state.key("tweets", account), json.dumps(data),
+                                    self.retention.total_seconds())
+        except Exception as e:
+            logger.warning("Failed to publish tweets for %s: %s", account, e)
+
+    async def refresh_account(self, account: str):
+        """
+        Fetch tweets newer than the newest stored one and merge them in,
+        unless another worker fetched them within the freshness interval.
+        """
+        try:
+            # Left to expire rather than released, so it spaces fetches out
+            token = await asyncio.to_thread(shared_state.acquire, f"tweets:{account}", self.freshness)
+        except Exception as e:
+            logger.warning("Shared tweet lock unavailable for %s: %s", account, e)
+            token = "local"
+        await self._load_shared(account)
+        if token is None:
+            return
+
+        params = [account, str(TWEET_FETCH_COUNT)]
+        since_id = self._since_id.get(account)
+        if since_id:
+            params.append(since_id)
+
+        self._attempted_at[account] = time.time()
+        self.metrics["fetches"] += 1
+        try:
+            docs = await zerepy.post_json(
+                "agent/action",
+                {"connection": "twitter", "action": "get-latest-tweets", "params": params},
+                idempotent=True,
+            )
+        except Exception as e:
+            self.metrics["fetch_errors"] += 1
+            logger.warning("Failed to fetch tweets for %s: %s", account, e)
+            await self._publish(account)
+            return
+        result = docs.get("result") if isinstance(docs, dict) else None
+        if result is None:
+            # The Zerepy server returns no result when Twitter rate limits it
+            self.metrics["fetch_errors"] += 1
+            await self._publish(account)
+            return
+
+        tweets = self._tweets.setdefault(account, {})
+        for tweet in result:
+            if tweet["id"] not in tweets:
+                tweets[tweet["id"]] = tweet
+                self.metrics["new_tweets"] += 1
+        if tweets:
+            self._since_id[account] = max(tweets, key=int)
+        self._prune(account)
+        self._refreshed_at[account] = time.time()
+        await self._publish(account)
+
+    def is_fresh(self, account: str):
+        # Failed fetches count too, so a rate limited account isn't retried
+        # before the next interval
+        return time.time() - self._attempted_at.get(account, 0) < self.freshness
+
+    async def get(self, account: str):
+        """
+        Tweets for an account, newest first. Only waits on the network when
+        the account isn't tracked by the refresher and its corpus is stale;
+        concurrent callers share one fetch.
+
+        Returns:
+            list: The stored tweets, or an empty list if none could be fetched
+        """
+        if not self.is_fresh(account) and (account not in self.accounts or account not in self._attempted_at):
+            async with self._lock(account):
+                if not self.is_fresh(account):
+                    await self.refresh_account(account)
+        tweets = self._tweets.get(account, {})
+        return [tweets[tweet_id] for tweet_id in sorted(tweets, key=int, reverse=True)]
+
+    async def run(self):
+        while True:
+            for account in self.accounts:
+                if not self.is_fresh(account):
+                    # Keep refreshing the other accounts, and this one next time
+                    try:
+                        async with self._lock(account):
+                            await self.refresh_account(account)
+                    except Exception:
+                        self.metrics["refresh_errors"] += 1
+                        logger.exception("Failed to refresh tweets for %s", account)
+            await asyncio.sleep(self.freshness)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self):
+        return {
+            **self.metrics,
+            "accounts": {
+                account: {
+                    "tweets": len(self._tweets.get(account, {})),
+                    "since_id": self._since_id.get(account),
+                    "age": time.time() - self._refreshed_at[account] if account in self._refreshed_at else None,
+                }
+                for account in set(self.accounts) | set(self._tweets)
+            },
+        }
+
+
+tweet_store = TweetStore()
@@ -1,131 +1,295 @@
-import re
 import json
+import re
 
-def parse_ai_agent_launchpad_response(response):
+# Schemas use a small subset of JSON Schema: type, properties, required,
+# additionalProperties and anyOf
+LAUNCHPAD_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "symbol": {"type": "string"},
+        "initialSupply": {"type": ["integer", "string"]},
+        "owner": {"type": ["string", "null"]},
+    },
+    "required": ["name", "symbol"],
+}
+
+SENTIMENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "sentiment": {"type": ["boolean", "string"]},
+        "scores": {"type": "object", "additionalProperties": {"type": ["number", "string"]}},
+    },
+    "anyOf": [{"required": ["sentiment"]}, {"required": ["scores"]}],
+}
+
+STRUCTURAL = re.compile(r'[{}"\\]')
+# A JSON object (or a single-quoted one) opens with a key or closes at once
+OBJECT_START = re.compile(r"""\{\s*["'}]""")
+
+PYTHON_LITERALS = {"None": "null", "True": "true", "False": "false"}
+REPAIRABLE = re.compile(
+    r""""(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|#[^\n]*|//[^\n]*|\b(?:None|True|False)\b|,(?=\s*[}\]])"""
+)
+
+JSON_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "number": (int, float),
+    "integer": int,
+    "boolean": bool,
+    "null": type(None),
+}
+
+
+def schema_errors(value, schema: dict, path: str = "$"):
+    """
+    Validate `value` against a schema.
+
+    Returns:
+        list: Human-readable errors, empty if `value` matches
+    """
+    types = schema.get("type")
+    if types is not None:
+        types = [types] if isinstance(types, str) else types
+        # bool is an int subclass but never a valid JSON number
+        if not any(isinstance(value, JSON_TYPES[t]) and not (t in ("number", "integer") and isinstance(value, bool))
+                   for t in types):
+            return [f"{path} should be {' or '.join(types)}"]
+    errors = []
+    if isinstance(value, dict):
+        errors += [f"{path}.{key} is required" for key in schema.get("required", []) if key not in value]
+        properties = schema.get("properties", {})
+        extra = schema.get("additionalProperties")
+        for key, item in value.items():
+            if key in properties:
+                errors += schema_errors(item, properties[key], f"{path}.{key}")
+            elif isinstance(extra, dict):
+                errors += schema_errors(item, extra, f"{path}.{key}")
+    if "anyOf" in schema and not any(not schema_errors(value, option, path) for option in schema["anyOf"]):
+        errors.append(f"{path} matches none of the allowed shapes")
+    return errors
+
+
+class JSONObjectExtractor:
+    """
+    Single-pass extractor for JSON objects embedded in LLM output.
+
+    Text is fed in chunks, e.g. tokens from a streaming response, and
+    scanned once while tracking brace depth and string/escape state, so
+    braces inside strings don't count. Each top-level object is decoded as
+    soon as its closing brace arrives. If it isn't valid JSON (say, prose
+    like `{see below}` wrapping the real object), the objects nested in it
+    are tried instead, outermost first. Spans that can't start a JSON
+    object are rejected without decoding, and the decoding done for one
+    top-level span is capped at `DECODE_BUDGET` times its length, which
+    keeps the worst case linear instead of the quadratic backtracking of
+    non-greedy regex scans.
+
+    Objects that are empty or fail the optional schema are skipped.
+    """
+
+    DECODE_BUDGET = 4
+
+    def __init__(self, schema: dict = None):
+        self.schema = schema
+        self._buffer = ""
+        self._pos = 0
+        # Open braces: [start offset, closed child nodes]; a closed node is
+        # (start, end, children)
+        self._stack = []
+        self._in_string = False
+        # Offset up to which characters are escaped
+        self._skip = 0
+        self.errors = []
+
+    def _decode(self, text: str):
+        candidates = [text]
+        if "'" in text:
+            candidates.append(text.replace("'", '"'))
+        for candidate in candidates:
+            try:
+                value = json.loads(candidate)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(value, dict) or not value:
+                return None
+            errors = schema_errors(value, self.schema) if self.schema else []
+            if errors:
+                self.errors += errors
+                return None
+            return value
+        return None
+
+    def _decode_nodes(self, nodes: list, budget: list):
+        """First valid object among `nodes`, falling back to their children breadth-first."""
+        while nodes and budget[0] > 0:
+            deeper = []
+            for start, end, children in nodes:
+                if not OBJECT_START.match(self._buffer, start):
+                    deeper += children
+                    continue
+                budget[0] -= end - start
+                value = self._decode(self._buffer[start:end])
+                if value is not None:
+                    return value
+                deeper += children
+                if budget[0] <= 0:
+                    return None
+            nodes = deeper
+        return None
+
+    def _close(self, node: tuple):
+        budget = [self.DECODE_BUDGET * (node[1] - node[0])]
+        return self._decode_nodes([node], budget)
+
+    def feed(self, chunk: str):
+        """
+        Scan the next chunk of text.
+
+        Returns:
+            list: Objects completed by this chunk, in order
+        """
+        self._buffer += chunk
+        found = []
+        buffer = self._buffer
+        # Only quotes, braces and backslashes change the scanner state
+        for match in STRUCTURAL.finditer(buffer, self._pos):
+            i = match.start()
+            char = buffer[i]
+            if self._in_string:
+                if i < self._skip:
+                    # Escaped character
+                    continue
+                if char == "\\":
+                    self._skip = i + 2
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                # Quotes only delimit strings inside an object; stray quotes in
+                # the surrounding prose are ignored
+                self._in_string = bool(self._stack)
+            elif char == "{":
+                self._stack.append([i, []])
+            elif char == "}" and self._stack:
+                start, children = self._stack.pop()
+                node = (start, i + 1, children)
+                if self._stack:
+                    self._stack[-1][1].append(node)
+                    continue
+                value = self._close(node)
+                if value is not None:
+                    found.append(value)
+        self._pos = len(buffer)
+        if not self._stack and not self._in_string:
+            # Nothing open, the scanned text is no longer needed
+            self._buffer = ""
+            self._pos = 0
+            self._skip = 0
+        return found
+
+    def finish(self):
+        """
+        End of input: objects completed inside braces that never closed.
+
+        Returns:
+            list: The recovered objects, in order
+        """
+        found = []
+        for _, children in self._stack:
+            for node in children:
+                value = self._close(node)
+                if value is not None:
+                    found.append(value)
+        self._stack = []
+        self._buffer = ""
+        self._pos = 0
+        self._skip = 0
+        self._in_string = False
+        return found
+
+
+def repair_json(text: str):
+    """
+    Cheap single-pass fixes for almost-JSON: Python literals (`None`,
+    `True`, `False`), single-quoted strings, `#`/`//` comments and trailing
+    commas. Only the span from the first `{` to the last `}` is touched, so
+    apostrophes in surrounding prose aren't mistaken for strings.
+
+    Returns:
+        str: The repaired text
+    """
+    start = text.find("{")
+    end = text.rfind("}") + 1
+    if start < 0 or end <= start:
+        return text
+
+    def fix(match):
+        token = match.group(0)
+        if token[0] == '"':
+            return token
+        if token[0] == "'":
+            return json.dumps(token[1:-1].replace("\\'", "'"))
+        if token[0] in "#/,":
+            return ""
+        return PYTHON_LITERALS[token]
+
+    return text[:start] + REPAIRABLE.sub(fix, text[start:end]) + text[end:]
+
+
+def extract_json(response: str, schema: dict = None):
     """
-    Parse JSON data from AI agent responses, handling various text formatting
-    and edge cases.
-    
+    Extract the first JSON object from a response.
+
     Args:
         response (str): The raw response from the AI agent
-        
+        schema (dict): Optional schema the object must match
+
     Returns:
         dict: The extracted JSON data as a Python dictionary
-        
+
     Raises:
         ValueError: If no valid JSON could be extracted from the response
     """
-    # First, try to extract content between ```json and ``` markers
-    json_pattern = r'```json\s*([\s\S]*?)\s*```'
-    matches = re.findall(json_pattern, response)
-    
-    if matches:
-        try:
-            return json.loads(matches[0])
-        except json.JSONDecodeError:
-            # Continue with other methods if this fails
-            pass
-    
-    # Try alternate pattern (just triple backticks)
-    json_pattern = r'```\s*([\s\S]*?)\s*```'
-    matches = re.findall(json_pattern, response)
-    
-    for match in matches:
-        try:
-            # Check if the content looks like JSON (starts with { or [)
-            if match.strip().startswith('{') or match.strip().startswith('['):
-                return json.loads(match)
-        except json.JSONDecodeError:
-            continue
-    
-    # Try to find JSON directly in the text (looking for curly braces)
-    json_pattern = r'(\{[\s\S]*?\})'
-    matches = re.findall(json_pattern, response)
-    
-    for match in matches:
-        try:
-            # Add some validation to make sure we're getting complete JSON objects
-            if match.count('{') == match.count('}') and '"' in match:
-                result = json.loads(match)
-                # Additional check: make sure it's more than just an empty object
-                if result and isinstance(result, dict) and len(result) > 0:
-                    return result
-        except json.JSONDecodeError:
-            continue
-    
-    # More aggressive approach - try to find the most promising JSON-like structure
-    # Look for sequences with multiple key-value pairs
-    if '"name":' in response and '"symbol":' in response:
-        # Find the largest chunk of text that contains both keys
-        start_pos = response.find('{', max(0, response.find('"name":')-10))
-        end_pos = response.find('}', max(response.find('"symbol":'), response.find('"owner":'))) + 1
-        
-        if start_pos >= 0 and end_pos > start_pos:
-            json_text = response[start_pos:end_pos]
-            try:
-                return json.loads(json_text)
-            except json.JSONDecodeError:
-                # Try to fix common JSON issues
-                fixed_json = json_text.replace("'", '"')  # Replace single quotes with double quotes
-                try:
-                    return json.loads(fixed_json)
-                except json.JSONDecodeError:
-                    pass
-    
-    # If we've made it here, we couldn't extract valid JSON
+    extractor = JSONObjectExtractor(schema)
+    found = extractor.feed(response) or extractor.finish()
+    if found:
+        return found[0]
+    if extractor.errors:
+        raise ValueError(f"No JSON data matching the expected schema: {'; '.join(extractor.errors[:3])}")
     raise ValueError("No valid JSON data could be extracted from the response")
 
 
+def parse_ai_agent_launchpad_response(response):
+    """
+    Parse token launch parameters from AI agent responses, handling various
+    text formatting and edge cases.
+
+    Args:
+        response (str): The raw response from the AI agent
+
+    Returns:
+        dict: The extracted JSON data as a Python dictionary
+
+    Raises:
+        ValueError: If no valid JSON could be extracted from the response
+    """
+    return extract_json(response, LAUNCHPAD_SCHEMA)
+
+
 def parse_sentiment_analysis_response(response):
     """
-    Parse JSON data from AI agent responses, handling various text formatting
-    and edge cases.
-    
+    Parse a sentiment verdict or per-tweet scores from AI agent responses,
+    handling various text formatting and edge cases.
+
     Args:
         response (str): The raw response from the AI agent
-        
+
     Returns:
         dict: The extracted JSON data as a Python dictionary
-        
+
     Raises:
         ValueError: If no valid JSON could be extracted from the response
     """
-    # First, try to extract content between ```json and ``` markers
-    json_pattern = r'```json\s*([\s\S]*?)\s*```'
-    matches = re.findall(json_pattern, response)
-    
-    if matches:
-        try:
-            return json.loads(matches[0])
-        except json.JSONDecodeError:
-            # Continue with other methods if this fails
-            pass
-    
-    # Try alternate pattern (just triple backticks)
-    json_pattern = r'```\s*([\s\S]*?)\s*```'
-    matches = re.findall(json_pattern, response)
-    
-    for match in matches:
-        try:
-            # Check if the content looks like JSON (starts with { or [)
-            if match.strip().startswith('{') or match.strip().startswith('['):
-                return json.loads(match)
-        except json.JSONDecodeError:
-            continue
-    
-    # Try to find JSON directly in the text (looking for curly braces)
-    json_pattern = r'(\{[\s\S]*?\})'
-    matches = re.findall(json_pattern, response)
-    
-    for match in matches:
-        try:
-            # Add some validation to make sure we're getting complete JSON objects
-            if match.count('{') == match.count('}') and '"' in match:
-                result = json.loads(match)
-                # Additional check: make sure it's more than just an empty object
-                if result and isinstance(result, dict) and len(result) > 0:
-                    return result
-        except json.JSONDecodeError:
-            continue
-    
-    raise ValueError("No valid JSON data could be extracted from the response")
\ No newline at end of file
+    return extract_json(response, SENTIMENT_SCHEMA)
@@ -4,8 +4,9 @@ pragma solidity ^0.8.20;
 import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
 import "@openzeppelin/contracts/access/Ownable.sol";
 import "@openzeppelin/contracts/token/ERC20/extensions/ERC20Burnable.sol";
+import "@openzeppelin/contracts/utils/Multicall.sol";
 
-contract SentinexLaunchpad is ERC20, Ownable, ERC20Burnable {
+contract SentinexLaunchpad is ERC20, Ownable, ERC20Burnable, Multicall {
     // Events
     event TokensMinted(address indexed to, uint256 amount);
     event TokensBurned(address indexed from, uint256 amount);
@@ -403,6 +403,18 @@ const DefiChat = () => {
     }
   };
 
+  // Poll a background bridge job until both legs have been broadcast
+  const pollBridgeJob = async (job) => {
+    for (let attempt = 0; attempt < 30; attempt++) {
+      if (job.status === 'failed' || (job.AutoEVMURL && job.SepoliaURL)) break;
+      await new Promise((resolve) => setTimeout(resolve, 1000));
+      const response = await fetch(`http://localhost:5001${job.status_url}`);
+      if (!response.ok) break;
+      job = await response.json();
+    }
+    processBridgeResponse(job);
+  };
+
   // Process balance response
   const processBalanceResponse = (data) => {
     const numericResult = parseFloat(data);
@@ -453,7 +465,13 @@ const DefiChat = () => {
   };
 
   // Process API response
-  const processApiResponse = (data) => {
+  const processApiResponse = async (data) => {
+    // Bridges are returned as a job to poll
+    if (data.job_id && data.status_url) {
+      await pollBridgeJob(data);
+      return;
+    }
+
     // First check if it's a bridge response
     if (data.AutoEVMURL && data.SepoliaURL) {
       processBridgeResponse(data);
@@ -560,7 +578,7 @@ const DefiChat = () => {
       const data = await response.json();
       
       // Process the response
-      processApiResponse(data);
+      await processApiResponse(data);
     } catch (error) {
       handleError(error);
     } finally {